@@ -0,0 +1,420 @@
+"""
+Headless HTTP API for the game engine
+Serves case creation, interrogation (optionally streamed as server-sent events), evidence analysis,
+hints and accusations to mobile and web clients without Streamlit
+
+Run from the project root:
+    uvicorn api_server:app --host 0.0.0.0 --port 8000
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+import contextvars
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from mystery_engine import MysteryGameEngine, MysteryCase
+from fact_graph import Fact, Conflict
+from procedural import generate_procedural_case
+from scheduler import get_scheduler
+from singleflight import get_single_flight
+from prompt_cache import get_prompt_cache_stats
+from cancellation import CallCancelled, get_cancellation_stats
+from load_shedding import get_admission_controller, MODE_NAMES
+from themes import THEME_MAPPING
+
+# Engine calls block on the scheduler and the network, so they run on worker threads;
+# the event loop itself only shuffles requests and streamed chunks
+_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("MYSTERYAI_API_WORKERS", "64")),
+    thread_name_prefix="api-engine"
+)
+
+
+# Request and response models
+class CreateSessionRequest(BaseModel):
+    theme: str = Field(description="One of the Home page themes, e.g. 'Goa Beach Resort Mystery'")
+    offline: bool = Field(False, description="Serve an instant procedural case instead of an AI-written one")
+
+
+class InterrogateRequest(BaseModel):
+    suspect: str
+    question: str
+
+
+class EvidenceRequest(BaseModel):
+    evidence: str
+
+
+class HintRequest(BaseModel):
+    difficulty: str = "medium"
+
+
+class AccuseRequest(BaseModel):
+    accused: str
+    explanation: str
+
+
+class PublicSuspect(BaseModel):
+    name: str
+    age: int
+    occupation: str
+    personality: str
+    alibi: str
+    motive: str
+
+
+class PublicEvidence(BaseModel):
+    name: str
+    description: str
+    location: str
+    significance: str
+
+
+class PublicCase(BaseModel):
+    """What the player may see of a case: no solution, key clues or secrets"""
+    title: str
+    setting: str
+    victim: str
+    crime: str
+    initial_scene: str
+    suspects: List[PublicSuspect]
+    evidence: List[PublicEvidence]
+
+    @classmethod
+    def from_case(cls, case: MysteryCase) -> "PublicCase":
+        return cls.model_validate(case.model_dump(exclude={"solution", "key_clues"}))
+
+
+class SessionResponse(BaseModel):
+    session_id: str
+    offline: bool
+    case_source: str = Field(description="ai, library (ready-made under load) or offline")
+    case: PublicCase
+    progress: float
+    clues_found: int = Field(description="Key clues uncovered so far; the clues themselves stay hidden")
+    clues_total: int
+
+
+class _ApiSession:
+    """One player's engine; calls on it are serialized because the engine isn't thread-safe"""
+
+    def __init__(self, engine: MysteryGameEngine, offline: bool):
+        self.engine = engine
+        self.offline = offline
+        self.lock = asyncio.Lock()
+        self.last_used = time.monotonic()
+
+
+class SessionRegistry:
+    """Per-process session table with idle expiry"""
+
+    def __init__(self, ttl: float = 1800.0, max_sessions: int = 10000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, _ApiSession] = {}
+
+    def add(self, session: _ApiSession) -> str:
+        self.evict_expired()
+        if len(self._sessions) >= self.max_sessions:
+            raise HTTPException(status_code=503, detail="Too many active sessions, try again later")
+        session_id = uuid.uuid4().hex
+        self._sessions[session_id] = session
+        return session_id
+
+    def get(self, session_id: str) -> _ApiSession:
+        session = self._sessions.get(session_id)
+        if session is None or time.monotonic() - session.last_used > self.ttl:
+            self.remove(session_id, "idle")
+            raise HTTPException(status_code=404, detail="Session not found or expired")
+        session.last_used = time.monotonic()
+        return session
+
+    def remove(self, session_id: str, reason: str = "session closed"):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.engine.cancel(reason)
+
+    def evict_expired(self) -> int:
+        cutoff = time.monotonic() - self.ttl
+        expired = [sid for sid, s in self._sessions.items() if s.last_used < cutoff and not s.lock.locked()]
+        for sid in expired:
+            self.remove(sid, "idle")
+        return len(expired)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+sessions = SessionRegistry(
+    ttl=float(os.getenv("MYSTERYAI_API_SESSION_TTL", "1800")),
+    max_sessions=int(os.getenv("MYSTERYAI_API_MAX_SESSIONS", "10000")),
+)
+
+
+async def _run(fn: Callable, *args):
+    """Run a blocking engine call on a worker thread, keeping the caller's trace context"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, contextvars.copy_context().run, fn, *args)
+
+
+async def _iterate(gen_fn: Callable[..., Iterator[str]], *args) -> AsyncIterator[str]:
+    """Drive a blocking generator on a worker thread, handing its items to the event loop
+
+    If the consumer stops early (e.g. the client disconnected), the generator is closed
+    at its next item, which hangs up on the model mid-reply.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    stop = threading.Event()
+
+    def drain():
+        gen = gen_fn(*args)
+        try:
+            for item in gen:
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+        finally:
+            gen.close()
+
+    loop.run_in_executor(_executor, contextvars.copy_context().run, drain)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _session_response(session_id: str, session: _ApiSession) -> SessionResponse:
+    engine = session.engine
+    return SessionResponse(
+        session_id=session_id,
+        offline=session.offline,
+        case_source=engine.case_source,
+        case=PublicCase.from_case(engine.case),
+        progress=engine.clue_tracker.progress,
+        clues_found=sum(engine.clue_tracker.found),
+        clues_total=len(engine.clue_tracker.found),
+    )
+
+
+def _answer(engine: MysteryGameEngine, suspect_name: str, question: str) -> str:
+    # The unformatted answer; interrogate_suspect's reply is laid out for the terminal
+    return "".join(engine.stream_interrogation(suspect_name, question))
+
+
+def _lookup(engine: MysteryGameEngine, kind: str, name: str):
+    found = engine.case_index.find_suspect(name) if kind == "suspect" else engine.case_index.find_evidence(name)
+    if not found:
+        raise HTTPException(status_code=404, detail=f"{kind.capitalize()} '{name}' not found")
+    return found
+
+
+async def _sweep_sessions():
+    while True:
+        await asyncio.sleep(60)
+        sessions.evict_expired()
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    sweeper = asyncio.create_task(_sweep_sessions())
+    yield
+    sweeper.cancel()
+
+
+app = FastAPI(title="MysteryAI", lifespan=_lifespan)
+
+
+@app.exception_handler(CallCancelled)
+async def call_cancelled(request, exc: CallCancelled):
+    # The session was closed or expired while the call was running
+    return JSONResponse(status_code=409, content={"detail": f"Request cancelled: {exc.reason}"})
+
+
+@app.get("/health")
+async def health():
+    mode = get_admission_controller().worst_mode()
+    return {"status": "ok" if not mode else "degraded", "mode": MODE_NAMES[mode], "sessions": len(sessions)}
+
+
+@app.get("/stats")
+async def stats():
+    """Scheduler, coalescing, prompt cache, cancellation and load shedding counters for this process"""
+    return {
+        "sessions": len(sessions),
+        "scheduler": get_scheduler().stats(),
+        "single_flight": get_single_flight().stats(),
+        "prompt_cache": get_prompt_cache_stats().stats(),
+        "cancelled": get_cancellation_stats().stats(),
+        "admission": get_admission_controller().stats(),
+    }
+
+
+@app.post("/sessions", response_model=SessionResponse)
+async def create_session(request: CreateSessionRequest,
+                         x_openai_key: Optional[str] = Header(None)):
+    """Start an investigation; the OpenAI key comes from the X-OpenAI-Key header or the server's environment"""
+    if request.theme not in THEME_MAPPING:
+        raise HTTPException(status_code=422, detail=f"Unknown theme '{request.theme}'; choose one of: {', '.join(THEME_MAPPING)}")
+    api_key = x_openai_key or os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=401, detail="OpenAI API Key not found")
+    # A new key builds pooled HTTP clients (SSL setup), which mustn't stall the event loop
+    engine = await _run(MysteryGameEngine, api_key)
+
+    offline = request.offline
+    if not offline:
+        try:
+            # The same description the Streamlit briefing gives the case writer
+            await _run(engine.generate_mystery, THEME_MAPPING[request.theme])
+        except Exception:
+            # Degraded mode, as in the app: keep the player going with an offline case
+            offline = True
+    if offline:
+        engine.case, engine.case_source = generate_procedural_case(request.theme), "offline"
+
+    session = _ApiSession(engine, engine.case_source == "offline")
+    session_id = sessions.add(session)
+    return _session_response(session_id, session)
+
+
+@app.get("/sessions/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str):
+    return _session_response(session_id, sessions.get(session_id))
+
+
+@app.delete("/sessions/{session_id}")
+async def delete_session(session_id: str):
+    sessions.get(session_id)
+    sessions.remove(session_id)
+    return {"deleted": session_id}
+
+
+@app.post("/sessions/{session_id}/interrogate")
+async def interrogate(session_id: str, request: InterrogateRequest):
+    session = sessions.get(session_id)
+    suspect = _lookup(session.engine, "suspect", request.suspect)
+    async with session.lock:
+        answer = await _run(_answer, session.engine, suspect.name, request.question)
+    return {"suspect": suspect.name, "answer": answer, "progress": session.engine.clue_tracker.progress}
+
+
+@app.post("/sessions/{session_id}/interrogate/stream")
+async def interrogate_stream(session_id: str, request: InterrogateRequest):
+    """Answer as server-sent events: `token` events with text, then one `done` event"""
+    session = sessions.get(session_id)
+    suspect = _lookup(session.engine, "suspect", request.suspect)
+
+    async def events():
+        async with session.lock:
+            parts = []
+            try:
+                async for text in _iterate(session.engine.stream_interrogation, suspect.name, request.question):
+                    parts.append(text)
+                    yield _sse("token", {"text": text})
+            except Exception as e:
+                yield _sse("error", {"detail": str(e)})
+                return
+            yield _sse("done", {
+                "suspect": suspect.name,
+                "answer": "".join(parts),
+                "progress": session.engine.clue_tracker.progress,
+            })
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/sessions/{session_id}/evidence")
+async def examine_evidence(session_id: str, request: EvidenceRequest):
+    session = sessions.get(session_id)
+    evidence = _lookup(session.engine, "evidence", request.evidence)
+    async with session.lock:
+        analysis = await _run(session.engine.examine_evidence, evidence.name)
+    return {"evidence": evidence.name, "analysis": analysis.strip(), "progress": session.engine.clue_tracker.progress}
+
+
+@app.get("/sessions/{session_id}/whereabouts", response_model=List[Fact])
+async def whereabouts(session_id: str, at: str):
+    """Who was where at a time of day (`?at=9 pm`), from alibis and evidence; local, no LLM call"""
+    session = sessions.get(session_id)
+    try:
+        return session.engine.who_was_where(at)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/sessions/{session_id}/conflicts", response_model=List[Conflict])
+async def conflicts(session_id: str, evidence: Optional[str] = None):
+    """Alibis contradicted by one piece of evidence (`?evidence=...`), or every contradiction in the case file"""
+    session = sessions.get(session_id)
+    if evidence is not None:
+        return session.engine.check_evidence(_lookup(session.engine, "evidence", evidence).name)
+    return session.engine.fact_graph.conflicts()
+
+
+@app.post("/sessions/{session_id}/hint")
+async def hint(session_id: str, request: HintRequest):
+    session = sessions.get(session_id)
+    async with session.lock:
+        reply = await _run(session.engine.get_hint, request.difficulty)
+    return {"hint": reply.strip().removeprefix("💡 HINT:").strip()}
+
+
+@app.post("/sessions/{session_id}/accuse")
+async def accuse(session_id: str, request: AccuseRequest):
+    """Judge an accusation; 202 with "deferred" when the AI is overloaded (poll /verdict)"""
+    session = sessions.get(session_id)
+    async with session.lock:
+        result = await _run(session.engine.submit_solution, request.accused, request.explanation)
+    return JSONResponse(status_code=202 if result.get("deferred") else 200, content=result)
+
+
+@app.get("/sessions/{session_id}/verdict")
+async def verdict(session_id: str):
+    """The deferred verdict: 202 while it's being judged, then the result
+
+    If judging failed the accusation is dropped (502, or 409 if the session cancelled it)
+    and can be submitted again.
+    """
+    engine = sessions.get(session_id).engine
+    pending = engine.pending_verdict
+    if pending is None:
+        raise HTTPException(status_code=404, detail="No deferred accusation for this session")
+    if not pending.done():
+        return JSONResponse(status_code=202, content={"deferred": True})
+    error = pending.exception()
+    if error is not None:
+        engine.pending_verdict = None
+        if isinstance(error, CallCancelled):
+            raise error
+        return JSONResponse(status_code=502, content={
+            "deferred": False,
+            "detail": f"Your accusation couldn't be judged ({error}). Please submit it again."
+        })
+    return pending.result()
@@ -5,18 +5,29 @@ from ui.briefing import show_briefing_page
 from ui.interrogation import show_interrogation_page
 from ui.sidebar import navigate
 from ui.hints import show_hints_page
+from ui.case_file import show_case_file_page
+from ui.session import persist_session
 import streamlit as st
+from tracing import get_tracer
 
-page = navigate()
-if page == "Home":
-     show_home_page()
-elif page == "Accusation":
-     show_accusation_page()
-elif page == "Evidence":
-     show_evidence_page()
-elif page == "Briefing":
-     show_briefing_page()
-elif page == "Hints":
-     show_hints_page()
-elif page == 'Interrogation':
-     show_interrogation_page()     
\ No newline at end of file
+# One span per Streamlit rerun; pages and engine calls nest inside it
+with get_tracer().span("rerun") as span:
+    page = navigate()
+    span.set(page=page)
+    if page == "Home":
+        show_home_page()
+    elif page == "Accusation":
+        show_accusation_page()
+    elif page == "Evidence":
+        show_evidence_page()
+    elif page == "Briefing":
+        show_briefing_page()
+    elif page == "Hints":
+        show_hints_page()
+    elif page == "Case File":
+        show_case_file_page()
+    elif page == 'Interrogation':
+        show_interrogation_page()
+
+    # Save the investigation (batched write-behind; skipped when nothing changed)
+    persist_session()
@@ -0,0 +1,129 @@
+"""
+Bulk offline case generation
+Fills a case library with many generated mysteries per theme, skipping near-duplicates
+
+Usage:
+    python batch_generate.py --per-theme 500 --concurrency 8 --db cases.db
+
+Re-running with the same --db resumes: themes that already have enough cases are skipped.
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List
+
+from mystery_engine import MysteryGameEngine
+from case_library import CaseLibrary
+from scheduler import BACKGROUND
+from themes import THEME_MAPPING
+
+
+def generate_one(api_key: str, model: str, engine_theme: str, mode: str):
+    """Generate a case on a fresh engine; returns (case, usage)"""
+    engine = MysteryGameEngine(api_key=api_key, model=model)
+    case = engine.generate_mystery(engine_theme, priority=BACKGROUND, mode=mode)
+    return case, engine.usage
+
+
+class BatchStats:
+    """Throughput and rejection counters for a run"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.stored = 0
+        self.duplicates = 0
+        self.failures = 0
+        self.tokens = 0
+
+    def report(self) -> str:
+        minutes = max(time.monotonic() - self.started, 1e-9) / 60
+        attempts = self.stored + self.duplicates
+        rejection = self.duplicates / attempts if attempts else 0.0
+        return (f"stored={self.stored} duplicates={self.duplicates} failures={self.failures} | "
+                f"{self.stored / minutes:.1f} cases/min, {self.tokens / minutes:,.0f} tokens/min, "
+                f"duplicate rate {rejection:.1%}")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Pre-generate a library of mystery cases")
+    parser.add_argument("--db", default="cases.db", help="case library file (SQLite)")
+    parser.add_argument("--per-theme", type=int, default=100, help="target number of cases per theme")
+    parser.add_argument("--themes", nargs="*", default=list(THEME_MAPPING), help="themes to generate (default: all)")
+    parser.add_argument("--concurrency", type=int, default=8, help="generations in flight at once")
+    parser.add_argument("--threshold", type=float, default=0.5, help="similarity above which a case is a duplicate")
+    parser.add_argument("--mode", default="single", choices=["single", "fanout", "compact", "structured"], help="generation mode")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--max-failures", type=int, default=50, help="stop after this many failed generations")
+    parser.add_argument("--max-duplicates", type=int, default=500, help="stop after this many rejected duplicates")
+    args = parser.parse_args(argv)
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        sys.exit("OPENAI_API_KEY is not set")
+
+    unknown = [t for t in args.themes if t not in THEME_MAPPING]
+    if unknown:
+        sys.exit(f"Unknown theme(s): {', '.join(unknown)}")
+
+    library = CaseLibrary(args.db, threshold=args.threshold)
+    stats = BatchStats()
+
+    # Resume: only generate what each theme is still missing
+    remaining: Dict[str, int] = {t: max(0, args.per_theme - library.count(t)) for t in args.themes}
+    print(f"Library {args.db}: {library.count()} cases; to generate: "
+          + ", ".join(f"{t}={n}" for t, n in remaining.items()))
+
+    def next_theme():
+        # Round-robin over themes that still need cases, most-missing first
+        pending = [t for t, n in remaining.items() if n > 0]
+        return max(pending, key=lambda t: remaining[t]) if pending else None
+
+    in_flight = {}
+    last_report = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        while True:
+            while (len(in_flight) < args.concurrency and stats.failures < args.max_failures
+                   and stats.duplicates < args.max_duplicates):
+                theme = next_theme()
+                if theme is None:
+                    break
+                remaining[theme] -= 1
+                future = pool.submit(generate_one, api_key, args.model, THEME_MAPPING[theme], args.mode)
+                in_flight[future] = theme
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                theme = in_flight.pop(future)
+                try:
+                    case, usage = future.result()
+                except Exception as e:
+                    stats.failures += 1
+                    remaining[theme] += 1
+                    print(f"[{theme}] generation failed: {e}", file=sys.stderr)
+                    continue
+
+                stats.tokens += usage["input_tokens"] + usage["output_tokens"]
+                if library.add(theme, case) is None:
+                    stats.duplicates += 1
+                    remaining[theme] += 1  # try again for this theme
+                else:
+                    stats.stored += 1
+
+            if time.monotonic() - last_report > 10:
+                print(stats.report())
+                last_report = time.monotonic()
+
+    print(stats.report())
+    if stats.failures >= args.max_failures or stats.duplicates >= args.max_duplicates:
+        print("Stopped early after too many failures or duplicates; re-run to resume.", file=sys.stderr)
+    library.close()
+
+
+if __name__ == "__main__":
+    main()
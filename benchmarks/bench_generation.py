@@ -0,0 +1,71 @@
+"""
+Wall-clock case generation time: single call vs skeleton + parallel fan-out
+
+Runs against the local stand-in server, which writes replies at --token-latency seconds per chunk
+of 4 words, so a long single reply takes longer than several short parallel ones. With --live,
+uses the real model instead (needs OPENAI_API_KEY). Run from the project root:
+    python -m benchmarks.bench_generation [--runs 3] [--live]
+"""
+
+import os
+import time
+import argparse
+import statistics
+
+from mystery_engine import MysteryGameEngine
+from benchmarks.stand_in_server import start_stand_in_server
+
+THEME = "Rajasthan royal palace intrigue and conspiracy mystery"
+
+
+def run(engine: MysteryGameEngine, mode: str, runs: int) -> dict:
+    times, failures = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            engine.generate_mystery(THEME, mode=mode)
+            times.append(time.perf_counter() - start)
+        except Exception as e:
+            failures += 1
+            print(f"  {mode}: generation failed: {e}")
+    return {
+        "ok": len(times),
+        "failures": failures,
+        "mean_s": statistics.mean(times) if times else float("nan"),
+        "median_s": statistics.median(times) if times else float("nan"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="use the real model (needs OPENAI_API_KEY)")
+    parser.add_argument("--model", default="gpt-4o-mini")
+    parser.add_argument("--base-url", default=None, help="OpenAI-compatible endpoint to use instead of the default")
+    parser.add_argument("--latency", type=float, default=0.5, help="stand-in seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="stand-in seconds between chunks")
+    args = parser.parse_args()
+
+    server = None
+    if args.live:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise SystemExit("OPENAI_API_KEY is not set")
+        base_url = args.base_url
+    else:
+        server, base_url = start_stand_in_server(args.latency, token_latency=args.token_latency)
+        api_key = "sk-stand-in"
+
+    engine = MysteryGameEngine(api_key=api_key, model=args.model, base_url=base_url)
+    try:
+        for mode in ("single", "fanout"):
+            result = run(engine, mode, args.runs)
+            print(f"{mode:8} ok={result['ok']} failures={result['failures']}  "
+                  f"mean={result['mean_s']:.1f}s  median={result['median_s']:.1f}s")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
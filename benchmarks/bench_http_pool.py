@@ -0,0 +1,71 @@
+"""
+Connect overhead per call: one HTTP client per engine vs the shared client pool
+
+Run from the project root:
+    python -m benchmarks.bench_http_pool --engines 20 --calls 5
+"""
+
+import time
+import argparse
+
+from langchain_openai import ChatOpenAI
+
+from http_pool import ClientPool
+from benchmarks.stand_in_server import start_stand_in_server
+
+API_KEY = "sk-stand-in"
+MODEL = "gpt-4o-mini"
+
+
+def run(base_url: str, engines: int, calls: int, shared: bool) -> dict:
+    """Simulate `engines` sessions each making `calls` requests"""
+    shared_pool = ClientPool()
+    pools = []
+    start = time.perf_counter()
+    for _ in range(engines):
+        pool = shared_pool if shared else ClientPool()
+        pools.append(pool)
+        http_client, http_async_client = pool.clients(API_KEY, MODEL, base_url)
+        llm = ChatOpenAI(model=MODEL, api_key=API_KEY, base_url=base_url, max_retries=0,
+                         http_client=http_client, http_async_client=http_async_client)
+        for _ in range(calls):
+            llm.invoke("Where were you at 9 pm?")
+    elapsed = time.perf_counter() - start
+
+    # Sum the counters of every distinct pool used
+    total_calls = total_connects = 0
+    connect_ms = 0.0
+    for pool in {id(p): p for p in pools}.values():
+        for snapshot in pool.stats().values():
+            total_calls += snapshot["calls"]
+            total_connects += snapshot["new_connections"]
+            connect_ms += snapshot["connect_ms_per_call"] * snapshot["calls"]
+        pool.close()
+
+    return {
+        "calls": total_calls,
+        "new_connections": total_connects,
+        "connect_ms_per_call": connect_ms / total_calls if total_calls else 0.0,
+        "ms_per_call": elapsed / total_calls * 1000 if total_calls else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--engines", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in model latency in seconds")
+    args = parser.parse_args()
+
+    server, base_url = start_stand_in_server(args.latency)
+    try:
+        for label, shared in (("per-engine clients", False), ("shared pool", True)):
+            result = run(base_url, args.engines, args.calls, shared)
+            print(f"{label:20} calls={result['calls']:5d}  new_connections={result['new_connections']:4d}  "
+                  f"connect={result['connect_ms_per_call']:.3f} ms/call  total={result['ms_per_call']:.3f} ms/call")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cached vs uncached prompt tokens over one investigation
+
+Plays a scripted investigation of an offline case and reports, per engine operation, how many
+prompt tokens the provider served from its prompt cache. Runs against the local stand-in server
+(which caches prefixes the way OpenAI does) unless --live is given (needs OPENAI_API_KEY).
+
+OpenAI only caches prompts of 1024+ tokens; --cache-min-tokens lowers the stand-in's threshold to
+show how much of each prompt is a stable prefix regardless of case length.
+
+Run from the project root:
+    python -m benchmarks.bench_prompt_cache [--live] [--cache-min-tokens 128]
+"""
+
+import os
+import argparse
+
+from mystery_engine import MysteryGameEngine
+from procedural import generate_procedural_case
+from prompt_cache import get_prompt_cache_stats
+
+QUESTIONS = [
+    "Where were you when the crime happened?",
+    "How well did you know the victim?",
+    "Is there anything you haven't told me?",
+]
+
+
+def play(engine: MysteryGameEngine):
+    """A typical investigation: question everyone, examine everything, ask for hints, accuse"""
+    case = engine.case
+    for suspect in case.suspects:
+        for question in QUESTIONS:
+            engine.interrogate_suspect(suspect.name, question)
+    for evidence in case.evidence:
+        engine.examine_evidence(evidence.name)
+    for difficulty in ("hard", "medium", "easy"):
+        engine.get_hint(difficulty)
+    engine.submit_solution(case.suspects[0].name, "Their alibi doesn't hold up against the evidence.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure prompt cache hits over one investigation")
+    parser.add_argument("--live", action="store_true", help="use the real OpenAI API")
+    parser.add_argument("--theme", default="Goa Beach Resort Mystery")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--cache-min-tokens", type=int, default=1024, help="stand-in caching threshold")
+    args = parser.parse_args()
+
+    server = None
+    if args.live:
+        engine = MysteryGameEngine(api_key=os.environ["OPENAI_API_KEY"])
+    else:
+        from benchmarks.stand_in_server import start_stand_in_server
+        server, base_url = start_stand_in_server()
+        server.cache_min_tokens = args.cache_min_tokens
+        engine = MysteryGameEngine(api_key="sk-stand-in", base_url=base_url)
+
+    engine.case = generate_procedural_case(args.theme, seed=args.seed)
+    try:
+        play(engine)
+    finally:
+        if server:
+            server.shutdown()
+
+    print(f"{'operation':<20}{'calls':>7}{'prompt':>9}{'cached':>9}{'cached %':>10}{'hit ms':>9}{'miss ms':>9}")
+    for label, s in get_prompt_cache_stats().stats().items():
+        hit = f"{s['avg_hit_ms']:.0f}" if s["avg_hit_ms"] is not None else "-"
+        miss = f"{s['avg_miss_ms']:.0f}" if s["avg_miss_ms"] is not None else "-"
+        print(f"{label:<20}{s['calls']:>7}{s['input_tokens']:>9}{s['cached_tokens']:>9}"
+              f"{s['cached_ratio']:>10.0%}{hit:>9}{miss:>9}")
+    usage = engine.usage
+    print(f"Overall: {usage['cached_input_tokens']} of {usage['input_tokens']} prompt tokens cached "
+          f"({usage['cached_input_tokens'] / max(1, usage['input_tokens']):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Prompt tokens sent per case generation, by generation mode
+
+Captures the exact request bodies each mode sends (against the local stand-in server) and counts
+their tokens. With --live, also generates real cases to count parse failures (needs OPENAI_API_KEY).
+
+Run from the project root:
+    python -m benchmarks.bench_prompt_tokens [--live --runs 5]
+"""
+
+import os
+import json
+import argparse
+
+from mystery_engine import MysteryGameEngine
+from benchmarks.stand_in_server import start_stand_in_server
+
+THEME = "Kolkata intellectual literary society murder mystery"
+MODES = ("single", "compact", "structured")
+
+
+def token_counter():
+    """tiktoken's o200k_base when its encoding is available, otherwise ~4 characters per token"""
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    except Exception:
+        return (lambda text: len(text) // 4), "estimate (4 chars/token)"
+
+
+def request_tokens(body: dict, count) -> dict:
+    """Tokens in the messages plus any schema the API receives alongside them"""
+    messages = sum(count(str(m.get("content", ""))) for m in body.get("messages", []))
+    extras = {k: body[k] for k in ("response_format", "tools") if k in body}
+    schema = count(json.dumps(extras)) if extras else 0
+    return {"messages": messages, "schema": schema, "total": messages + schema}
+
+
+def measure_prompts(count) -> dict:
+    server, base_url = start_stand_in_server()
+    engine = MysteryGameEngine(api_key="sk-stand-in", base_url=base_url)
+    results = {}
+    try:
+        for mode in MODES:
+            server.received.clear()
+            try:
+                engine.generate_mystery(THEME, mode=mode)
+            except Exception:
+                pass  # the stand-in doesn't write real cases; only the request matters here
+            results[mode] = request_tokens(server.received[-1], count)
+    finally:
+        server.shutdown()
+    return results
+
+
+def measure_failures(runs: int) -> dict:
+    engine = MysteryGameEngine(api_key=os.environ["OPENAI_API_KEY"])
+    failures = {}
+    for mode in MODES:
+        failures[mode] = 0
+        for _ in range(runs):
+            try:
+                engine.generate_mystery(THEME, mode=mode)
+            except Exception:
+                failures[mode] += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--live", action="store_true", help="also count parse failures against the real API")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    count, method = token_counter()
+    print(f"Prompt tokens per generation request ({method}):")
+    results = measure_prompts(count)
+    baseline = results["single"]["total"]
+    for mode, tokens in results.items():
+        change = tokens["total"] / baseline - 1 if baseline else 0.0
+        print(f"  {mode:10} messages={tokens['messages']:5d}  schema={tokens['schema']:5d}  "
+              f"total={tokens['total']:5d}  ({change:+.0%} vs single)")
+
+    if args.live:
+        if not os.getenv("OPENAI_API_KEY"):
+            raise SystemExit("--live needs OPENAI_API_KEY")
+        print(f"Parse failures over {args.runs} runs:")
+        for mode, failed in measure_failures(args.runs).items():
+            print(f"  {mode:10} {failed}/{args.runs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Load test for the headless API against the local stand-in model
+
+Starts the stand-in server and the API (uvicorn) in their own processes, then runs many concurrent
+players from this one: each creates a session, streams a few interrogations, examines evidence and
+asks for a hint. Reports throughput, time to first streamed token and request latency percentiles.
+
+Run from the project root:
+    python -m benchmarks.load_api --clients 200 --questions 3
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import statistics
+import subprocess
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_up(url: str, timeout: float = 30.0):
+    import httpx
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+async def player(base_url: str, theme: str, questions: int, results: dict):
+    import httpx
+    # One client per player, like separate devices; a single shared pool would dominate the test.
+    # Plain HTTP, so skip building an SSL context (~50 ms of CPU each)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, verify=False) as client:
+        await play(client, theme, questions, results)
+
+
+async def play(client, theme: str, questions: int, results: dict):
+    start = time.perf_counter()
+    r = await client.post("/sessions", json={"theme": theme})
+    r.raise_for_status()
+    results["create"].append(time.perf_counter() - start)
+    session = r.json()
+    sid = session["session_id"]
+    suspects = [s["name"] for s in session["case"]["suspects"]]
+
+    for i in range(questions):
+        start = time.perf_counter()
+        first = None
+        async with client.stream("POST", f"/sessions/{sid}/interrogate/stream",
+                                 json={"suspect": suspects[i % len(suspects)], "question": f"Question {i}?"}) as r:
+            async for line in r.aiter_lines():
+                if first is None and line.startswith("event: token"):
+                    first = time.perf_counter() - start
+        results["ttft"].append(first or 0.0)
+        results["stream"].append(time.perf_counter() - start)
+
+    for path, body in ((f"/sessions/{sid}/evidence", {"evidence": session["case"]["evidence"][0]["name"]}),
+                       (f"/sessions/{sid}/hint", {"difficulty": "medium"})):
+        start = time.perf_counter()
+        r = await client.post(path, json=body)
+        r.raise_for_status()
+        results["call"].append(time.perf_counter() - start)
+
+
+async def run_load(base_url: str, clients: int, questions: int, theme: str) -> dict:
+    results = {"create": [], "ttft": [], "stream": [], "call": []}
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(player(base_url, theme, questions, results) for _ in range(clients)),
+                                    return_exceptions=True)
+    results["elapsed"] = time.perf_counter() - start
+    results["errors"] = [repr(o) for o in outcomes if isinstance(o, Exception)]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the headless API against the stand-in model")
+    parser.add_argument("--clients", type=int, default=200, help="concurrent players")
+    parser.add_argument("--questions", type=int, default=3, help="streamed interrogations per player")
+    parser.add_argument("--latency", type=float, default=0.3, help="stand-in seconds before the first token")
+    parser.add_argument("--token-latency", type=float, default=0.02, help="stand-in seconds between chunks")
+    parser.add_argument("--theme", default="Goa Beach Resort Mystery")
+    args = parser.parse_args()
+
+    model_port, api_port = free_port(), free_port()
+    stand_in = subprocess.Popen([sys.executable, "-m", "benchmarks.stand_in_server", "--port", str(model_port),
+                                 "--latency", str(args.latency), "--token-latency", str(args.token_latency)])
+
+    # Limits sized for the test so the stand-in, not the local rate limiter, is what players wait on
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "sk-stand-in",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{model_port}/v1",
+        "MYSTERYAI_RPM": "1000000",
+        "MYSTERYAI_TPM": "1000000000",
+        "MYSTERYAI_MAX_CONCURRENCY": str(args.clients),
+        "MYSTERYAI_HTTP_MAX_CONNECTIONS": str(args.clients),
+        "MYSTERYAI_HTTP_MAX_KEEPALIVE": str(args.clients),
+        "MYSTERYAI_API_WORKERS": str(args.clients),
+    })
+    api = subprocess.Popen([sys.executable, "-m", "uvicorn", "api_server:app", "--port", str(api_port),
+                            "--log-level", "warning", "--backlog", "4096"], env=env)
+
+    base_url = f"http://127.0.0.1:{api_port}"
+    try:
+        wait_until_up(f"{base_url}/health")
+        # One player first, so lazy imports and first connections aren't counted
+        asyncio.run(run_load(base_url, 1, 1, args.theme))
+        results = asyncio.run(run_load(base_url, args.clients, args.questions, args.theme))
+    finally:
+        api.terminate()
+        stand_in.terminate()
+
+    requests = len(results["create"]) + len(results["stream"]) + len(results["call"])
+    print(f"{args.clients} players, {requests} requests in {results['elapsed']:.1f}s "
+          f"({requests / results['elapsed']:.0f} req/s), {len(results['errors'])} failed players")
+    for name, label in (("create", "create session"), ("ttft", "first token"),
+                        ("stream", "streamed answer"), ("call", "evidence / hint")):
+        values = results[name]
+        if values:
+            print(f"  {label:<16} p50 {percentile(values, 50) * 1000:7.0f} ms   "
+                  f"p95 {percentile(values, 95) * 1000:7.0f} ms   mean {statistics.mean(values) * 1000:7.0f} ms")
+    for error in results["errors"][:3]:
+        print(f"  error: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Local stand-in for the OpenAI chat completions API
+Used by the benchmarks so they can run without network access or an API key
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+DEFAULT_REPLY = "I was at home all evening, Detective. Ask my neighbour if you don't believe me."
+
+
+# Cases planned for fan-out generation, by title, so the expansion calls can fill them in
+_planned: "OrderedDict[str, object]" = OrderedDict()
+_planned_lock = threading.Lock()
+
+
+def _new_case(text: str):
+    from procedural import generate_procedural_case
+    theme = re.search(r"Theme: (.+)", text)
+    return generate_procedural_case(theme.group(1).strip() if theme else "", seed=random.getrandbits(32))
+
+
+def _skeleton(case) -> str:
+    """A fan-out case plan (fanout_generation.CaseSkeleton) for a procedural case"""
+    culprit = next(s for s in case.suspects if case.solution.startswith(s.name))
+    herring = next((e.description for e in case.evidence if e.name == "Threatening Letter"), "")
+    with _planned_lock:
+        _planned[case.title] = case
+        while len(_planned) > 1000:
+            _planned.popitem(last=False)
+    return json.dumps({
+        "title": case.title,
+        "setting": case.setting,
+        "victim": case.victim,
+        "crime": case.crime,
+        "timeline": [case.evidence[0].significance, case.key_clues[0]],
+        "culprit": culprit.name,
+        "solution": case.solution,
+        "suspects": [{
+            "name": s.name,
+            "age": s.age,
+            "occupation": s.occupation,
+            "role": "culprit" if s is culprit else "red herring" if s.name in herring else "innocent",
+            "whereabouts": s.alibi.split(". ")[0] + ".",
+            "motive": s.motive,
+        } for s in case.suspects],
+        "evidence": [{"name": e.name, "location": e.location, "points_to": e.significance} for e in case.evidence],
+        "key_clues": case.key_clues,
+    })
+
+
+def _expansion(text: str) -> str:
+    """Fan-out expansion: the scene, a suspect or a piece of evidence of a planned case"""
+    title = re.search(r'"title":\s*"((?:[^"\\]|\\.)*)"', text)
+    with _planned_lock:
+        case = _planned.get(json.loads(f'"{title.group(1)}"')) if title else None
+    if case is None:
+        # Planned by another stand-in process; any case will do for timing
+        case = _new_case(text)
+    if "Write the initial_scene" in text:
+        return case.initial_scene
+    suspect = re.search(r"full profile for the suspect (.+?) \(", text)
+    if suspect:
+        match = next((s for s in case.suspects if s.name == suspect.group(1)), case.suspects[0])
+        return match.model_dump_json()
+    evidence = re.search(r'full entry for the evidence "(.+?)"', text)
+    match = next((e for e in case.evidence if evidence and e.name == evidence.group(1)), case.evidence[0])
+    return match.model_dump_json()
+
+
+def make_reply(messages: List[dict]) -> str:
+    """Choose the stand-in model's answer for a conversation
+
+    Requests for a whole case get an offline procedural case as JSON, so case generation works
+    end to end. Fan-out generation gets a plan of one, then its scene, suspects and evidence.
+    Everything else gets a canned suspect's answer.
+    """
+    text = "\n".join(str(m.get("content", "")) for m in messages)
+    if "Case plan" in text:
+        if "Only write the plan" in text:
+            return _skeleton(_new_case(text))
+        return _expansion(text)
+    if "initial_scene" in text:
+        return _new_case(text).model_dump_json()
+    return DEFAULT_REPLY
+
+
+def _count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+# Prompt caching as OpenAI does it: prefixes of 1024+ tokens, matched in 128-token blocks
+CACHE_MIN_TOKENS = 1024
+CACHE_BLOCK_CHARS = 128 * 4
+
+
+def _cached_tokens(server, messages: List[dict]) -> int:
+    """Tokens of the longest previously seen block-aligned prefix; remembers this prompt's prefixes"""
+    text = "".join(f"{m.get('role')}:{m.get('content', '')}\n" for m in messages)
+    cached = 0
+    with server.cache_lock:
+        if len(server.prefix_cache) > 100_000:
+            server.prefix_cache.clear()
+        for end in range(CACHE_BLOCK_CHARS, len(text) + 1, CACHE_BLOCK_CHARS):
+            digest = hashlib.sha1(text[:end].encode("utf-8")).digest()
+            if digest in server.prefix_cache:
+                cached = end // 4
+            else:
+                server.prefix_cache.add(digest)
+    return cached if cached >= server.cache_min_tokens else 0
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers POST /v1/chat/completions with a canned completion"""
+
+    protocol_version = "HTTP/1.1"  # keep connections alive between requests
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't stall on delayed ACKs
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.received.append(body)
+        messages = body.get("messages", [])
+        time.sleep(self.server.latency)
+
+        content = make_reply(messages)
+        prompt_tokens = sum(_count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = _count_tokens(content)
+        cached_tokens = _cached_tokens(self.server, messages)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": min(cached_tokens, prompt_tokens)},
+        }
+        if body.get("stream"):
+            include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+            self._stream_reply(body, content, usage if include_usage else None)
+            return
+
+        payload = json.dumps({
+            "id": "chatcmpl-standin",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stand-in"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream_reply(self, body: dict, content: str, usage):
+        """Send the reply as server-sent events, a few words per chunk, over chunked encoding"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(choices, usage=None):
+            data = {
+                "id": "chatcmpl-standin",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "stand-in"),
+                "choices": choices,
+            }
+            if usage is not None:
+                data["usage"] = usage
+            self._write_chunk(f"data: {json.dumps(data)}\n\n")
+
+        words = re.findall(r"\S+\s*", content)
+        try:
+            for i in range(0, len(words), 4):
+                if i and self.server.token_latency:
+                    time.sleep(self.server.token_latency)
+                delta = {"content": "".join(words[i:i + 4])}
+                if i == 0:
+                    delta["role"] = "assistant"
+                event([{"index": 0, "delta": delta, "finish_reason": None}])
+            event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            if usage is not None:
+                event([], usage)
+            self._write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up mid-reply, as a cancelled call does; stop generating
+            self.close_connection = True
+            with self.server.cache_lock:
+                self.server.hung_up += 1
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+class _StandInServer(ThreadingHTTPServer):
+    request_queue_size = 1024  # load tests open hundreds of connections at once
+
+
+def start_stand_in_server(latency: float = 0.0, port: int = 0,
+                          token_latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stand-in server on a background thread; returns (server, base_url)
+
+    `latency` is the wait before the first token, `token_latency` the wait between streamed chunks.
+    """
+    server = _StandInServer(("127.0.0.1", port), StandInHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.token_latency = token_latency
+    server.received = deque(maxlen=1000)  # recent request bodies, for benchmarks that inspect what was sent
+    server.prefix_cache = set()
+    server.hung_up = 0  # streamed replies abandoned by the client
+    server.cache_min_tokens = CACHE_MIN_TOKENS
+    server.cache_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the stand-in chat completions server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each reply")
+    parser.add_argument("--token-latency", type=float, default=0.0, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    server, base_url = start_stand_in_server(args.latency, args.port, args.token_latency)
+    print(f"Stand-in model listening on {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
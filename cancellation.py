@@ -0,0 +1,106 @@
+"""
+Cancellation of in-flight LLM calls
+Cancel tokens tied to a session's lifecycle, and accounting of the tokens and time they save
+"""
+
+import time
+import threading
+from typing import Dict, Optional
+
+
+class CallCancelled(Exception):
+    """Raised inside an engine call whose session no longer wants the result"""
+
+    def __init__(self, reason: str = "cancelled"):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class CancelToken:
+    """Shared by the calls of one engine; cancelled explicitly or after sitting idle
+
+    `idle_timeout` is seconds without a `touch()` after which the token counts as
+    cancelled, for work nobody is waiting on any more (e.g. a closed tab).
+    """
+
+    def __init__(self, idle_timeout: Optional[float] = None):
+        self.idle_timeout = idle_timeout
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+        self._touched = time.monotonic()
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def touch(self):
+        self._touched = time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.idle_timeout is not None and time.monotonic() - self._touched > self.idle_timeout:
+            self.cancel("idle")
+            return True
+        return False
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise CallCancelled(self.reason)
+
+
+class CancellationStats:
+    """Cancelled calls and an estimate of the output tokens and seconds they didn't spend
+
+    Estimates compare how far a call got with a running average of completed calls
+    of the same kind.
+    """
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._typical: Dict[str, Dict[str, float]] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def completed(self, label: str, output_tokens: int, seconds: float):
+        """Feed the running averages with a call that ran to the end"""
+        with self._lock:
+            typical = self._typical.get(label)
+            if typical is None:
+                self._typical[label] = {"output_tokens": float(output_tokens), "seconds": seconds}
+                return
+            a = self.smoothing
+            typical["output_tokens"] += a * (output_tokens - typical["output_tokens"])
+            typical["seconds"] += a * (seconds - typical["seconds"])
+
+    def cancelled(self, label: str, reason: str, output_tokens: int, seconds: float,
+                  max_output_tokens: int) -> Dict[str, float]:
+        """Record a call stopped after `seconds` with `output_tokens` written; returns the savings"""
+        with self._lock:
+            typical = self._typical.get(label, {"output_tokens": float(max_output_tokens), "seconds": 0.0})
+            saved = {
+                "tokens": max(0.0, typical["output_tokens"] - output_tokens),
+                "seconds": max(0.0, typical["seconds"] - seconds),
+            }
+            totals = self._totals.setdefault(label, {"cancelled": 0, "tokens_saved": 0.0, "seconds_saved": 0.0})
+            totals["cancelled"] += 1
+            totals["tokens_saved"] += saved["tokens"]
+            totals["seconds_saved"] += saved["seconds"]
+            totals[reason] = totals.get(reason, 0) + 1
+            return saved
+
+    def stats(self) -> Dict[str, dict]:
+        """Per operation: cancelled calls (also by reason) and estimated tokens and seconds saved"""
+        with self._lock:
+            return {label: {k: (round(v, 1) if isinstance(v, float) else v) for k, v in totals.items()}
+                    for label, totals in self._totals.items()}
+
+
+# Global accounting shared by every engine in the process
+_cancellation_stats = CancellationStats()
+
+def get_cancellation_stats() -> CancellationStats:
+    """Get the process-wide cancellation accounting"""
+    return _cancellation_stats
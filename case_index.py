@@ -0,0 +1,190 @@
+"""
+Case file index
+Built once per MysteryCase for fast name lookup and local cross-reference search
+"""
+
+import re
+import math
+import difflib
+import hashlib
+import unicodedata
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+# Titles stripped from names before matching ("Dr. Meera Iyer" -> "meera iyer")
+HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "prof", "shri", "sri", "smt", "kumari", "sir", "madam", "inspector"}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "did", "does", "for", "from", "had", "has", "have",
+    "he", "her", "his", "in", "into", "is", "it", "its", "of", "on", "or", "she", "that", "the", "their",
+    "them", "they", "this", "to", "was", "were", "what", "when", "where", "which", "who", "whom", "with",
+}
+
+# Kinds of entries the player is allowed to see (key clues give the solution away)
+PUBLIC_KINDS = ("alibi", "motive", "description", "location")
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def case_fingerprint(case) -> str:
+    """Stable content hash of a case"""
+    return hashlib.sha256(case.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a person or item name, dropping honorifics"""
+    words = normalize(name).split()
+    while len(words) > 1 and words[0] in HONORIFICS:
+        words = words[1:]
+    return " ".join(words)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into index terms (stopwords removed, plural 's' stripped)"""
+    terms = []
+    for word in normalize(text).split():
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class SearchHit(BaseModel):
+    """A single match from the case file search"""
+    kind: str = Field(description="alibi, motive, description, location or clue")
+    subject: str = Field(description="Suspect or evidence name the entry belongs to")
+    text: str = Field(description="Full text of the matching entry")
+    score: float = Field(description="Relevance score (higher is better)")
+
+
+class _Entry:
+    def __init__(self, kind: str, subject: str, text: str):
+        self.kind = kind
+        self.subject = subject
+        self.text = text
+        self.normalized = normalize(text)
+        self.terms = tokenize(text)
+
+
+class CaseIndex:
+    """Name lookups and an inverted index over the searchable text of one case"""
+
+    def __init__(self, case):
+        self.case = case
+        self.fingerprint = case_fingerprint(case)
+
+        # Exact and alias lookups for suspects and evidence
+        self._suspects: Dict[str, object] = {}
+        self._suspect_aliases: Dict[str, List[object]] = {}
+        for suspect in case.suspects:
+            key = normalize_name(suspect.name)
+            self._suspects[key] = suspect
+            for word in key.split():
+                self._suspect_aliases.setdefault(word, []).append(suspect)
+
+        self._evidence: Dict[str, object] = {normalize_name(e.name): e for e in case.evidence}
+
+        # Inverted index: term -> ids of entries containing it
+        self._entries: List[_Entry] = []
+        for suspect in case.suspects:
+            self._entries.append(_Entry("alibi", suspect.name, suspect.alibi))
+            self._entries.append(_Entry("motive", suspect.name, suspect.motive))
+        for evidence in case.evidence:
+            self._entries.append(_Entry("description", evidence.name, evidence.description))
+            self._entries.append(_Entry("location", evidence.name, evidence.location))
+        for clue in case.key_clues:
+            self._entries.append(_Entry("clue", "Key clue", clue))
+
+        self._postings: Dict[str, Set[int]] = {}
+        for i, entry in enumerate(self._entries):
+            for term in entry.terms:
+                self._postings.setdefault(term, set()).add(i)
+
+    def find_suspect(self, name: str):
+        """Find a suspect by full name, unique first/last name, or close spelling"""
+        key = normalize_name(name)
+        if key in self._suspects:
+            return self._suspects[key]
+
+        # A single word that identifies exactly one suspect ("Kapoor")
+        matches = self._suspect_aliases.get(key, [])
+        if len(matches) == 1:
+            return matches[0]
+
+        return self._closest(key, self._suspects)
+
+    def find_evidence(self, name: str):
+        """Find evidence by exact name, falling back to the single best fuzzy match"""
+        key = normalize_name(name)
+        if key in self._evidence:
+            return self._evidence[key]
+        return self._closest(key, self._evidence)
+
+    @staticmethod
+    def _closest(key: str, candidates: Dict[str, object], cutoff: float = 0.6):
+        """Best fuzzy match on character similarity with a boost for shared words
+
+        Returns None when two candidates match equally well, rather than guessing.
+        """
+        if not key:
+            return None
+        words = set(key.split())
+        scored = []
+        for candidate, item in candidates.items():
+            candidate_words = candidate.split()
+            score = difflib.SequenceMatcher(None, key, candidate).ratio()
+            if len(words) == 1:
+                # Misspelt first or last name ("Arjn" -> "Arjun Singh")
+                score = max(score, max(difflib.SequenceMatcher(None, key, w).ratio() for w in candidate_words))
+            shared = words & set(candidate_words)
+            if shared:
+                score = max(score, len(shared) / len(words | set(candidate_words)) + 0.3)
+            if score >= cutoff:
+                scored.append((score, item))
+
+        if not scored:
+            return None
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < 1e-6:
+            return None
+        return scored[0][1]
+
+    def search(self, query: str, kinds: Optional[List[str]] = None, limit: int = 10) -> List[SearchHit]:
+        """Rank entries by how many query terms they contain, weighted by rarity"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        phrase = normalize(query) if len(terms) > 1 else None
+        total = len(self._entries)
+        scores: Dict[int, float] = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + total / len(postings))
+            for i in postings:
+                scores[i] = scores.get(i, 0.0) + idf
+
+        hits = []
+        for i, score in scores.items():
+            entry = self._entries[i]
+            if kinds is not None and entry.kind not in kinds:
+                continue
+            # Prefer entries that also contain the query as a phrase
+            if phrase and phrase in entry.normalized:
+                score *= 1.5
+            hits.append(SearchHit(kind=entry.kind, subject=entry.subject, text=entry.text, score=round(score, 3)))
+
+        hits.sort(key=lambda h: h.score, reverse=True)
+        return hits[:limit]
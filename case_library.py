@@ -0,0 +1,187 @@
+"""
+Pre-generated case library
+Compact SQLite store of MysteryCases with MinHash near-duplicate detection
+"""
+
+import os
+import zlib
+import random
+import struct
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+from case_index import normalize, case_fingerprint
+from mystery_engine import MysteryCase
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def encode_case(case: MysteryCase) -> bytes:
+    return zlib.compress(case.model_dump_json().encode("utf-8"), 9)
+
+
+def decode_case(blob: bytes) -> MysteryCase:
+    return MysteryCase.model_validate_json(zlib.decompress(blob))
+
+
+def case_shingles(case: MysteryCase, size: int = 3) -> Set[str]:
+    """Word shingles over the parts that make two cases feel the same"""
+    parts = [case.title, case.victim, " ".join(s.name for s in case.suspects), case.solution]
+    shingles = set()
+    for part in parts:
+        words = normalize(part).split()
+        if len(words) < size:
+            shingles.add(" ".join(words))
+        for i in range(len(words) - size + 1):
+            shingles.add(" ".join(words[i:i + size]))
+    # Names are the strongest signal; add them whole so short names still count
+    shingles.update("name:" + normalize(s.name) for s in case.suspects)
+    shingles.discard("")
+    return shingles
+
+
+class MinHasher:
+    """MinHash signatures with banded LSH lookup for Jaccard similarity"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [(rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big") for s in shingles]
+        if not hashes:
+            return tuple([_MERSENNE_PRIME] * self.num_perm)
+        return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms)
+
+    def band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, bytes]]:
+        return [
+            (band, hashlib.blake2b(struct.pack(f"{self.rows}Q", *signature[band * self.rows:(band + 1) * self.rows]),
+                                   digest_size=8).digest())
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+        return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class CaseLibrary:
+    """SQLite-backed case store that rejects near-duplicates on insert"""
+
+    def __init__(self, path: str = "cases.db", threshold: float = 0.5, hasher: Optional[MinHasher] = None):
+        self.path = path
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cases (
+                id INTEGER PRIMARY KEY,
+                theme TEXT NOT NULL,
+                fingerprint TEXT NOT NULL UNIQUE,
+                title TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS cases_theme ON cases(theme);
+            """
+        )
+        self._db.commit()
+
+        # Rebuild the in-memory LSH buckets from stored signatures (resume support)
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        for case_id, blob in self._db.execute("SELECT id, signature FROM cases"):
+            self._remember(case_id, self._unpack(blob))
+
+    def _pack(self, signature: Tuple[int, ...]) -> bytes:
+        return struct.pack(f"{len(signature)}Q", *signature)
+
+    def _unpack(self, blob: bytes) -> Tuple[int, ...]:
+        return struct.unpack(f"{len(blob) // 8}Q", blob)
+
+    def _remember(self, case_id: int, signature: Tuple[int, ...]):
+        self._signatures[case_id] = signature
+        for key in self.hasher.band_keys(signature):
+            self._buckets.setdefault(key, []).append(case_id)
+
+    def find_duplicate(self, case: MysteryCase) -> Optional[Tuple[int, float]]:
+        """Return (case id, similarity) of the most similar stored case above the threshold"""
+        return self._find_duplicate(self.hasher.signature(case_shingles(case)))
+
+    def _find_duplicate(self, signature: Tuple[int, ...]) -> Optional[Tuple[int, float]]:
+        candidates = set()
+        for key in self.hasher.band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        best = None
+        for case_id in candidates:
+            score = MinHasher.similarity(signature, self._signatures[case_id])
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (case_id, score)
+        return best
+
+    def add(self, theme: str, case: MysteryCase) -> Optional[int]:
+        """Store a case; returns its id, or None if it is a near-duplicate"""
+        signature = self.hasher.signature(case_shingles(case))
+        with self._lock:
+            if self._find_duplicate(signature):
+                return None
+            try:
+                cursor = self._db.execute(
+                    "INSERT INTO cases (theme, fingerprint, title, signature, body) VALUES (?, ?, ?, ?, ?)",
+                    (theme, case_fingerprint(case), case.title, self._pack(signature), encode_case(case)),
+                )
+            except sqlite3.IntegrityError:
+                return None  # exact duplicate
+            self._db.commit()
+            self._remember(cursor.lastrowid, signature)
+            return cursor.lastrowid
+
+    def count(self, theme: Optional[str] = None) -> int:
+        with self._lock:
+            if theme is None:
+                return self._db.execute("SELECT COUNT(*) FROM cases").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM cases WHERE theme = ?", (theme,)).fetchone()[0]
+
+    def get(self, case_id: int) -> Optional[MysteryCase]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM cases WHERE id = ?", (case_id,)).fetchone()
+        return decode_case(row[0]) if row else None
+
+    def random_case(self, theme: str) -> Optional[MysteryCase]:
+        """Pick a stored case for a theme, or None if the library has none"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM cases WHERE theme = ? ORDER BY RANDOM() LIMIT 1", (theme,)
+            ).fetchone()
+        return decode_case(row[0]) if row else None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# Library the game serves ready-made cases from under load (MYSTERYAI_CASE_LIBRARY, a path)
+_library = None
+_library_lock = threading.Lock()
+
+def get_case_library() -> Optional[CaseLibrary]:
+    """Get the configured case library, or None if there isn't one"""
+    global _library
+
+    path = os.getenv("MYSTERYAI_CASE_LIBRARY")
+    if not path or not os.path.exists(path):
+        return None
+    with _library_lock:
+        if _library is None:
+            _library = CaseLibrary(path)
+    return _library
@@ -0,0 +1,105 @@
+"""
+Incremental clue discovery tracker
+Marks which key clues the player has surfaced, matching suspect replies and examined evidence locally
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+from case_index import tokenize
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class ClueTracker:
+    """Tracks discovered key clues and a compact summary of investigation progress
+
+    Words of `names` (the suspects and the victim) don't count towards a match: they come up
+    in any answer, and a clue marked found by names alone would give away who it points to.
+    The clue texts themselves are never handed back; for each clue found the tracker keeps the
+    sentence the player read that matched it (a key clue can name the culprit when that didn't).
+    """
+
+    def __init__(self, key_clues: List[str], names: Iterable[str] = (), threshold: float = 0.5,
+                 min_terms: int = 2):
+        self.key_clues = key_clues
+        self.threshold = threshold
+        name_terms = set(tokenize(" ".join(names)))
+        self._clue_terms: List[Set[str]] = []
+        for clue in key_clues:
+            terms = set(tokenize(clue))
+            # A clue that is nothing but names can only be matched on them
+            self._clue_terms.append(terms - name_terms or terms)
+        self._min_terms = [min(min_terms, len(terms)) for terms in self._clue_terms]
+        self.found: List[bool] = [False] * len(key_clues)
+        self.leads: Dict[int, str] = {}
+        self.questions: Dict[str, int] = {}
+        self.examined: List[str] = []
+
+    def observe(self, text: str, source: str = "") -> List[int]:
+        """Check new text against the clues still missing; returns indexes newly found"""
+        terms = set(tokenize(text))
+        newly_found = []
+        for i, clue_terms in enumerate(self._clue_terms):
+            if self.found[i] or not clue_terms:
+                continue
+            matched = len(clue_terms & terms)
+            if matched >= self._min_terms[i] and matched / len(clue_terms) >= self.threshold:
+                self.found[i] = True
+                self.leads[i] = self._lead(text, clue_terms, source)
+                newly_found.append(i)
+        return newly_found
+
+    @staticmethod
+    def _lead(text: str, clue_terms: Set[str], source: str) -> str:
+        """The sentence of `text` that shares the most terms with a clue, labelled with where it came from"""
+        sentence = max(_SENTENCE_END.split(text.strip()), key=lambda s: len(clue_terms & set(tokenize(s))))
+        if len(sentence) > 200:
+            sentence = sentence[:197].rstrip() + "..."
+        return f"{source}: {sentence}" if source else sentence
+
+    def record_interrogation(self, suspect: str, reply: str) -> List[int]:
+        self.questions[suspect] = self.questions.get(suspect, 0) + 1
+        return self.observe(reply, suspect)
+
+    def record_evidence(self, evidence: str, text: str) -> List[int]:
+        if evidence not in self.examined:
+            self.examined.append(evidence)
+        return self.observe(text, evidence)
+
+    @property
+    def discovered(self) -> List[str]:
+        """What the player read that uncovered each clue found, in clue order"""
+        return [self.leads.get(i, "") for i, found in enumerate(self.found) if found]
+
+    @property
+    def progress(self) -> float:
+        """Fraction of key clues discovered (0.0 - 1.0)"""
+        return sum(self.found) / len(self.found) if self.found else 0.0
+
+    def state(self) -> dict:
+        """Serializable progress, for saving a session"""
+        return {"found": [i for i, f in enumerate(self.found) if f], "leads": {str(i): lead for i, lead in self.leads.items()},
+                "questions": self.questions, "examined": self.examined}
+
+    def restore(self, state: dict):
+        for i in state.get("found", []):
+            if 0 <= i < len(self.found):
+                self.found[i] = True
+        for i, lead in state.get("leads", {}).items():
+            if 0 <= int(i) < len(self.found) and self.found[int(i)]:
+                self.leads[int(i)] = lead
+        self.questions = dict(state.get("questions", {}))
+        self.examined = list(state.get("examined", []))
+
+    def summary(self) -> str:
+        """Compact progress vector for prompts; its size doesn't grow with the session"""
+        found = [str(i) for i, f in enumerate(self.found, 1) if f]
+        missing = [str(i) for i, f in enumerate(self.found, 1) if not f]
+        questioned = ", ".join(f"{name} x{count}" for name, count in self.questions.items())
+        return (
+            f"Clues found: {', '.join(found) or 'none'}; "
+            f"not yet found: {', '.join(missing) or 'none'}; "
+            f"suspects questioned: {questioned or 'none'}; "
+            f"evidence examined: {', '.join(self.examined) or 'none'}"
+        )
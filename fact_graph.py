@@ -0,0 +1,440 @@
+"""
+Case fact graph
+People, places, times and objects drawn from alibis, evidence and the solution once per case,
+for instant timeline and contradiction checks without an LLM call
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from case_index import normalize, normalize_name, STOPWORDS
+
+DAY = 24 * 60
+
+# A claim made at a single time ("at 9 pm") counts for this many minutes either side
+POINT_WINDOW = 30
+
+_TIME = r"(?:(?:\d{1,2})(?:[:.]\d{2})?\s*(?:[ap]\.?m\.?)?|midnight|noon)"
+_ONE_TIME = re.compile(r"\b(\d{1,2})(?:[:.](\d{2}))?\s*(?:([ap])\.?m\b\.?)?(?![\w:])|\b(midnight|noon)\b", re.I)
+_BEFORE_TIME = re.compile(r"\b(?:at|around|about|by|until|till|before|after|past|to|near|from|since)\s+$", re.I)
+_EVENT_NOUN = re.compile(r"\s+(?!(?:and|or|to|until|till|when|while|on|in|at|that|the|but|so|as|he|she|they|i|we)\b)[a-z]", re.I)
+_RANGE = re.compile(rf"(?:\b(?:between|from|throughout|covering)\s+)?\b({_TIME})\s*(?:and|to|until|till|-|–)\s*({_TIME})(?![\w:])", re.I)
+
+# "I was at the temple", "stayed in the library", "went to the market", "was with Ravi in the kitchen";
+# the place follows the match, up to the next one
+_PLACE = re.compile(r"\b(?:was|were|stayed|remained|been|went|go|sat|waited)\s+(?:with\s+[^,.;]+?\s+)?"
+                    r"(?:to|at|in|inside|on)\s+", re.I)
+_SCENE = re.compile(r"\b(?:in|at|inside|on)\s+((?:the|a|an|his|her|their)\s+.+)", re.I)
+_PLACE_STOP = {
+    "from", "between", "until", "till", "since", "around", "about", "with", "for", "when", "while",
+    "before", "after", "and", "because", "during", "throughout", "all", "who", "where", "which", "but",
+}
+# Words ending in -ing that belong to a place name ("the wine tasting room", not "the kitchen supervising the cooks")
+_ING_NOUNS = {
+    "evening", "morning", "building", "wedding", "meeting", "ring", "king", "spring", "parking", "dining",
+    "landing", "ceiling", "painting", "wing", "clothing", "string", "booking", "swimming", "lodging",
+    "tasting", "dressing", "waiting", "living", "sitting", "drawing", "smoking", "changing", "shopping",
+    "fishing", "boating", "training", "recording", "editing", "printing", "dancing", "gaming", "banking",
+}
+_DETERMINERS = {"the", "a", "an", "my", "our", "his", "her", "their", "its"}
+# "Under a cabinet in the spa pavilion" -> "the spa pavilion"
+_SPOT = re.compile(r"^(?:(?:under|behind|beside|near|inside|outside|on|in|at|by|next to|beneath)\s+)?"
+                   r"(?:(?:a|an|the)\s+)?[\w' ]+?\s+(?:in|at|of|on|inside)\s+(.+)$", re.I)
+
+# How evidence speaks about a person
+_ABSENT = re.compile(r"\b(no sign|not|never|no entry|no record|did not|didn't|wasn't|was not|absent|missing|"
+                     r"contradicts?|left early|never arrived)\b", re.I)
+_CONFIRMS = re.compile(r"\b(confirms?|corroborates?|vouch(?:es)?|swear|saw|seen|spotted)\b", re.I)
+_TIES = re.compile(r"\b(belong(?:s|ing)? to|recogni[sz]ed|fingerprints?|footprints?|dropped|monogrammed|"
+                   r"initials|owned by)\b", re.I)
+
+# Relations player-facing queries may return; the solution is kept out
+PUBLIC_RELATIONS = ("claims_at", "seen_at", "not_at", "placed_at", "victim_at", "found_at", "belongs_to")
+
+
+def parse_time(text: str) -> int:
+    """Minutes after midnight for '9 pm', '9:30pm', '21:00', 'midnight'..."""
+    times = _times_in(text, require_marker=False)
+    if not times:
+        raise ValueError(f"Not a time of day: {text!r}")
+    return times[0][1]
+
+
+def format_time(minutes: int) -> str:
+    minutes %= DAY
+    hour, minute = divmod(minutes, 60)
+    suffix = "am" if hour < 12 else "pm"
+    return f"{hour % 12 or 12}:{minute:02d} {suffix}"
+
+
+def _clock(match, meridiem: Optional[str] = None) -> Optional[int]:
+    """Minutes for one _ONE_TIME match; `meridiem` fills in a missing am/pm"""
+    if match.group(4):
+        return 0 if match.group(4).lower() == "midnight" else 12 * 60
+    hour, minute = int(match.group(1)), int(match.group(2) or 0)
+    marker = (match.group(3) or meridiem or "").lower()
+    if hour > 23 or minute > 59 or (marker and hour > 12):
+        return None
+    if marker == "p" and hour < 12:
+        hour += 12
+    elif marker == "a" and hour == 12:
+        hour = 0
+    return hour * 60 + minute
+
+
+def _has_marker(match) -> bool:
+    """Unambiguously a time: am/pm, midnight/noon or a 24-hour '21:00'"""
+    return bool(match.group(4) or match.group(3) or ":" in match.group(0))
+
+
+def _times_in(text: str, require_marker: bool = True) -> List[Tuple[int, int, int]]:
+    """(position, start, end) of each time or time range in `text`, in minutes after midnight
+
+    Bare numbers ("45", "3 suspects") only count inside a range that ends in a clear time.
+    Ranges that pass midnight end on the next day (end > 24h).
+    """
+    found = []
+    taken = []
+    for match in _RANGE.finditer(text):
+        first, second = _ONE_TIME.search(match.group(1)), _ONE_TIME.search(match.group(2))
+        if not (first and second and _has_marker(second)):
+            continue
+        end = _clock(second)
+        # "10:30 and 11:30 pm": a first time without am/pm takes the second's
+        start = _clock(first, second.group(3)) if not (first.group(3) or first.group(4)) else None
+        if start is None:
+            start = _clock(first)
+        if start is None or end is None:
+            continue
+        if end < start and not (first.group(3) or first.group(4)) and second.group(3):
+            # "between 11 and 1 am": the first time is on the other side of noon/midnight
+            flipped = _clock(first, "a" if second.group(3).lower() == "p" else "p")
+            start = flipped if flipped is not None else start
+        if end < start:
+            end += DAY
+        found.append((match.start(), start, end))
+        taken.append(match.span())
+    for match in _ONE_TIME.finditer(text):
+        if any(a <= match.start() < b for a, b in taken):
+            continue
+        if require_marker and not _has_marker(match):
+            continue
+        if require_marker and match.group(4) and (not _BEFORE_TIME.search(text, 0, match.start())
+                                                  or _EVENT_NOUN.match(text, match.end())):
+            # "midnight mass", "noon prayers" are events, not times
+            continue
+        minutes = _clock(match)
+        if minutes is not None:
+            found.append((match.start(), minutes, minutes))
+    found.sort()
+    return found
+
+
+def _place_key(place: str) -> str:
+    words = normalize(place).split()
+    while words and words[0] in _DETERMINERS:
+        words = words[1:]
+    return " ".join(words)
+
+
+def _trim_place(phrase: str) -> str:
+    """Cut a place phrase at the end of its clause"""
+    phrase = re.split(r"[.,;:!?()]", phrase, maxsplit=1)[0]
+    words = phrase.split()
+    kept = []
+    for i, word in enumerate(words):
+        plain = normalize(word)
+        if plain in _PLACE_STOP or re.match(r"\d", plain):
+            break
+        if plain in ("at", "in", "on", "by") and i + 1 < len(words) and re.match(r"\d", words[i + 1]):
+            break
+        if (kept and len(plain) > 4 and plain.endswith("ing") and plain not in _ING_NOUNS
+                and normalize(kept[-1]) not in _DETERMINERS):
+            break
+        kept.append(word)
+    while kept and normalize(kept[-1]) in STOPWORDS:
+        kept.pop()
+    return " ".join(kept)
+
+
+def _sentences(text: str) -> List[str]:
+    # Split where a sentence end is followed by a capital, so "9.30" stays whole
+    return [s for s in re.split(r"(?<=[.!?])\s+(?=[A-Z])", text) if s.strip()]
+
+
+class Fact(BaseModel):
+    """One relation drawn from the case file"""
+    relation: str = Field(description="claims_at, seen_at, not_at, placed_at, victim_at, found_at, belongs_to or committed")
+    subject: str = Field(description="Person or evidence the fact is about")
+    object: str = Field(description="Place, or the person an object belongs to")
+    start: Optional[int] = Field(None, description="Minutes after midnight; None when no time is given")
+    end: Optional[int] = Field(None, description="Minutes after midnight, past 24h for ranges over midnight")
+    source: str = Field(description="Where the fact comes from, e.g. a suspect's alibi or an evidence name")
+    text: str = Field(description="The sentence it was read from")
+
+    @property
+    def when(self) -> str:
+        if self.start is None:
+            return "time not stated"
+        if self.start == self.end:
+            return f"at {format_time(self.start)}"
+        return f"{format_time(self.start)} - {format_time(self.end)}"
+
+    def covers(self, minutes: int) -> bool:
+        """Whether the fact holds at `minutes` after midnight"""
+        if self.start is None:
+            return False
+        window = POINT_WINDOW if self.start == self.end else 0
+        return any(self.start - window <= t <= self.end + window for t in (minutes, minutes + DAY))
+
+    def overlaps(self, other: "Fact") -> bool:
+        """Whether both facts hold at some common time (facts without a time overlap anything)
+
+        Back-to-back facts ("until 10 pm", "from 10 pm") don't overlap.
+        """
+        if self.start is None or other.start is None:
+            return True
+        a = POINT_WINDOW if self.start == self.end else 0
+        b = POINT_WINDOW if other.start == other.end else 0
+        return self.start - a < other.end + b and other.start - b < self.end + a
+
+
+class Conflict(BaseModel):
+    """A statement that doesn't square with the evidence or another statement"""
+    person: str = Field(description="Suspect whose statement is in question")
+    statement: str = Field(description="What they claimed")
+    source: str = Field(description="Evidence or alibi that disagrees")
+    reason: str = Field(description="Why the two don't fit together")
+
+
+class FactGraph:
+    """Facts of one case, indexed by person and place"""
+
+    def __init__(self, case):
+        self.case = case
+        self.victim = re.split(r",| - | – |\(", case.victim, maxsplit=1)[0].strip()
+        self.facts: List[Fact] = []
+        self.places: Dict[str, str] = {}
+
+        # Names as they may appear in free text: full names and first/last names unique to one suspect
+        self._names: Dict[str, str] = {}
+        owners: Dict[str, set] = {}
+        for suspect in case.suspects:
+            key = normalize_name(suspect.name)
+            self._names[key] = suspect.name
+            for word in key.split():
+                owners.setdefault(word, set()).add(suspect.name)
+        victim_words = set(normalize_name(self.victim).split())
+        for word, names in owners.items():
+            if len(names) == 1 and len(word) > 2 and word not in STOPWORDS and word not in victim_words:
+                self._names.setdefault(word, next(iter(names)))
+
+        self._read_crime()
+        for suspect in case.suspects:
+            self._read_alibi(suspect)
+        for evidence in case.evidence:
+            self._read_evidence(evidence)
+        self._read_solution()
+
+        self._by_subject: Dict[str, List[Fact]] = {}
+        for fact in self.facts:
+            self._by_subject.setdefault(fact.subject, []).append(fact)
+
+    # Extraction
+
+    def _add(self, relation: str, subject: str, obj: str, times: Tuple[Optional[int], Optional[int]],
+             source: str, text: str) -> Fact:
+        fact = Fact(relation=relation, subject=subject, object=obj, start=times[0], end=times[1],
+                    source=source, text=text.strip())
+        self.facts.append(fact)
+        return fact
+
+    def _known_place(self, phrase: str) -> Optional[str]:
+        """A place already in the graph that `phrase` refers to ("Temple office" -> "the temple")"""
+        key = _place_key(phrase)
+        if not key:
+            return None
+        if key in self.places:
+            return self.places[key]
+        inside = [known for known in self.places if re.search(rf"\b{re.escape(known)}\b", key)]
+        if inside:
+            return self.places[max(inside, key=len)]
+        around = [known for known in self.places if re.search(rf"\b{re.escape(key)}\b", known)]
+        if len(around) == 1:
+            return self.places[around[0]]
+        return None
+
+    def _place(self, phrase: str) -> str:
+        """Canonical name of a place, adding it to the graph if it's new"""
+        known = self._known_place(phrase)
+        if known:
+            return known
+        if _place_key(phrase):
+            self.places[_place_key(phrase)] = phrase
+        return phrase
+
+    def _people_in(self, text: str) -> List[str]:
+        plain = f" {normalize(text)} "
+        people = []
+        for key, name in sorted(self._names.items(), key=lambda kv: -len(kv[0])):
+            if f" {key} " in plain and name not in people:
+                people.append(name)
+        return people
+
+    def _first_time(self, *texts: str) -> Tuple[Optional[int], Optional[int]]:
+        for text in texts:
+            times = _times_in(text)
+            if times:
+                return times[0][1:]
+        return None, None
+
+    def _read_crime(self):
+        case = self.case
+        scene = _SCENE.search(case.crime)
+        self.scene = self._place(_trim_place(scene.group(1))) if scene else None
+        killing = [e.significance for e in case.evidence
+                   if re.search(r"\b(killed|murder|died|death|poison)", e.significance, re.I)]
+        self.crime_time = self._first_time(case.crime, case.initial_scene, *killing)
+        if self.scene:
+            self._add("victim_at", self.victim, self.scene, self.crime_time, "The crime", case.crime)
+
+    def _read_alibi(self, suspect):
+        # Places are read in order. A place takes the time stated in its own clause, else one stated
+        # since the previous place ("Between 9 and 10 pm I was at the temple"); otherwise it picks up
+        # where the previous place left off ("..., then I went to my room"), or stays untimed when
+        # no time has been stated yet
+        last: Tuple[Optional[int], Optional[int]] = (None, None)
+        for sentence in _sentences(suspect.alibi):
+            times = _times_in(sentence)
+            matches = list(_PLACE.finditer(sentence))
+            since = 0
+            for i, match in enumerate(matches):
+                following = matches[i + 1].start() if i + 1 < len(matches) else len(sentence)
+                place = _trim_place(sentence[match.end():following])
+                if _place_key(place) in ("", "there", "here"):
+                    continue
+                clause = re.search(r"[.,;:!?]", sentence[match.end():following])
+                clause_end = match.end() + clause.start() if clause else following
+                stated = ([t for t in times if match.start() <= t[0] < clause_end]
+                          or [t for t in times if since <= t[0] < match.start()][-1:])
+                if stated:
+                    last = stated[0][1:]
+                elif last[0] is not None:
+                    last = (last[1], last[1] + POINT_WINDOW)
+                # "my office" is theirs, not anyone else's office
+                place = re.sub(r"^my\b", lambda _: f"{suspect.name}'s", place, flags=re.I)
+                # The claim's own words, so "with Ravi" only goes with the place it was said of
+                text = sentence[since:clause_end if i + 1 < len(matches) else len(sentence)]
+                text = re.sub(r"^[\s,;:]*(?:and|then|but)?\s*", "", text)
+                self._add("claims_at", suspect.name, self._place(place), last, f"{suspect.name}'s alibi",
+                          text[:1].upper() + text[1:])
+                since = clause_end
+
+    def _claims(self, person: str) -> List[Fact]:
+        return [f for f in self.facts if f.subject == person and f.relation == "claims_at"]
+
+    def _mentions_place(self, text: str, place: str) -> bool:
+        key = _place_key(place)
+        return bool(key) and re.search(rf"\b{re.escape(key)}\b", normalize(text)) is not None
+
+    def _read_evidence(self, evidence):
+        text = f"{evidence.description} {evidence.significance}"
+        spot = _SPOT.match(evidence.location)
+        found_at = (self._known_place(evidence.location) or (spot and self._known_place(spot.group(1)))
+                    or self._place(spot.group(1) if spot else evidence.location))
+        when = self._first_time(evidence.description, evidence.significance)
+        self._add("found_at", evidence.name, found_at, when, evidence.name, evidence.location)
+
+        for person in self._people_in(f"{evidence.name} {text}"):
+            claims = self._claims(person)
+            claimed = [c for c in claims if self._mentions_place(f"{text} {evidence.location}", c.object)]
+            absent, confirms = _ABSENT.search(text), _CONFIRMS.search(text)
+            if claimed and absent and not confirms:
+                for claim in claimed:
+                    self._add("not_at", person, claim.object, when if when[0] is not None else (claim.start, claim.end),
+                              evidence.name, evidence.description)
+            elif claimed and confirms and not absent:
+                for claim in claimed:
+                    self._add("seen_at", person, claim.object, when if when[0] is not None else (claim.start, claim.end),
+                              evidence.name, evidence.description)
+            elif _TIES.search(text):
+                self._add("belongs_to", evidence.name, person, (None, None), evidence.name, evidence.description)
+                # Something of theirs at the scene puts them there around the time of the crime
+                at = when if when[0] is not None else (self.crime_time if found_at == self.scene else (None, None))
+                self._add("placed_at", person, found_at, at, evidence.name, evidence.description)
+
+    def _read_solution(self):
+        solution = self.case.solution
+        people = self._people_in(solution)
+        if not people:
+            return
+        plain = normalize(solution)
+        culprit = min(people, key=lambda name: plain.find(normalize_name(name).split()[0]))
+        self._add("committed", culprit, self.scene or "", self.crime_time, "The solution", solution)
+
+    # Queries
+
+    def facts_about(self, name: str, include_hidden: bool = False) -> List[Fact]:
+        """Everything known about a person or piece of evidence"""
+        return [f for f in self._by_subject.get(name, []) if include_hidden or f.relation in PUBLIC_RELATIONS]
+
+    def who_was_where(self, time, include_hidden: bool = False) -> List[Fact]:
+        """Whereabouts that hold at `time` ('9 pm' or minutes after midnight), by person"""
+        minutes = parse_time(time) if isinstance(time, str) else time
+        relations = {"claims_at", "seen_at", "not_at", "placed_at", "victim_at"}
+        if include_hidden:
+            relations.add("committed")
+        hits = [f for f in self.facts if f.relation in relations and f.covers(minutes)]
+        return sorted(hits, key=lambda f: (f.subject != self.victim, f.subject, f.relation))
+
+    def timeline(self, include_hidden: bool = False) -> List[Fact]:
+        """Facts with a time, earliest first"""
+        timed = [f for f in self.facts if f.start is not None and (include_hidden or f.relation in PUBLIC_RELATIONS)]
+        return sorted(timed, key=lambda f: (f.start, f.subject))
+
+    def conflicts_with(self, evidence_name: str) -> List[Conflict]:
+        """Alibis that this piece of evidence contradicts"""
+        conflicts = []
+        for fact in self.facts:
+            if fact.source != evidence_name or fact.relation not in ("not_at", "placed_at"):
+                continue
+            for claim in self._claims(fact.subject):
+                if not claim.overlaps(fact):
+                    continue
+                if fact.relation == "not_at" and claim.object == fact.object:
+                    reason = f"{evidence_name} says {fact.subject} was not at {fact.object} ({fact.when})"
+                elif fact.relation == "placed_at" and claim.object != fact.object and fact.start is not None:
+                    # Belongings found somewhere only contradict an alibi when we know when they got there
+                    reason = f"{evidence_name} puts {fact.subject} at {fact.object} ({fact.when}), not {claim.object}"
+                else:
+                    continue
+                conflicts.append(Conflict(person=fact.subject, statement=claim.text, source=evidence_name, reason=reason))
+        return conflicts
+
+    def alibi_conflicts(self) -> List[Conflict]:
+        """Suspects who claim to have been with someone who says they were elsewhere at the time"""
+        conflicts = []
+        for claim in [f for f in self.facts if f.relation == "claims_at"]:
+            for other in self._people_in(claim.text):
+                if other == claim.subject:
+                    continue
+                for theirs in self._claims(other):
+                    # Two alibis only clash when both say when
+                    if theirs.start is None or claim.start is None:
+                        continue
+                    if theirs.object != claim.object and theirs.overlaps(claim):
+                        conflicts.append(Conflict(
+                            person=claim.subject, statement=claim.text, source=f"{other}'s alibi",
+                            reason=f"{other} says they were at {theirs.object} ({theirs.when}), "
+                                   f"not with {claim.subject} at {claim.object}"))
+        # Each mismatch also shows up from the other side when both alibis name each other
+        return conflicts
+
+    def conflicts(self) -> List[Conflict]:
+        """Every contradiction the case file holds: evidence against alibis, and alibis against each other"""
+        found = []
+        for evidence in self.case.evidence:
+            found.extend(self.conflicts_with(evidence.name))
+        return found + self.alibi_conflicts()
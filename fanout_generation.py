@@ -0,0 +1,194 @@
+"""
+Fan-out mystery generation
+Writes a compact case skeleton first, then expands the scene, suspects and evidence in parallel calls
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import BaseModel, Field
+
+from mystery_engine import MysteryCase, Suspect, Evidence
+from scheduler import INTERACTIVE
+from tracing import get_tracer
+
+
+class SuspectOutline(BaseModel):
+    """Short outline of a suspect, expanded later"""
+    name: str = Field(description="Indian name of the suspect")
+    age: int = Field(description="Age of the suspect")
+    occupation: str = Field(description="Their job or role")
+    role: str = Field(description="'culprit', 'red herring' or 'innocent'")
+    whereabouts: str = Field(description="Where they claim to have been, one sentence")
+    motive: str = Field(description="Potential motive, one sentence")
+
+
+class EvidenceOutline(BaseModel):
+    """Short outline of a piece of evidence, expanded later"""
+    name: str = Field(description="Name/type of evidence")
+    location: str = Field(description="Where it was found")
+    points_to: str = Field(description="What it reveals, one sentence")
+
+
+class CaseSkeleton(BaseModel):
+    """Compact plan of a mystery case"""
+    title: str = Field(description="Engaging title for the mystery")
+    setting: str = Field(description="Location and time period")
+    victim: str = Field(description="Name and brief description of victim")
+    crime: str = Field(description="What crime was committed")
+    timeline: List[str] = Field(description="Key events in order, with times")
+    culprit: str = Field(description="Name of the guilty suspect (must be one of the suspects)")
+    solution: str = Field(description="Who did it and how, 2-3 sentences")
+    suspects: List[SuspectOutline] = Field(description="List of 3-5 suspects")
+    evidence: List[EvidenceOutline] = Field(description="List of 4-6 pieces of evidence")
+    key_clues: List[str] = Field(description="Critical clues that point to the solution")
+
+
+SKELETON_PROMPT = ChatPromptTemplate.from_template(
+    """You are a master mystery writer specializing in Indian settings. Plan a compelling, solvable
+    mystery case set in India. Only write the plan; details will be written later.
+
+    Theme: {theme}
+
+    Requirements:
+    - The mystery must be logically solvable with the given clues
+    - Include red herrings but make sure the real solution is deducible
+    - Exactly one suspect has role 'culprit' and their name matches `culprit`
+    - Use authentic Indian names, places and cultural context
+    - Keep every field short; one sentence per outline field
+
+    {format_instructions}
+
+    Case plan:"""
+)
+
+SCENE_PROMPT = ChatPromptTemplate.from_template(
+    """You are a master mystery writer specializing in Indian settings.
+
+    Case plan:
+    {skeleton}
+
+    Write the initial_scene: what the detective sees on arriving. Noir style, vivid and immersive,
+    200-300 words, rich with Indian cultural context. Do not reveal the culprit.
+
+    Scene:"""
+)
+
+SUSPECT_PROMPT = ChatPromptTemplate.from_template(
+    """You are a master mystery writer specializing in Indian settings.
+
+    Case plan:
+    {skeleton}
+
+    Write the full profile for the suspect {name} ({role}). Keep their name, age, occupation and
+    motive consistent with the plan. Give a detailed, believable alibi (50-100 words) with Indian
+    locations, customs and specific times. If they are the culprit, the alibi must contain the flaw
+    exposed by the key clues.
+
+    {format_instructions}
+
+    Suspect profile:"""
+)
+
+EVIDENCE_PROMPT = ChatPromptTemplate.from_template(
+    """You are a master mystery writer specializing in Indian settings.
+
+    Case plan:
+    {skeleton}
+
+    Write the full entry for the evidence "{name}" found at {location}. Give it a compelling
+    description and a clear significance consistent with the plan.
+
+    {format_instructions}
+
+    Evidence entry:"""
+)
+
+
+def _expand_suspect(engine, skeleton_json: str, outline: SuspectOutline, priority: int) -> Suspect:
+    parser = PydanticOutputParser(pydantic_object=Suspect)
+    response = engine._invoke(SUSPECT_PROMPT, {
+        "skeleton": skeleton_json,
+        "name": outline.name,
+        "role": outline.role,
+        "format_instructions": parser.get_format_instructions()
+    }, priority=priority, max_output_tokens=400)
+    with get_tracer().span("parse"):
+        suspect = parser.parse(response.content)
+    # The plan is authoritative for identity fields
+    return suspect.model_copy(update={"name": outline.name, "age": outline.age, "occupation": outline.occupation})
+
+
+def _expand_evidence(engine, skeleton_json: str, outline: EvidenceOutline, priority: int) -> Evidence:
+    parser = PydanticOutputParser(pydantic_object=Evidence)
+    response = engine._invoke(EVIDENCE_PROMPT, {
+        "skeleton": skeleton_json,
+        "name": outline.name,
+        "location": outline.location,
+        "format_instructions": parser.get_format_instructions()
+    }, priority=priority, max_output_tokens=300)
+    with get_tracer().span("parse"):
+        evidence = parser.parse(response.content)
+    return evidence.model_copy(update={"name": outline.name, "location": outline.location})
+
+
+def _write_scene(engine, skeleton_json: str, priority: int) -> str:
+    response = engine._invoke(SCENE_PROMPT, {"skeleton": skeleton_json}, priority=priority, max_output_tokens=500)
+    return response.content.strip()
+
+
+def validate_skeleton(skeleton: CaseSkeleton):
+    """Reject plans that can't produce a fair, solvable case"""
+    if not 3 <= len(skeleton.suspects) <= 5:
+        raise ValueError(f"Case plan has {len(skeleton.suspects)} suspects (expected 3-5)")
+    if not 4 <= len(skeleton.evidence) <= 6:
+        raise ValueError(f"Case plan has {len(skeleton.evidence)} pieces of evidence (expected 4-6)")
+    names = [s.name.lower() for s in skeleton.suspects]
+    if len(set(names)) != len(names):
+        raise ValueError("Case plan has duplicate suspect names")
+    if skeleton.culprit.lower() not in names:
+        raise ValueError(f"Culprit '{skeleton.culprit}' is not one of the suspects")
+    if not skeleton.key_clues:
+        raise ValueError("Case plan has no key clues")
+
+
+def generate_case_fanout(engine, theme: str, priority: int = INTERACTIVE, progress=None) -> MysteryCase:
+    """Generate a MysteryCase with one planning call followed by parallel expansion calls
+
+    `progress` only follows the planning call; the expansions run on worker threads.
+    """
+    parser = PydanticOutputParser(pydantic_object=CaseSkeleton)
+    response = engine._invoke(SKELETON_PROMPT, {
+        "theme": theme,
+        "format_instructions": parser.get_format_instructions()
+    }, priority=priority, max_output_tokens=900, progress=progress)
+    with get_tracer().span("parse"):
+        skeleton = parser.parse(response.content)
+        validate_skeleton(skeleton)
+
+    skeleton_json = skeleton.model_dump_json(indent=1)
+    tasks = len(skeleton.suspects) + len(skeleton.evidence) + 1
+    with ThreadPoolExecutor(max_workers=tasks) as pool:
+        def submit(fn, *args):
+            # Run each task in a copy of the caller's context so its trace spans nest correctly
+            return pool.submit(contextvars.copy_context().run, fn, *args)
+
+        scene = submit(_write_scene, engine, skeleton_json, priority)
+        suspects = [submit(_expand_suspect, engine, skeleton_json, s, priority) for s in skeleton.suspects]
+        evidence = [submit(_expand_evidence, engine, skeleton_json, e, priority) for e in skeleton.evidence]
+
+        case = MysteryCase(
+            title=skeleton.title,
+            setting=skeleton.setting,
+            victim=skeleton.victim,
+            crime=skeleton.crime,
+            initial_scene=scene.result(),
+            suspects=[f.result() for f in suspects],
+            evidence=[f.result() for f in evidence],
+            solution=skeleton.solution,
+            key_clues=skeleton.key_clues,
+        )
+    return case
@@ -0,0 +1,171 @@
+"""
+Shared HTTP client pool
+Lets every MysteryGameEngine in the process reuse keep-alive connections and TLS sessions
+"""
+
+import os
+import time
+import weakref
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from scheduler import key_id
+
+# Connection-level events reported by httpcore's trace extension
+_CONNECT_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+
+class _ClientStats:
+    """Per-client counters for calls and time spent opening connections"""
+
+    def __init__(self):
+        self.calls = 0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.last_used = time.monotonic()
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, request: httpx.Request):
+        with self._lock:
+            self.calls += 1
+            self.last_used = time.monotonic()
+
+    def on_trace(self, event: str, info: dict):
+        name, _, phase = event.rpartition(".")
+        if name not in _CONNECT_EVENTS:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            if phase == "started":
+                self._started[name] = now
+            elif phase == "complete" and name in self._started:
+                self.connect_seconds += now - self._started.pop(name)
+                if name == "connection.connect_tcp":
+                    self.connects += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "new_connections": self.connects,
+                "connect_ms_per_call": (self.connect_seconds / self.calls * 1000) if self.calls else 0.0,
+                "idle_s": time.monotonic() - self.last_used,
+            }
+
+
+class _PooledClients:
+    """Sync and async httpx clients shared by every engine with the same key and model"""
+
+    def __init__(self, limits: httpx.Limits, timeout: httpx.Timeout):
+        self.stats = _ClientStats()
+        self.owners = weakref.WeakSet()
+        stats = self.stats
+
+        def on_request(request: httpx.Request):
+            stats.on_request(request)
+            request.extensions["trace"] = stats.on_trace
+
+        async def on_request_async(request: httpx.Request):
+            stats.on_request(request)
+
+            async def trace(event: str, info: dict):
+                stats.on_trace(event, info)
+
+            request.extensions["trace"] = trace
+
+        self.sync = httpx.Client(
+            limits=limits, timeout=timeout, event_hooks={"request": [on_request]}
+        )
+        self.async_ = httpx.AsyncClient(
+            limits=limits, timeout=timeout, event_hooks={"request": [on_request_async]}
+        )
+
+    def close(self):
+        self.sync.close()
+        # The async client can only be closed from an event loop; dropping it
+        # lets its connections be garbage collected.
+        self.async_ = None
+
+
+class ClientPool:
+    """Pool of httpx clients keyed by (API key, model, base URL)
+
+    Idle connections inside a client are closed after `keepalive_expiry`
+    seconds by httpx itself; whole clients that no engine uses any more are
+    closed by `evict_idle()`.
+    """
+
+    def __init__(self, max_connections: int = 20, max_keepalive: int = 10,
+                 keepalive_expiry: float = 30.0, timeout: float = 60.0,
+                 client_idle_timeout: float = 600.0):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=10.0)
+        self.client_idle_timeout = client_idle_timeout
+        self._clients: Dict[Tuple[str, str, str], _PooledClients] = {}
+        self._lock = threading.Lock()
+
+    def clients(self, api_key: str, model: str, base_url: Optional[str] = None,
+                owner: object = None) -> Tuple[httpx.Client, httpx.AsyncClient]:
+        """Return the shared (sync, async) clients for this key/model, creating them on first use"""
+        self.evict_idle()
+        pool_key = (key_id(api_key), model, base_url or "")
+        with self._lock:
+            entry = self._clients.get(pool_key)
+            if entry is None:
+                entry = _PooledClients(self.limits, self.timeout)
+                self._clients[pool_key] = entry
+            if owner is not None:
+                entry.owners.add(owner)
+            return entry.sync, entry.async_
+
+    def evict_idle(self):
+        """Close clients that have no live owners and have been idle too long"""
+        now = time.monotonic()
+        with self._lock:
+            for pool_key, entry in list(self._clients.items()):
+                if len(entry.owners) == 0 and now - entry.stats.last_used > self.client_idle_timeout:
+                    entry.close()
+                    del self._clients[pool_key]
+
+    def stats(self) -> Dict[str, dict]:
+        """Connection reuse figures per pooled client"""
+        with self._lock:
+            entries = dict(self._clients)
+        report = {}
+        for (kid, model, base_url), entry in entries.items():
+            snapshot = entry.stats.snapshot()
+            snapshot["engines"] = len(entry.owners)
+            report[f"{kid}/{model}" + (f"@{base_url}" if base_url else "")] = snapshot
+        return report
+
+    def close(self):
+        with self._lock:
+            for entry in self._clients.values():
+                entry.close()
+            self._clients.clear()
+
+
+# Global client pool shared by every engine in the process
+_client_pool = None
+_client_pool_lock = threading.Lock()
+
+def get_client_pool() -> ClientPool:
+    """Get or create the process-wide client pool (limits come from the environment)"""
+    global _client_pool
+
+    with _client_pool_lock:
+        if _client_pool is None:
+            _client_pool = ClientPool(
+                max_connections=int(os.getenv("MYSTERYAI_HTTP_MAX_CONNECTIONS", "20")),
+                max_keepalive=int(os.getenv("MYSTERYAI_HTTP_MAX_KEEPALIVE", "10")),
+                keepalive_expiry=float(os.getenv("MYSTERYAI_HTTP_KEEPALIVE_EXPIRY", "30")),
+                timeout=float(os.getenv("MYSTERYAI_HTTP_TIMEOUT", "60")),
+            )
+    return _client_pool
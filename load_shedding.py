@@ -0,0 +1,221 @@
+"""
+Load shedding under saturation
+Watches scheduler queue depth and rolling LLM latency per API key and steps features down in
+stages, so players get quicker, plainer answers instead of spinners that never end
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Sequence, Tuple
+
+from scheduler import INTERACTIVE, get_scheduler, key_id
+from tracing import get_tracer
+
+# Service modes; each one keeps the degradations of the modes before it
+NORMAL = 0
+POOLED_CASES = 1       # new cases come from the case library or the offline generator
+SHORT_ANSWERS = 2      # shorter interrogation answers, hints from cache or the fact graph
+DEFERRED_VERDICTS = 3  # accusations are evaluated once the rush is over
+
+MODE_NAMES = {NORMAL: "normal", POOLED_CASES: "pooled_cases", SHORT_ANSWERS: "short_answers",
+              DEFERRED_VERDICTS: "deferred_verdicts"}
+
+# What players are told in each mode
+STATUS_MESSAGES = {
+    POOLED_CASES: "The AI is busier than usual, so new cases come ready-made from the case library.",
+    SHORT_ANSWERS: "The AI is under heavy load: suspects keep their answers short and hints come from the case notes.",
+    DEFERRED_VERDICTS: "The AI is overloaded: suspects answer briefly, hints come from the case notes and "
+                       "accusations are judged as soon as the rush eases.",
+}
+
+# Output cap for interrogation answers from SHORT_ANSWERS on
+SHORT_ANSWER_TOKENS = 120
+
+
+def _levels(name: str, default: str, cast) -> Tuple:
+    return tuple(cast(v) for v in os.getenv(name, default).split(","))
+
+
+class _KeyLoad:
+    """Recent latencies and the current mode for one API key"""
+
+    def __init__(self):
+        self.latencies: deque = deque(maxlen=1000)
+        self.mode = NORMAL
+        self.since = time.monotonic()
+        self.calm_since: Optional[float] = None
+
+
+class AdmissionController:
+    """Chooses a service mode per API key from queue depth and rolling latency
+
+    `queue_levels[i]` waiting interactive calls, or a rolling p90 latency (queue wait plus time
+    to first token) of `latency_levels[i]` seconds, puts a key in mode i + 1. Modes go up at
+    once and come down one step after `cooldown` seconds below the thresholds.
+    """
+
+    def __init__(self, queue_levels: Sequence[int] = (8, 16, 32),
+                 latency_levels: Sequence[float] = (4.0, 8.0, 15.0),
+                 window: float = 60.0, cooldown: float = 30.0, min_samples: int = 5,
+                 forced: Optional[int] = None):
+        self.queue_levels = tuple(queue_levels)
+        self.latency_levels = tuple(latency_levels)
+        self.window = window
+        self.cooldown = cooldown
+        self.min_samples = min_samples
+        self.forced = forced
+        self._lock = threading.Lock()
+        self._keys: Dict[str, _KeyLoad] = {}
+        self.transitions: Dict[str, int] = {}
+        self.recent: deque = deque(maxlen=50)
+
+    def _load(self, kid: str) -> _KeyLoad:
+        load = self._keys.get(kid)
+        if load is None:
+            load = self._keys[kid] = _KeyLoad()
+        return load
+
+    def observe(self, api_key: str, seconds: float):
+        """Record how long a call took to start answering (queue wait + time to first token)"""
+        with self._lock:
+            self._load(key_id(api_key)).latencies.append((time.monotonic(), seconds))
+
+    def _p90(self, load: _KeyLoad, now: float) -> float:
+        while load.latencies and load.latencies[0][0] < now - self.window:
+            load.latencies.popleft()
+        if len(load.latencies) < self.min_samples:
+            return 0.0
+        values = sorted(seconds for _, seconds in load.latencies)
+        return values[int(0.9 * (len(values) - 1))]
+
+    def mode(self, api_key: str) -> int:
+        """Current mode for a key, re-evaluated against the latest load"""
+        if self.forced is not None:
+            return self.forced
+        kid = key_id(api_key)
+        depth = get_scheduler().queue_depth(api_key, INTERACTIVE)
+        now = time.monotonic()
+        with self._lock:
+            load = self._load(kid)
+            p90 = self._p90(load, now)
+            target = NORMAL
+            for level, (queued, latency) in enumerate(zip(self.queue_levels, self.latency_levels), 1):
+                if depth >= queued or p90 >= latency:
+                    target = level
+            if target > load.mode:
+                self._switch(kid, load, target, now, depth, p90)
+            elif target < load.mode:
+                # Wait out a calm spell before relaxing, so a burst doesn't flap the mode
+                if load.calm_since is None:
+                    load.calm_since = now
+                elif now - load.calm_since >= self.cooldown:
+                    self._switch(kid, load, load.mode - 1, now, depth, p90)
+                    # Still calm, so the next step down is one more cool-down away
+                    load.calm_since = now
+            else:
+                load.calm_since = None
+            return load.mode
+
+    def _switch(self, kid: str, load: _KeyLoad, mode: int, now: float, depth: int, p90: float):
+        change = f"{MODE_NAMES[load.mode]}->{MODE_NAMES[mode]}"
+        self.transitions[change] = self.transitions.get(change, 0) + 1
+        self.recent.append({"time": time.time(), "key": kid, "change": change,
+                            "queue_depth": depth, "latency_p90_s": round(p90, 2),
+                            "after_s": round(now - load.since, 1)})
+        with get_tracer().span("admission.mode", key=kid, change=change, queue_depth=depth,
+                               latency_p90_s=round(p90, 2)):
+            pass
+        load.mode = mode
+        load.since = now
+        load.calm_since = None
+
+    def worst_mode(self) -> int:
+        """Highest mode any key is in"""
+        if self.forced is not None:
+            return self.forced
+        with self._lock:
+            return max((load.mode for load in self._keys.values()), default=NORMAL)
+
+    def stats(self) -> dict:
+        """Mode per key (keys shown as short hashes), transition counts and the latest transitions"""
+        now = time.monotonic()
+        with self._lock:
+            keys = {
+                kid: {
+                    "mode": MODE_NAMES[load.mode],
+                    "in_mode_s": round(now - load.since, 1),
+                    "latency_p90_s": round(self._p90(load, now), 2),
+                    "samples": len(load.latencies),
+                }
+                for kid, load in self._keys.items()
+            }
+            return {"forced": MODE_NAMES.get(self.forced), "keys": keys,
+                    "transitions": dict(self.transitions), "recent": list(self.recent)}
+
+
+class HintCache:
+    """Recent hints by request, and the latest one per case and difficulty, for degraded modes"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._exact: "OrderedDict[tuple, str]" = OrderedDict()
+        self._latest: "OrderedDict[tuple, str]" = OrderedDict()
+
+    def put(self, key: tuple, case: str, difficulty: str, hint: str):
+        with self._lock:
+            for table, k in ((self._exact, key), (self._latest, (case, difficulty))):
+                table[k] = hint
+                table.move_to_end(k)
+                if len(table) > self.max_entries:
+                    table.popitem(last=False)
+
+    def get(self, key: tuple, case: str, difficulty: str) -> Optional[str]:
+        """The hint for this exact request, else the latest for the case and difficulty"""
+        with self._lock:
+            return self._exact.get(key) or self._latest.get((case, difficulty))
+
+
+def pooled_case(theme: str):
+    """A ready-made case for `theme`: from the case library if configured, else generated offline
+
+    Returns (case, source) with source "library" or "offline".
+    """
+    from case_library import get_case_library
+    from procedural import generate_procedural_case, theme_name
+
+    library = get_case_library()
+    if library is not None:
+        case = library.random_case(theme_name(theme))
+        if case is not None:
+            return case, "library"
+    return generate_procedural_case(theme), "offline"
+
+
+# Global instances shared by every engine in the process
+_controller = None
+_hint_cache = HintCache()
+_controller_lock = threading.Lock()
+
+def get_admission_controller() -> AdmissionController:
+    """Get or create the process-wide admission controller (thresholds come from the environment)"""
+    global _controller
+
+    with _controller_lock:
+        if _controller is None:
+            forced = os.getenv("MYSTERYAI_FORCE_MODE")
+            modes = {name: mode for mode, name in MODE_NAMES.items()}
+            _controller = AdmissionController(
+                queue_levels=_levels("MYSTERYAI_SHED_QUEUE", "8,16,32", int),
+                latency_levels=_levels("MYSTERYAI_SHED_LATENCY", "4,8,15", float),
+                window=float(os.getenv("MYSTERYAI_SHED_WINDOW", "60")),
+                cooldown=float(os.getenv("MYSTERYAI_SHED_COOLDOWN", "30")),
+                forced=modes[forced] if forced else None,
+            )
+    return _controller
+
+def get_hint_cache() -> HintCache:
+    """Get the process-wide hint cache"""
+    return _hint_cache
@@ -4,17 +4,71 @@ Uses LangChain and OpenAI to generate mysteries and provide interactive gameplay
 """
 
 import os
+import re
 import json
-from typing import List, Dict, Optional
+import time
+import threading
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate, PromptTemplate
 from langchain.chains import LLMChain
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from scheduler import get_scheduler, INTERACTIVE, BACKGROUND
+from http_pool import get_client_pool
+from case_index import CaseIndex, SearchHit, PUBLIC_KINDS, normalize
+from singleflight import get_single_flight
+from tracing import get_tracer, traced
+from clue_tracker import ClueTracker
+from fact_graph import FactGraph, Fact, Conflict
+from load_shedding import (get_admission_controller, get_hint_cache, pooled_case,
+                           POOLED_CASES, SHORT_ANSWERS, DEFERRED_VERDICTS, SHORT_ANSWER_TOKENS)
+from prompt_cache import get_prompt_cache_stats, cached_tokens
+from cancellation import CancelToken, CallCancelled, get_cancellation_stats
 
 load_dotenv()
 
+# Accusations judged later because the AI was overloaded when they were made
+_verdict_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="verdicts")
+
+# Shared by the hint and verdict prompts so both extend the same cached prefix; case facts only,
+# each prompt's own instructions follow it
+CASE_CONTEXT = """Case file of a mystery.
+            
+            The crime: {crime}
+            The correct solution: {solution}
+            Key clues that point to the solution: {key_clues}
+            """
+
+# The system message is identical for every question to a suspect and the history only grows,
+# so consecutive interrogations share a long cacheable prefix
+INTERROGATION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are playing {name}, a suspect in a murder mystery.
+    
+    Your character details:
+    - Occupation: {occupation}
+    - Age: {age}
+    - Personality: {personality}
+    - Alibi: {alibi}
+    - Motive: {motive}
+    - Secret: {secret}
+    
+    The crime: {crime}
+    
+    Respond in character. Be somewhat evasive about your secret, but provide useful information.
+    If the question is about something you wouldn't know, say so. Stay consistent with your alibi
+    and character details. Show some personality and emotion. Answer in 150 words max."""),
+    ("human", """Previous questions you've been asked:
+    {history}
+    
+    The detective asks: "{question}"
+    
+    Your response{brevity}:""")
+])
+
 # Data Models
 class Suspect(BaseModel):
     """Model for a suspect in the mystery"""
@@ -51,18 +105,321 @@ class MysteryCase(BaseModel):
 class MysteryGameEngine:
     """Main game engine for generating and managing mysteries"""
     
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_url: Optional[str] = None):
+        # Reuse pooled keep-alive connections shared by every engine with this key and model
+        http_client, http_async_client = get_client_pool().clients(api_key, model, base_url, owner=self)
         self.llm = ChatOpenAI(
             temperature=0.8,
             model=model,
-            openai_api_key=api_key
+            openai_api_key=api_key,
+            base_url=base_url,
+            http_client=http_client,
+            http_async_client=http_async_client
         )
-        self.case: Optional[MysteryCase] = None
-        self.discovered_clues: List[str] = []
+        self._api_key = api_key
+        self.generation_mode = os.getenv("MYSTERYAI_GENERATION_MODE", "single")
+        self.usage: Dict[str, int] = {"calls": 0, "input_tokens": 0, "cached_input_tokens": 0, "output_tokens": 0}
+        self._usage_lock = threading.Lock()
+        self._case: Optional[MysteryCase] = None
+        self.case_source: Optional[str] = None
+        self.pending_verdict: Optional[Future] = None
+        self._cancel_token = CancelToken()
         self.interrogation_history: Dict[str, List[str]] = {}
+        self._case_index: Optional[CaseIndex] = None
+        self._fact_graph: Optional[FactGraph] = None
+        self._clue_tracker: Optional[ClueTracker] = None
+        self._tracked_case: Optional[MysteryCase] = None
+    
+    @property
+    def case(self) -> Optional[MysteryCase]:
+        return self._case
+    
+    @case.setter
+    def case(self, case: Optional[MysteryCase]):
+        # Answers about the previous case are no use any more
+        if self._case is not None and case is not self._case:
+            self.cancel("case changed")
+        self._case = case
+    
+    def cancel(self, reason: str = "cancelled"):
+        """Stop this engine's in-flight LLM calls; calls made afterwards are unaffected"""
+        token = self._cancel_token
+        self._cancel_token = CancelToken(token.idle_timeout)
+        token.cancel(reason)
+    
+    def cancel_when_idle(self, seconds: Optional[float]):
+        """Cancel in-flight calls once `touch()` hasn't been called for `seconds`"""
+        self._cancel_token.idle_timeout = seconds
+        self._cancel_token.touch()
+    
+    def touch(self):
+        """Mark the owning session as still active"""
+        self._cancel_token.touch()
+    
+    def _call_token(self) -> CancelToken:
+        token = self._cancel_token
+        if token.cancelled:
+            # Went idle; a new call means someone is back
+            token = self._cancel_token = CancelToken(token.idle_timeout)
+        token.touch()
+        return token
+    
+    @property
+    def case_index(self) -> Optional[CaseIndex]:
+        """Index of the current case, rebuilt only when a different case is loaded"""
+        if not self.case:
+            return None
+        if self._case_index is None or self._case_index.case is not self.case:
+            self._case_index = CaseIndex(self.case)
+        return self._case_index
+    
+    @property
+    def fact_graph(self) -> Optional[FactGraph]:
+        """People, places and times of the current case, extracted once per case"""
+        if not self.case:
+            return None
+        if self._fact_graph is None or self._fact_graph.case is not self.case:
+            with get_tracer().span("fact_graph.build"):
+                self._fact_graph = FactGraph(self.case)
+        return self._fact_graph
+    
+    @property
+    def clue_tracker(self) -> Optional[ClueTracker]:
+        """Clue tracker for the current case, reset when a different case is loaded"""
+        if not self.case:
+            return None
+        if self._clue_tracker is None or self._tracked_case is not self.case:
+            victim = re.split(r",| - |\(", self.case.victim, maxsplit=1)[0]
+            names = [suspect.name for suspect in self.case.suspects] + [victim]
+            self._clue_tracker = ClueTracker(self.case.key_clues, names)
+            self._tracked_case = self.case
+        return self._clue_tracker
+    
+    @property
+    def discovered_clues(self) -> List[str]:
+        """What the player read that uncovered each key clue found so far (never the clue text)"""
+        tracker = self.clue_tracker
+        return tracker.discovered if tracker else []
+    
+    def export_state(self) -> Dict[str, any]:
+        """Investigation progress on the current case, for saving a session"""
+        return {
+            "history": self.interrogation_history,
+            "clues": self.clue_tracker.state() if self.case else {}
+        }
+    
+    def restore_state(self, case: MysteryCase, state: Dict[str, any]):
+        """Load a case together with progress saved by export_state()"""
+        self.case = case
+        self.interrogation_history = {name: list(qs) for name, qs in state.get("history", {}).items()}
+        self.clue_tracker.restore(state.get("clues", {}))
+    
+    def _numbered_clues(self) -> str:
+        return "; ".join(f"{i}. {clue}" for i, clue in enumerate(self.case.key_clues, 1))
+    
+    def _invoke(self, prompt: ChatPromptTemplate, inputs: Dict[str, any],
+                priority: int = INTERACTIVE, max_output_tokens: int = 300, llm=None,
+                label: str = "generate", stream: bool = True, progress=None):
+        """Send a prompt to the LLM through the process-wide scheduler
+        
+        `llm` overrides the engine's model, e.g. with a structured-output wrapper.
+        `label` names the operation in the prompt cache accounting.
+        
+        The reply is streamed so the call can stop part-way: when the engine's calls are
+        cancelled, or when `progress` (called with the text so far) raises, e.g. because
+        Streamlit is stopping the script. With stream=False (for wrappers that can't stream)
+        cancellation is only checked before sending.
+        """
+        token = self._call_token()
+        messages, ticket = self._admit(prompt, inputs, priority, max_output_tokens, label, token)
+        response = None
+        usage = None
+        start = time.perf_counter()
+        try:
+            with get_tracer().span("llm.invoke") as span:
+                if stream:
+                    for chunk in self._chunks(messages, token, ticket, llm):
+                        response = chunk if response is None else response + chunk
+                        if progress is not None:
+                            progress(response.content)
+                else:
+                    token.raise_if_cancelled()
+                    response = (llm or self.llm).invoke(messages)
+                    self._observe_latency(ticket)
+                # Structured-output wrappers return {"raw": AIMessage, "parsed": ...}
+                raw = response["raw"] if isinstance(response, dict) else response
+                usage = getattr(raw, "usage_metadata", None)
+                self._record_usage(usage, (time.perf_counter() - start) * 1000, label, span)
+        except BaseException as e:
+            partial = response.content if response is not None and not isinstance(response, dict) else ""
+            self._call_failed(e, label, partial, start, max_output_tokens)
+            raise
+        finally:
+            get_scheduler().release(self._api_key, ticket, usage.get("total_tokens") if usage else None)
+        return response
+    
+    def _stream(self, prompt: ChatPromptTemplate, inputs: Dict[str, any],
+                priority: int = INTERACTIVE, max_output_tokens: int = 300,
+                label: str = "generate", llm=None) -> Iterator[str]:
+        """Like _invoke, but yields the reply text as the model writes it
+        
+        Closing the generator early stops the call and counts it as cancelled.
+        """
+        token = self._call_token()
+        messages, ticket = self._admit(prompt, inputs, priority, max_output_tokens, label, token)
+        parts = []
+        usage = None
+        start = time.perf_counter()
+        try:
+            with get_tracer().span("llm.stream") as span:
+                for chunk in self._chunks(messages, token, ticket, llm):
+                    if chunk.usage_metadata:
+                        usage = chunk.usage_metadata
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        yield chunk.content
+                self._record_usage(usage, (time.perf_counter() - start) * 1000, label, span)
+        except BaseException as e:
+            self._call_failed(e, label, "".join(parts), start, max_output_tokens)
+            raise
+        finally:
+            get_scheduler().release(self._api_key, ticket, usage.get("total_tokens") if usage else None)
+    
+    def _admit(self, prompt: ChatPromptTemplate, inputs: Dict[str, any], priority: int,
+               max_output_tokens: int, label: str, token: CancelToken):
+        """Format the prompt and wait for the scheduler to admit it; returns (messages, ticket)"""
+        tracer = get_tracer()
+        with tracer.span("prompt.format"):
+            messages = prompt.format_messages(**inputs)
+        
+        # Rough token estimate (~4 characters per token) used to reserve budget
+        estimate = sum(len(str(m.content)) for m in messages) // 4 + max_output_tokens
+        
+        with tracer.span("llm.queue", priority=priority, estimated_tokens=estimate):
+            try:
+                ticket = get_scheduler().acquire(self._api_key, estimate, priority, cancel=token)
+            except CallCancelled as e:
+                self._record_cancelled(label, e.reason, "", 0.0, max_output_tokens)
+                raise
+        return messages, ticket
+    
+    def _chunks(self, messages, token: CancelToken, ticket, llm=None):
+        """Stream message chunks from the model, hanging up as soon as `token` is cancelled"""
+        chunks = (llm or self.llm).stream(messages, stream_usage=True)
+        first = True
+        try:
+            for chunk in chunks:
+                token.raise_if_cancelled()
+                if first:
+                    self._observe_latency(ticket)
+                    first = False
+                yield chunk
+        finally:
+            # Closes the HTTP response, so the provider stops generating
+            chunks.close()
+    
+    def _observe_latency(self, ticket):
+        # What a player waits before anything happens: queue time plus time to first token.
+        # Background work waits behind players by design, so it doesn't count as load
+        if ticket.priority == INTERACTIVE:
+            get_admission_controller().observe(self._api_key, time.monotonic() - ticket.enqueued)
+    
+    @property
+    def service_mode(self) -> int:
+        """Load shedding mode for this engine's API key (see load_shedding)"""
+        return get_admission_controller().mode(self._api_key)
+    
+    def _call_failed(self, error: BaseException, label: str, partial: str, start: float,
+                     max_output_tokens: int):
+        if type(error).__name__ == "RateLimitError":
+            # Hold the queue for this key instead of letting every caller hit the limit
+            get_scheduler().pause(self._api_key, 10.0)
+        elif isinstance(error, CallCancelled):
+            self._record_cancelled(label, error.reason, partial, time.perf_counter() - start, max_output_tokens)
+        elif not isinstance(error, Exception):
+            # GeneratorExit, or Streamlit stopping/rerunning the script: nobody wants the answer
+            self._record_cancelled(label, "abandoned", partial, time.perf_counter() - start, max_output_tokens)
+    
+    def _record_cancelled(self, label: str, reason: str, partial: str, seconds: float,
+                          max_output_tokens: int):
+        saved = get_cancellation_stats().cancelled(label, reason, len(partial) // 4, seconds, max_output_tokens)
+        with get_tracer().span("llm.cancelled", label=label, reason=reason,
+                               tokens_saved=round(saved["tokens"]), seconds_saved=round(saved["seconds"], 2)):
+            pass
+    
+    def _coalesced(self, key, call):
+        """Run `call` through the process-wide single-flight group
+        
+        If the shared call is cancelled by the session that started it, ask again.
+        """
+        token = self._cancel_token
+        while True:
+            try:
+                return get_single_flight().do(key, call)
+            except CallCancelled:
+                if token.cancelled:
+                    raise
+    
+    def _coalesced_stream(self, key, call) -> Iterator[str]:
+        """_coalesced for calls that yield text; asks again if the shared call is cancelled
+        before any of it reached this caller"""
+        token = self._cancel_token
+        while True:
+            try:
+                yield from get_single_flight().stream(key, call)
+                return
+            except CallCancelled:
+                if token.cancelled:
+                    raise
+    
+    def _record_usage(self, usage: Optional[dict], latency_ms: float, label: str, span):
+        with self._usage_lock:
+            self.usage["calls"] += 1
+            if usage:
+                self.usage["input_tokens"] += usage.get("input_tokens", 0)
+                self.usage["cached_input_tokens"] += cached_tokens(usage)
+                self.usage["output_tokens"] += usage.get("output_tokens", 0)
+        if usage:
+            get_cancellation_stats().completed(label, usage.get("output_tokens", 0), latency_ms / 1000)
+            cached = cached_tokens(usage)
+            span.set(input_tokens=usage.get("input_tokens"), cached_tokens=cached,
+                     output_tokens=usage.get("output_tokens"))
+            get_prompt_cache_stats().record(label, usage.get("input_tokens", 0), cached, latency_ms)
+        
+    @traced("engine.generate_mystery")
+    def generate_mystery(self, theme: str = "classic detective", priority: int = INTERACTIVE,
+                         mode: Optional[str] = None, progress=None) -> MysteryCase:
+        """Generate a complete mystery case
+        
+        mode "single" writes the whole case in one call; "fanout" plans a skeleton first and
+        expands the scene, suspects and evidence in parallel calls; "compact" and "structured"
+        use a slimmer prompt with JSON mode or native structured output.
+        `progress` is called with the text written so far (see _invoke).
+        
+        Under heavy load a ready-made case is served instead; `case_source` says which
+        ("ai", "library" or "offline").
+        """
+        if priority == INTERACTIVE and self.service_mode >= POOLED_CASES:
+            # A case now beats a freshly written one in a minute or more
+            self.case, self.case_source = pooled_case(theme)
+            return self.case
+        self.case_source = "ai"
+        mode = mode or self.generation_mode
+        if mode == "fanout":
+            from fanout_generation import generate_case_fanout
+            self.case = generate_case_fanout(self, theme, priority, progress)
+            return self.case
+        if mode == "compact":
+            from structured_generation import generate_case_compact
+            self.case = generate_case_compact(self, theme, priority, progress)
+            return self.case
+        if mode == "structured":
+            from structured_generation import generate_case_structured
+            self.case = generate_case_structured(self, theme, priority)
+            return self.case
+        if mode != "single":
+            raise ValueError(f"Unknown generation mode '{mode}'")
         
-    def generate_mystery(self, theme: str = "classic detective") -> MysteryCase:
-        """Generate a complete mystery case"""
         parser = PydanticOutputParser(pydantic_object=MysteryCase)
         
         prompt = ChatPromptTemplate.from_template(
@@ -95,14 +452,13 @@ class MysteryGameEngine:
             Create a complete mystery case now:"""
         )
         
-        chain = prompt | self.llm
-        
-        response = chain.invoke({
+        response = self._invoke(prompt, {
             "theme": theme,
             "format_instructions": parser.get_format_instructions()
-        })
+        }, priority=priority, max_output_tokens=3000, progress=progress)
         
-        self.case = parser.parse(response.content)
+        with get_tracer().span("parse"):
+            self.case = parser.parse(response.content)
         return self.case
     
     def get_initial_briefing(self) -> str:
@@ -138,49 +494,58 @@ SUSPECTS:
         
         return briefing
     
+    @traced("engine.interrogate_suspect")
     def interrogate_suspect(self, suspect_name: str, question: str) -> str:
         """Interrogate a suspect with a specific question"""
         if not self.case:
             return "No active case."
         
         # Find the suspect
-        suspect = next((s for s in self.case.suspects if s.name.lower() == suspect_name.lower()), None)
+        suspect = self.case_index.find_suspect(suspect_name)
         if not suspect:
             return f"Suspect '{suspect_name}' not found."
         
-        # Track interrogation history
-        if suspect_name not in self.interrogation_history:
-            self.interrogation_history[suspect_name] = []
-        self.interrogation_history[suspect_name].append(question)
+        key, asked_after, inputs = self._interrogation_request(suspect, question)
+        content = self._coalesced(key, lambda: self._invoke(
+            INTERROGATION_PROMPT, inputs, label="interrogate_suspect", **self._answer_budget(inputs)).content)
+        self._record_answer(suspect, question, asked_after, content)
         
-        # Generate response using AI
-        prompt = ChatPromptTemplate.from_template(
-            """You are playing {name}, a suspect in a murder mystery.
-            
-            Your character details:
-            - Occupation: {occupation}
-            - Age: {age}
-            - Personality: {personality}
-            - Alibi: {alibi}
-            - Motive: {motive}
-            - Secret: {secret}
-            
-            The crime: {crime}
-            
-            Previous questions you've been asked: {history}
-            
-            The detective asks: "{question}"
-            
-            Respond in character. Be somewhat evasive about your secret, but provide useful information.
-            If the question is about something you wouldn't know, say so. Stay consistent with your alibi
-            and character details. Show some personality and emotion.
-            
-            Your response (150 words max):"""
-        )
+        return f"\n{suspect.name}: \"{content}\"\n"
+    
+    @traced("engine.stream_interrogation")
+    def stream_interrogation(self, suspect_name: str, question: str) -> Iterator[str]:
+        """Interrogate a suspect, yielding the answer as it is written"""
+        if not self.case:
+            yield "No active case."
+            return
         
-        chain = prompt | self.llm
+        suspect = self.case_index.find_suspect(suspect_name)
+        if not suspect:
+            yield f"Suspect '{suspect_name}' not found."
+            return
         
-        response = chain.invoke({
+        key, asked_after, inputs = self._interrogation_request(suspect, question)
+        # Registered like interrogate_suspect, so a repeat of this question joins it
+        # and gets the answer whole once it is written
+        parts = []
+        for text in self._coalesced_stream(key, lambda: self._stream(
+                INTERROGATION_PROMPT, inputs, label="interrogate_suspect", **self._answer_budget(inputs))):
+            parts.append(text)
+            yield text
+        # Not reached when the reader hangs up or the call is cancelled
+        self._record_answer(suspect, question, asked_after, "".join(parts))
+    
+    def _interrogation_request(self, suspect: Suspect, question: str):
+        """Single-flight key and prompt inputs for a question; returns (key, history length, inputs)
+        
+        A repeat of a question that is still being answered (double-click or rerun) has the
+        same key, so it joins that call instead of being asked again.
+        """
+        previous = list(self.interrogation_history.get(suspect.name, []))
+        key = ("interrogate_suspect", self.case_index.fingerprint, suspect.name, normalize(question),
+               tuple(normalize(q) for q in previous))
+        
+        return key, len(previous), {
             "name": suspect.name,
             "occupation": suspect.occupation,
             "age": suspect.age,
@@ -189,46 +554,55 @@ SUSPECTS:
             "motive": suspect.motive,
             "secret": suspect.secret,
             "crime": self.case.crime,
-            "history": "\n".join(self.interrogation_history[suspect_name][:-1]) or "None",
-            "question": question
-        })
-        
-        return f"\n{suspect.name}: \"{response.content}\"\n"
+            "history": "".join(f"- {q}\n" for q in previous) or "None\n",
+            "question": question,
+            "brevity": f" (under {SHORT_ANSWER_TOKENS // 2} words)" if self.service_mode >= SHORT_ANSWERS else ""
+        }
+    
+    def _record_answer(self, suspect: Suspect, question: str, asked_after: int, answer: str):
+        """Add an answered question to the suspect's history, unless a joined call already did"""
+        history = self.interrogation_history.setdefault(suspect.name, [])
+        if normalize(question) in (normalize(q) for q in history[asked_after:]):
+            return
+        history.append(question)
+        self.clue_tracker.record_interrogation(suspect.name, answer)
     
+    def _answer_budget(self, inputs: Dict[str, any]) -> Dict[str, any]:
+        """Output cap for an interrogation answer, enforced by the model when answers are shortened"""
+        if inputs["brevity"]:
+            return {"max_output_tokens": SHORT_ANSWER_TOKENS, "llm": self.llm.bind(max_tokens=SHORT_ANSWER_TOKENS)}
+        return {"max_output_tokens": 300}
+    
+    @traced("engine.examine_evidence")
     def examine_evidence(self, evidence_name: str) -> str:
         """Get detailed analysis of evidence"""
         if not self.case:
             return "No active case."
         
-        evidence = next((e for e in self.case.evidence if e.name.lower() in evidence_name.lower()), None)
+        evidence = self.case_index.find_evidence(evidence_name)
         if not evidence:
             return f"Evidence '{evidence_name}' not found."
         
-        # Generate deeper analysis
-        prompt = ChatPromptTemplate.from_template(
-            """As a forensic expert, provide a detailed analysis of this evidence:
+        # Generate deeper analysis; the instructions and case context lead, the evidence follows
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are a forensic expert on a case involving: {crime}
             
-            Evidence: {name}
+            For each piece of evidence, provide additional forensic insights, possible interpretations,
+            and what questions this evidence raises. Keep it under 200 words and make it feel like a
+            professional forensic report."""),
+            ("human", """Evidence: {name}
             Description: {description}
-            Found at: {location}
-            
-            Context: This is part of a case involving: {crime}
-            
-            Provide additional forensic insights, possible interpretations, and what questions
-            this evidence raises. Keep it under 200 words and make it feel like a professional
-            forensic report.
-            
-            Analysis:"""
-        )
-        
-        chain = prompt | self.llm
+            Found at: {location}""")
+        ])
         
-        response = chain.invoke({
+        # Sessions examining the same evidence of the same case share one analysis
+        key = ("examine_evidence", self.case_index.fingerprint, evidence.name)
+        content = self._coalesced(key, lambda: self._invoke(prompt, {
+            "crime": self.case.crime,
             "name": evidence.name,
             "description": evidence.description,
-            "location": evidence.location,
-            "crime": self.case.crime
-        })
+            "location": evidence.location
+        }, max_output_tokens=350, label="examine_evidence").content)
         
         analysis = f"""
 ╔════════════════════════════════════════════════════════════╗
@@ -242,58 +616,104 @@ LOCATION: {evidence.location}
 SIGNIFICANCE: {evidence.significance}
 
 FORENSIC ANALYSIS:
-{response.content}
+{content}
 """
+        self.clue_tracker.record_evidence(
+            evidence.name,
+            " ".join([evidence.description, evidence.location, evidence.significance, content])
+        )
+        
         return analysis
     
+    @traced("engine.get_hint")
     def get_hint(self, difficulty: str = "medium") -> str:
         """Generate a contextual hint based on investigation progress"""
         if not self.case:
             return "No active case."
         
-        prompt = ChatPromptTemplate.from_template(
-            """You are helping a detective solve a mystery. Based on their investigation so far,
-            provide a helpful hint.
-            
-            The solution: {solution}
-            Key clues: {key_clues}
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", CASE_CONTEXT + """
+            You are helping a detective solve this mystery. They must never be told the solution outright.
+            The detective asks for a hint. Steer them toward clues they have not found yet.
             
-            Questions they've asked: {interrogations}
-            
-            Difficulty level: {difficulty}
+            Difficulty levels:
             - easy: Point them directly toward the solution
             - medium: Suggest a line of inquiry or connection to explore
             - hard: Just a gentle nudge in the right direction
             
-            Provide a single, helpful hint (2-3 sentences max):"""
-        )
+            Provide a single, helpful hint (2-3 sentences max)."""),
+            ("human", """Their progress so far: {progress}
+            Difficulty level: {difficulty}
+            
+            Hint:""")
+        ])
         
-        chain = prompt | self.llm
+        progress = self.clue_tracker.summary()
+        key = ("get_hint", self.case_index.fingerprint, normalize(difficulty), progress)
+        hints = get_hint_cache()
+        if self.service_mode >= SHORT_ANSWERS:
+            # Overloaded: a hint already written for this case, or one from the fact graph
+            content = hints.get(key, self.case_index.fingerprint, normalize(difficulty)) or self._local_hint(difficulty)
+            return f"\n💡 HINT: {content}\n"
         
-        response = chain.invoke({
+        content = self._coalesced(key, lambda: self._invoke(prompt, {
+            "crime": self.case.crime,
             "solution": self.case.solution,
-            "key_clues": ", ".join(self.case.key_clues),
-            "interrogations": str(self.interrogation_history) if self.interrogation_history else "None yet",
+            "key_clues": self._numbered_clues(),
+            "progress": progress,
             "difficulty": difficulty
-        })
+        }, max_output_tokens=150, label="get_hint").content)
+        hints.put(key, self.case_index.fingerprint, normalize(difficulty), content)
         
-        return f"\n💡 HINT: {response.content}\n"
+        return f"\n💡 HINT: {content}\n"
+    
+    def _local_hint(self, difficulty: str) -> str:
+        """A hint built from the contradictions in the case file, without an LLM call"""
+        conflicts = self.fact_graph.conflicts()
+        if not conflicts:
+            return ("Line up everyone's whereabouts at the time of the crime in the Case File, "
+                    "then look for evidence that was found somewhere a suspect says they never were.")
+        conflict = conflicts[0]
+        difficulty = normalize(difficulty)
+        if difficulty == "easy":
+            return f"{conflict.reason}. Ask {conflict.person} to explain that."
+        if difficulty == "hard":
+            return "Not every alibi survives the evidence. Check the timeline in the Case File."
+        # Points at the evidence, not the suspect, like the AI's medium hints
+        if conflict.source.endswith("'s alibi"):
+            return "Two of the alibis can't both be true. Line them up against each other in the Case File."
+        return (f"The {conflict.source} doesn't square with one of the alibis. "
+                "Check it against where each suspect says they were.")
     
+    @traced("engine.submit_solution")
     def submit_solution(self, accused: str, explanation: str) -> Dict[str, any]:
-        """Submit and evaluate the player's solution"""
+        """Submit and evaluate the player's solution
+        
+        When the AI is overloaded the verdict is deferred: the result has "deferred": True and
+        `pending_verdict` completes with the evaluation, made at background priority.
+        """
         if not self.case:
             return {"success": False, "message": "No active case."}
         
-        prompt = ChatPromptTemplate.from_template(
-            """You are evaluating a detective's solution to a mystery.
-            
-            The correct solution: {solution}
-            Key clues that point to solution: {key_clues}
-            
-            Detective's accusation: {accused}
-            Detective's explanation: {explanation}
-            
-            Evaluate if they:
+        # Taken here: the session keeps investigating while a deferred verdict is judged
+        progress = self.clue_tracker.summary()
+        if self.service_mode >= DEFERRED_VERDICTS:
+            self.pending_verdict = _verdict_pool.submit(
+                contextvars.copy_context().run, self._evaluate_solution, accused, explanation, progress, BACKGROUND)
+            return {
+                "deferred": True,
+                "correct": None,
+                "score": None,
+                "feedback": "Your accusation is on file. The AI is overloaded right now, so it will be judged as soon as the rush eases.",
+                "missed_clues": []
+            }
+        return self._evaluate_solution(accused, explanation, progress)
+    
+    def _evaluate_solution(self, accused: str, explanation: str, progress: str,
+                           priority: int = INTERACTIVE) -> Dict[str, any]:
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", CASE_CONTEXT + """
+            You are evaluating a detective's solution to this mystery. Evaluate if they:
             1. Identified the correct perpetrator
             2. Understood the key evidence
             3. Provided a logical explanation
@@ -306,31 +726,58 @@ FORENSIC ANALYSIS:
                 "missed_clues": ["list", "of", "important", "clues", "they", "missed"]
             }}
             
-            Be encouraging even if wrong. If correct, congratulate them!
-            """
-        )
-        
-        chain = prompt | self.llm
+            Be encouraging even if wrong. If correct, congratulate them!"""),
+            ("human", """Detective's accusation: {accused}
+            Detective's explanation: {explanation}
+            Clues they uncovered while investigating: {progress}""")
+        ])
         
-        response = chain.invoke({
+        key = ("submit_solution", self.case_index.fingerprint, normalize(accused), normalize(explanation), progress)
+        content = self._coalesced(key, lambda: self._invoke(prompt, {
+            "crime": self.case.crime,
             "solution": self.case.solution,
-            "key_clues": ", ".join(self.case.key_clues),
+            "key_clues": self._numbered_clues(),
+            "progress": progress,
             "accused": accused,
             "explanation": explanation
-        })
+        }, priority=priority, max_output_tokens=500, label="submit_solution").content)
         
         try:
-            result = json.loads(response.content)
+            with get_tracer().span("parse"):
+                result = json.loads(content)
             return result
         except:
             # Fallback if JSON parsing fails
             return {
                 "correct": accused.lower() in self.case.solution.lower(),
                 "score": 50,
-                "feedback": response.content,
+                "feedback": content,
                 "missed_clues": []
             }
     
+    @traced("engine.search_case_file")
+    def search_case_file(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Search alibis, motives and evidence locally (no LLM call)"""
+        if not self.case:
+            return []
+        return self.case_index.search(query, kinds=PUBLIC_KINDS, limit=limit)
+    
+    @traced("engine.who_was_where")
+    def who_was_where(self, time: str) -> List[Fact]:
+        """Whereabouts claimed by or shown for each person at a time of day (no LLM call)"""
+        if not self.case:
+            return []
+        return self.fact_graph.who_was_where(time)
+    
+    @traced("engine.check_evidence")
+    def check_evidence(self, evidence_name: str) -> List[Conflict]:
+        """Alibis a piece of evidence contradicts (no LLM call)"""
+        if not self.case:
+            return []
+        evidence = self.case_index.find_evidence(evidence_name)
+        return self.fact_graph.conflicts_with(evidence.name) if evidence else []
+    
+    @traced("engine.list_suspects")
     def list_suspects(self) -> str:
         """List all suspects with brief details"""
         if not self.case:
@@ -343,6 +790,7 @@ FORENSIC ANALYSIS:
             output += f"\n   Alibi: {suspect.alibi}\n"
         return output
     
+    @traced("engine.list_evidence")
     def list_evidence(self) -> str:
         """List all available evidence"""
         if not self.case:
@@ -356,18 +804,24 @@ FORENSIC ANALYSIS:
         return output
 
 
-# Global game engine instance
+# Global game engine instance (used outside Streamlit)
 _game_engine = None
 
 def get_game_engine():
-    """Get or create the global game engine instance"""
+    """Get or create the game engine for the current session
+    
+    Inside Streamlit each session gets its own engine (HTTP connections are still
+    shared through the client pool); elsewhere a single global engine is used.
+    """
     global _game_engine
     
     # Try to get API key from session state first, then from environment
     try:
         import streamlit as st
-        api_key = st.session_state.get("openai_api_key")
+        session = st.session_state
+        api_key = session.get("openai_api_key")
     except:
+        session = None
         api_key = None
     
     if not api_key:
@@ -376,9 +830,17 @@ def get_game_engine():
     if not api_key:
         raise ValueError("OpenAI API Key not found. Please enter your API key in the sidebar.")
     
+    try:
+        engine = session.get("game_engine") if session is not None else _game_engine
+    except:
+        # Not running inside a Streamlit script
+        session = None
+        engine = _game_engine
+    
     # Create new engine if API key changed or engine doesn't exist
-    if _game_engine is None or (hasattr(_game_engine, '_api_key') and _game_engine._api_key != api_key):
-        _game_engine = MysteryGameEngine(api_key=api_key)
-        _game_engine._api_key = api_key  # Store the API key for comparison
+    if engine is None or engine._api_key != api_key:
+        engine = MysteryGameEngine(api_key=api_key)
+        if session is None:
+            _game_engine = engine
     
-    return _game_engine
+    return engine
@@ -0,0 +1,553 @@
+"""
+Offline procedural mystery generator
+Assembles a consistent, solvable MysteryCase in milliseconds from curated per-theme pools (no LLM call)
+"""
+
+import random
+import string
+from typing import Dict, List, Optional
+
+from mystery_engine import MysteryCase, Suspect, Evidence
+from case_index import normalize
+from fact_graph import FactGraph
+
+# Per-theme pools. Keys match the theme names shown on the Home page.
+# Methods, culprit items and motives are themed too; personalities and secrets are shared below.
+THEME_POOLS: Dict[str, dict] = {
+    "Mumbai Underworld Mystery": {
+        "city": "Mumbai",
+        "venue": "a sea-facing bungalow in Juhu",
+        "era": "present day, during the monsoon",
+        "victim_roles": ["a Bollywood film financier", "a retired underworld fixer", "a Dharavi real-estate baron"],
+        "rooms": ["private screening room", "terrace overlooking the sea", "study lined with film posters", "wine cellar", "guest bedroom"],
+        "alibi_places": ["the Siddhivinayak temple", "a late show at Gaiety Galaxy", "a vada pav stall at Dadar station", "the Bandra Bandstand promenade", "a recording studio in Andheri", "the Haji Ali dargah"],
+        "occupations": ["film producer", "music director", "personal bodyguard", "stunt coordinator", "item-song choreographer", "customs officer", "casting agent"],
+        "first_names": ["Vikram", "Salim", "Anjali", "Rohan", "Zoya", "Kabir", "Meenakshi", "Farhan", "Tara", "Imran", "Pooja", "Aditya"],
+        "surnames": ["Malhotra", "Shaikh", "Kapoor", "Desai", "Qureshi", "Mehta", "Pillai", "Fernandes"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with cyanide stirred into a glass of single malt",
+             "state": "poisoned", "weapon": "Whisky Tumbler",
+             "weapon_description": "A crystal tumbler with a film of single malt that tests positive for cyanide",
+             "trace": "a bitter-almond smelling residue"},
+            {"crime": "murder", "act": "struck {victim} on the head with a gilt film award trophy",
+             "state": "struck on the head", "weapon": "Award Trophy",
+             "weapon_description": "A heavy gilt film award trophy with a dented base stained with blood",
+             "trace": "flecks of gilt paint"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a sequinned costume dupatta",
+             "state": "strangled", "weapon": "Sequinned Dupatta",
+             "weapon_description": "A sequinned costume dupatta from a film set, twisted into a cord",
+             "trace": "loose silver sequins"},
+        ],
+        "culprit_items": [
+            ("Gold Chain", "a thick gold chain with a broken clasp"),
+            ("Studio Pass", "a laminated film studio pass with a torn lanyard"),
+            ("Cigarette Case", "an engraved silver cigarette case"),
+            ("Train Ticket", "a torn first-class local train ticket stamped that evening"),
+            ("Aviator Sunglasses", "a pair of aviator sunglasses with a cracked lens"),
+        ],
+        "motives": [
+            "stands to inherit {victim}'s share in a blockbuster film",
+            "was about to be exposed by {victim} for laundering money through film budgets",
+            "was dropped from a big-budget film by {victim} last month",
+            "lost a bitter fight over a Juhu bungalow to {victim}",
+            "was being blackmailed by {victim} over old underworld connections",
+            "was cut out of a lucrative overseas distribution deal by {victim}",
+        ],
+    },
+    "Delhi Political Scandal": {
+        "city": "New Delhi",
+        "venue": "a Lutyens' Delhi bungalow",
+        "era": "present day, on the eve of an election",
+        "victim_roles": ["a senior party whip", "a powerful lobbyist", "a ministry joint secretary"],
+        "rooms": ["party war room", "rose garden", "wood-panelled library", "press briefing room", "servants' quarters"],
+        "alibi_places": ["the India International Centre", "a fundraiser at the Gymkhana Club", "Chandni Chowk's paratha lane", "the Bangla Sahib gurudwara", "a TV studio in Noida", "the Lodhi Garden walking track"],
+        "occupations": ["party spokesperson", "personal secretary", "political strategist", "news anchor", "PWD contractor", "security officer", "campaign treasurer"],
+        "first_names": ["Rajiv", "Sunita", "Harish", "Neha", "Arvind", "Kavita", "Manoj", "Ritu", "Gaurav", "Shalini", "Deepak", "Priya"],
+        "surnames": ["Sharma", "Chauhan", "Bhatia", "Verma", "Khanna", "Saxena", "Tyagi", "Arora"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with aconite slipped into a cup of adrak chai",
+             "state": "poisoned", "weapon": "Chai Cup",
+             "weapon_description": "A bone-china cup with dregs of ginger tea that test positive for aconite",
+             "trace": "a smear of aconite residue"},
+            {"crime": "murder", "act": "struck {victim} on the head with a marble bust of a freedom fighter",
+             "state": "struck on the head", "weapon": "Marble Bust",
+             "weapon_description": "A marble bust of a freedom fighter, chipped at the base and stained with blood",
+             "trace": "white marble dust"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a khadi party stole",
+             "state": "strangled", "weapon": "Khadi Stole",
+             "weapon_description": "A party-coloured khadi stole, knotted and twisted into a cord",
+             "trace": "coarse khadi fibres"},
+        ],
+        "culprit_items": [
+            ("Party Badge", "an enamel party badge with a bent pin"),
+            ("Fountain Pen", "a monogrammed fountain pen leaking green ink"),
+            ("Visitor Pass", "a Parliament visitor pass dated that day"),
+            ("Metro Card", "a Delhi Metro card topped up that evening"),
+            ("Reading Glasses", "a pair of gold-rimmed reading glasses with a cracked lens"),
+        ],
+        "motives": [
+            "was about to be denied an election ticket by {victim}",
+            "was about to be exposed by {victim} for taking kickbacks on a highway contract",
+            "was publicly humiliated by {victim} at a party meeting last month",
+            "lost a bitter fight over a bungalow allotment to {victim}",
+            "was being blackmailed by {victim} over leaked ministry files",
+            "stands to take over {victim}'s constituency",
+        ],
+    },
+    "Bangalore Tech Startup Crime": {
+        "city": "Bengaluru",
+        "venue": "a glass-walled startup office in Koramangala",
+        "era": "present day, the night before a funding announcement",
+        "victim_roles": ["a unicorn startup founder", "a venture capital partner", "a celebrated chief technology officer"],
+        "rooms": ["server room", "rooftop cafe", "founder's cabin", "hackathon war room", "nap pod lounge"],
+        "alibi_places": ["a craft brewery in Indiranagar", "the Cubbon Park jogging track", "a darshini on MG Road", "the Bull Temple in Basavanagudi", "a meetup at a co-working space in HSR Layout", "a traffic jam on the Silk Board junction"],
+        "occupations": ["co-founder", "head of engineering", "growth hacker", "angel investor", "data scientist", "office manager", "security consultant"],
+        "first_names": ["Arjun", "Divya", "Karthik", "Sneha", "Naveen", "Lakshmi", "Siddharth", "Ananya", "Pranav", "Shruti", "Varun", "Keerthi"],
+        "surnames": ["Rao", "Hegde", "Iyengar", "Reddy", "Shetty", "Gowda", "Kulkarni", "Nair"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with digoxin dissolved in a bottle of cold-brew coffee",
+             "state": "poisoned", "weapon": "Coffee Bottle",
+             "weapon_description": "A cold-brew coffee bottle whose dregs test positive for digoxin",
+             "trace": "a sticky coffee residue laced with digoxin"},
+            {"crime": "murder", "act": "struck {victim} on the head with a heavy glass startup award",
+             "state": "struck on the head", "weapon": "Glass Award",
+             "weapon_description": "A heavy glass startup award, cracked along one edge and stained with blood",
+             "trace": "tiny glass splinters"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a braided laptop charger cable",
+             "state": "strangled", "weapon": "Charger Cable",
+             "weapon_description": "A braided laptop charger cable, stretched and kinked",
+             "trace": "black nylon fibres from the cable braid"},
+        ],
+        "culprit_items": [
+            ("Access Card", "an RFID access card on a company lanyard"),
+            ("Smartwatch", "a smartwatch with a cracked screen"),
+            ("Company Hoodie", "a company hoodie with a ripped pocket"),
+            ("Wireless Earbud", "a single wireless earbud"),
+            ("Metro Token", "a Namma Metro token from that evening"),
+        ],
+        "motives": [
+            "stands to gain control of the company if {victim} is gone",
+            "was about to be exposed by {victim} for faking the company's revenue numbers",
+            "was pushed out of the founding team by {victim} last month",
+            "lost a bitter patent dispute to {victim}",
+            "was being blackmailed by {victim} over stolen source code",
+            "had stock options cancelled by {victim} days before the funding round",
+        ],
+    },
+    "Kolkata Literary Society Murder": {
+        "city": "Kolkata",
+        "venue": "a crumbling North Kolkata mansion that houses a literary society",
+        "era": "present day, during Durga Puja",
+        "victim_roles": ["the society's celebrated president", "a reclusive Bengali poet", "a rare-manuscript collector"],
+        "rooms": ["reading room", "manuscript archive", "adda verandah", "printing press room", "rooftop terrace"],
+        "alibi_places": ["a pandal in Bagbazar", "the Coffee House on College Street", "a tram to Esplanade", "the Dakshineswar temple ghats", "a recital at Rabindra Sadan", "a sweet shop in Shyambazar"],
+        "occupations": ["publisher", "literary critic", "society librarian", "translator", "theatre actor", "bookshop owner", "professor of Bengali literature"],
+        "first_names": ["Subhash", "Rituparna", "Anirban", "Moumita", "Sourav", "Paromita", "Debashish", "Tanushree", "Indranil", "Sharmila", "Arko", "Rupa"],
+        "surnames": ["Banerjee", "Chatterjee", "Ghosh", "Mukherjee", "Sen", "Bose", "Dutta", "Mitra"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with arsenic mixed into a cup of Darjeeling tea",
+             "state": "poisoned", "weapon": "Teacup",
+             "weapon_description": "A porcelain teacup with Darjeeling tea dregs that test positive for arsenic",
+             "trace": "a smear of arsenic residue"},
+            {"crime": "murder", "act": "struck {victim} on the head with a heavy brass inkstand",
+             "state": "struck on the head", "weapon": "Brass Inkstand",
+             "weapon_description": "A heavy antique brass inkstand, dented on one corner and stained with blood",
+             "trace": "dried blue-black ink"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a red-bordered silk saree",
+             "state": "strangled", "weapon": "Silk Saree",
+             "weapon_description": "A red-bordered white silk saree twisted into a cord",
+             "trace": "red silk threads"},
+        ],
+        "culprit_items": [
+            ("Engraved Pen", "a fountain pen engraved with initials"),
+            ("Tram Ticket", "a torn tram ticket punched that evening"),
+            ("Snuff Box", "a small silver snuff box"),
+            ("Manuscript Page", "a page of handwritten verse torn from a notebook"),
+            ("Reading Glasses", "a pair of round tortoiseshell reading glasses with a cracked lens"),
+        ],
+        "motives": [
+            "stands to inherit the mansion from {victim}",
+            "was about to be exposed by {victim} for passing off a dead poet's verses as their own",
+            "was savaged in a review written by {victim} last month",
+            "lost the society's presidency to {victim}",
+            "was being blackmailed by {victim} over a forged manuscript",
+            "was cut out of a lucrative publishing deal by {victim}",
+        ],
+    },
+    "Goa Beach Resort Mystery": {
+        "city": "Goa",
+        "venue": "a boutique beach resort in Anjuna",
+        "era": "present day, on New Year's Eve",
+        "victim_roles": ["the resort's flamboyant owner", "a visiting music festival promoter", "a wealthy NRI investor"],
+        "rooms": ["poolside bar", "beach shack", "owner's villa", "spa pavilion", "wine tasting room"],
+        "alibi_places": ["midnight mass at a Panjim church", "a trance party at Vagator", "a fish thali place in Mapusa", "the Saturday night market at Arpora", "a sunset cruise on the Mandovi", "a casino boat in Panjim"],
+        "occupations": ["resort manager", "DJ", "yoga instructor", "bartender", "property broker", "boat operator", "chef"],
+        "first_names": ["Rahul", "Maria", "Joaquim", "Sheetal", "Anthony", "Neelam", "Vishal", "Crystal", "Savio", "Aarti", "Francis", "Rhea"],
+        "surnames": ["D'Souza", "Naik", "Fernandes", "Kamat", "Pereira", "Sawant", "Gomes", "Dias"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with oleander extract stirred into a glass of feni",
+             "state": "poisoned", "weapon": "Feni Glass",
+             "weapon_description": "A glass with dregs of cashew feni that test positive for oleander",
+             "trace": "a smear of oleander sap"},
+            {"crime": "murder", "act": "struck {victim} on the head with a heavy conch-shell doorstop",
+             "state": "struck on the head", "weapon": "Conch Shell",
+             "weapon_description": "A heavy conch-shell doorstop with a chipped lip stained with blood",
+             "trace": "grains of shell dust"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a nylon mooring rope",
+             "state": "strangled", "weapon": "Mooring Rope",
+             "weapon_description": "A length of blue nylon mooring rope, frayed at one end",
+             "trace": "blue nylon fibres"},
+        ],
+        "culprit_items": [
+            ("Festival Wristband", "a neon festival wristband with a snapped clasp"),
+            ("Silver Anklet", "a silver anklet with tiny bells"),
+            ("Casino Chip", "a chip from a Panjim casino boat"),
+            ("Mirrored Sunglasses", "a pair of mirrored sunglasses with a cracked lens"),
+            ("Scooter Key", "a rented scooter key on a coconut-shell key ring"),
+        ],
+        "motives": [
+            "stands to inherit the resort from {victim}",
+            "was about to be exposed by {victim} for skimming money from the bar takings",
+            "was fired by {victim} in front of the guests last month",
+            "lost a bitter beachfront land dispute to {victim}",
+            "was being blackmailed by {victim} over a drugs bust years ago",
+            "was cut out of a lucrative festival deal by {victim}",
+        ],
+    },
+    "Rajasthan Palace Intrigue": {
+        "city": "Jaipur",
+        "venue": "a heritage palace hotel outside Jaipur",
+        "era": "present day, during the Teej festival",
+        "victim_roles": ["the titular Maharaja of the old royal family", "the palace's ambitious heritage-hotel manager", "a visiting royal art appraiser"],
+        "rooms": ["Sheesh Mahal mirror hall", "zenana courtyard", "armoury", "durbar hall", "stepwell garden"],
+        "alibi_places": ["the Govind Dev Ji temple", "a camel fair on the outskirts", "a dal baati stall near Hawa Mahal", "a puppet show at the palace gates", "the Amer Fort light show", "a jewellers' bazaar in Johari Bazaar"],
+        "occupations": ["royal priest", "palace curator", "estranged prince", "head of security", "folk musician", "antique dealer", "hotel chef"],
+        "first_names": ["Vikramaditya", "Padmini", "Jaiveer", "Gayatri", "Ranveer", "Mrinalini", "Bhupendra", "Devika", "Yashvardhan", "Rukmini", "Tejpal", "Hemlata"],
+        "surnames": ["Singh Rathore", "Shekhawat", "Bhati", "Chundawat", "Kachhwaha", "Sisodia", "Jadeja", "Parihar"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with datura seeds ground into a goblet of thandai",
+             "state": "poisoned", "weapon": "Silver Goblet",
+             "weapon_description": "A silver goblet with dregs of thandai that test positive for datura",
+             "trace": "a gritty datura residue"},
+            {"crime": "murder", "act": "struck {victim} on the head with a ceremonial mace from the armoury",
+             "state": "struck on the head", "weapon": "Ceremonial Mace",
+             "weapon_description": "A gilded ceremonial mace missing from its stand, its head stained with blood",
+             "trace": "flakes of gilt"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a bandhani safa",
+             "state": "strangled", "weapon": "Bandhani Safa",
+             "weapon_description": "A long tie-dyed bandhani turban cloth twisted into a cord",
+             "trace": "red bandhani threads"},
+        ],
+        "culprit_items": [
+            ("Signet Ring", "a gold signet ring bearing a family crest"),
+            ("Kundan Earring", "a single kundan earring"),
+            ("Embroidered Mojari", "a single embroidered mojari"),
+            ("Ledger Key", "a small brass key to the palace ledgers"),
+            ("Carved Comb", "a carved camel-bone comb"),
+        ],
+        "motives": [
+            "stands to inherit the palace if {victim} is gone",
+            "was about to be exposed by {victim} for selling palace antiques",
+            "was publicly humiliated by {victim} at the Teej durbar",
+            "lost a bitter fight over the family jewels to {victim}",
+            "was being blackmailed by {victim} over a secret marriage",
+            "was about to be cut out of the royal trust by {victim}",
+        ],
+    },
+    "Kerala Backwater Mystery": {
+        "city": "Alappuzha",
+        "venue": "a luxury houseboat moored in the backwaters",
+        "era": "present day, during the Onam boat races",
+        "victim_roles": ["the houseboat company's owner", "an Ayurveda resort tycoon", "a famous snake-boat race patron"],
+        "rooms": ["upper deck", "galley kitchen", "master cabin", "boat's engine room", "jetty office"],
+        "alibi_places": ["the snake-boat race stands", "a toddy shop by the canal", "the Ambalappuzha temple", "a Kathakali performance", "a spice plantation in Kumily", "a church feast in Kottayam"],
+        "occupations": ["houseboat captain", "Ayurveda physician", "spice trader", "tour operator", "race team coach", "cook", "fisheries officer"],
+        "first_names": ["Anil", "Lakshmi", "Jose", "Meera", "Suresh", "Annamma", "Vishnu", "Deepa", "Thomas", "Revathi", "Biju", "Sreeja"],
+        "surnames": ["Menon", "Nair", "Kurian", "Pillai", "Varghese", "Panicker", "Thomas", "Namboodiri"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with yellow oleander seeds crushed into a glass of toddy",
+             "state": "poisoned", "weapon": "Toddy Glass",
+             "weapon_description": "A glass of palm toddy whose dregs test positive for yellow oleander",
+             "trace": "a smear of oleander paste"},
+            {"crime": "murder", "act": "struck {victim} on the head with a brass nilavilakku lamp",
+             "state": "struck on the head", "weapon": "Brass Lamp",
+             "weapon_description": "A heavy brass nilavilakku lamp, bent at the stem and stained with blood",
+             "trace": "specks of lamp oil"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a coir mooring rope",
+             "state": "strangled", "weapon": "Coir Rope",
+             "weapon_description": "A length of coir mooring rope, knotted and frayed",
+             "trace": "coarse coir fibres"},
+        ],
+        "culprit_items": [
+            ("Gold Bangle", "a thin gold bangle with a broken clasp"),
+            ("Jasmine Garland", "a crushed jasmine garland, still fragrant"),
+            ("Race Pass", "a laminated VIP pass for the boat race stands"),
+            ("Wooden Rosary", "a wooden rosary with a snapped string"),
+            ("Reading Glasses", "a pair of gold-rimmed reading glasses with a cracked lens"),
+        ],
+        "motives": [
+            "stands to inherit the houseboat fleet from {victim}",
+            "was about to be exposed by {victim} for selling fake Ayurvedic medicines",
+            "was publicly humiliated by {victim} at the boat race committee",
+            "lost a bitter backwater land dispute to {victim}",
+            "was being blackmailed by {victim} over a capsized tourist boat",
+            "was cut out of a lucrative spice export deal by {victim}",
+        ],
+    },
+    "Punjab Farmhouse Crime": {
+        "city": "Ludhiana",
+        "venue": "a sprawling farmhouse outside Ludhiana",
+        "era": "present day, during the Baisakhi harvest",
+        "victim_roles": ["a wealthy landowner and sarpanch", "a tractor-dealership magnate", "an NRI returned from Canada"],
+        "rooms": ["grain storehouse", "tubewell shed", "haveli courtyard", "cattle shed", "rooftop where kites are flown"],
+        "alibi_places": ["the gurudwara's langar hall", "a dhaba on the Grand Trunk Road", "a bhangra rehearsal in the village", "the mandi in Khanna", "a wedding sangeet in Jalandhar", "a cricket match at the village ground"],
+        "occupations": ["farm manager", "commission agent", "tractor mechanic", "local politician", "bhangra teacher", "family lawyer", "veterinary doctor"],
+        "first_names": ["Gurpreet", "Harleen", "Jaswinder", "Simran", "Baldev", "Navneet", "Kuldeep", "Manpreet", "Amrik", "Jasleen", "Tejinder", "Rupinder"],
+        "surnames": ["Sandhu", "Gill", "Dhillon", "Brar", "Sidhu", "Grewal", "Bajwa", "Randhawa"],
+        "methods": [
+            {"crime": "murder by poisoning", "act": "poisoned {victim} with pesticide stirred into a glass of lassi",
+             "state": "poisoned", "weapon": "Lassi Glass",
+             "weapon_description": "A tall steel glass whose lassi dregs test positive for pesticide",
+             "trace": "a smear of pesticide residue"},
+            {"crime": "murder", "act": "struck {victim} on the head with a heavy iron tractor spanner",
+             "state": "struck on the head", "weapon": "Tractor Spanner",
+             "weapon_description": "A heavy iron tractor spanner stained with blood",
+             "trace": "black engine grease"},
+            {"crime": "murder by strangulation", "act": "strangled {victim} with a phulkari dupatta",
+             "state": "strangled", "weapon": "Phulkari Dupatta",
+             "weapon_description": "A brightly embroidered phulkari dupatta twisted into a cord",
+             "trace": "orange silk floss"},
+        ],
+        "culprit_items": [
+            ("Steel Kara", "a steel kara with a dented edge"),
+            ("Tractor Key", "a tractor ignition key on a leather tag"),
+            ("Turban Pin", "a silver turban pin"),
+            ("Bus Ticket", "a torn bus ticket stamped that evening"),
+            ("Reading Glasses", "a pair of gold-rimmed reading glasses with a cracked lens"),
+        ],
+        "motives": [
+            "stands to inherit {victim}'s farmland",
+            "was about to be exposed by {victim} for cheating farmers at the mandi",
+            "was publicly humiliated by {victim} at the panchayat",
+            "lost a bitter canal water dispute to {victim}",
+            "was being blackmailed by {victim} over a visa fraud",
+            "was cut out of a lucrative land deal by {victim}",
+        ],
+    },
+}
+
+PERSONALITIES = [
+    "Charming and quick-witted, but defensive when pressed",
+    "Quiet and meticulous, choosing every word carefully",
+    "Hot-tempered and loud, yet fiercely loyal",
+    "Warm and talkative, eager to be helpful",
+    "Cold, calculating and impatient with questions",
+    "Nervous and fidgety, avoiding eye contact",
+]
+
+SECRETS = [
+    "is secretly in debt to a moneylender",
+    "has been having an affair with a member of the household",
+    "forged a signature on an important document last year",
+    "is quietly planning to leave the country",
+    "once served time under a different name",
+    "has been selling family heirlooms behind everyone's back",
+]
+
+TITLES = ["Death in the {room}", "The {item} Affair", "The Secret of the {room}", "A Murder in {city}", "The Last Night in the {room}"]
+
+CRIME_TIMES = [("9:30 pm", "9 and 10 pm"), ("10:15 pm", "10 and 11 pm"), ("8:45 pm", "8:30 and 9:30 pm"), ("11:00 pm", "10:30 and 11:30 pm")]
+
+
+def theme_name(theme: str) -> str:
+    """Home page theme name for a theme name or an engine theme description"""
+    if theme in THEME_POOLS:
+        return theme
+    words = set(normalize(theme).split())
+    for name, pool in THEME_POOLS.items():
+        if words & {normalize(name).split()[0], normalize(pool["city"]).split()[0]}:
+            return name
+    return "Mumbai Underworld Mystery"
+
+
+def _upper_first(text: str) -> str:
+    """Capitalize the first letter only (str.capitalize() lowercases names like Juhu or RFID)"""
+    return text[:1].upper() + text[1:]
+
+
+def _theme_pool(theme: str) -> dict:
+    """Accept a Home page theme name or an engine theme description"""
+    return THEME_POOLS[theme_name(theme)]
+
+
+def generate_procedural_case(theme: str, seed: Optional[int] = None, suspects: int = 4,
+                             attempts: int = 5) -> MysteryCase:
+    """Build a solvable case: the culprit's alibi is contradicted and an item places them at the scene
+
+    Each draw is checked with check_solvable(); a draw that fails is replaced by the next one
+    from the same seed, and ValueError is raised if none of `attempts` draws passes.
+    """
+    rng = random.Random(seed)
+    pool = _theme_pool(theme)
+    for _ in range(attempts):
+        case = _draw_case(rng, pool, suspects)
+        problems = check_solvable(case)
+        if not problems:
+            return case
+    raise ValueError(f"no solvable case in {attempts} attempts: {'; '.join(problems)}")
+
+
+def _draw_case(rng: random.Random, pool: dict, suspects: int) -> MysteryCase:
+    # People: unique first names and surnames
+    first = rng.sample(pool["first_names"], suspects + 1)
+    last = rng.sample(pool["surnames"], suspects + 1)
+    victim_name = f"{first[0]} {last[0]}"
+    names = [f"{f} {l}" for f, l in zip(first[1:], last[1:])]
+    occupations = rng.sample(pool["occupations"], suspects)
+    ages = [rng.randint(24, 68) for _ in range(suspects)]
+    alibi_places = rng.sample(pool["alibi_places"], suspects)
+    motives = rng.sample(pool["motives"], suspects)
+    personalities = rng.sample(PERSONALITIES, suspects)
+    secrets = rng.sample(SECRETS, suspects)
+
+    method = rng.choice(pool["methods"])
+    item_name, item_description = rng.choice(pool["culprit_items"])
+    rooms = rng.sample(pool["rooms"], 3)
+    crime_room = rooms[0]
+    crime_time, window = rng.choice(CRIME_TIMES)
+    victim_role = rng.choice(pool["victim_roles"])
+
+    culprit = rng.randrange(suspects)
+    herring = rng.choice([i for i in range(suspects) if i != culprit])
+    corroborated = [i for i in range(suspects) if i != culprit]
+
+    suspect_models = []
+    for i in range(suspects):
+        alibi = (
+            f"Between {window} I was at {alibi_places[i]}. I went there straight after dinner, "
+            f"spoke to a few people I know there and only heard the news about {victim_name} "
+            f"when my phone started ringing. Anyone at {alibi_places[i]} will tell you I never left."
+        )
+        suspect_models.append(Suspect(
+            name=names[i],
+            age=ages[i],
+            occupation=_upper_first(occupations[i]),
+            alibi=alibi,
+            motive=_upper_first(motives[i].format(victim=victim_name)),
+            personality=personalities[i],
+            secret=_upper_first(secrets[i]),
+        ))
+
+    c = names[culprit]
+    evidence = [
+        Evidence(
+            name=method["weapon"],
+            description=method["weapon_description"],
+            location=f"The {crime_room}",
+            significance=f"This is how {victim_name} was killed at around {crime_time}",
+        ),
+        Evidence(
+            name=item_name,
+            description=f"{_upper_first(item_description)}, recognised by staff as belonging to {c}, "
+                        f"with {method['trace']} on it",
+            location=f"Under a cabinet in the {crime_room}",
+            significance=f"Places {c} in the {crime_room} close to the time of the crime",
+        ),
+        Evidence(
+            name="CCTV Footage",
+            description=f"Footage from {alibi_places[culprit]} covering {window} shows no sign of {c} "
+                        f"at any point",
+            location=f"Security office at {alibi_places[culprit]}",
+            significance=f"Contradicts the alibi given by {c}",
+        ),
+        Evidence(
+            name="Threatening Letter",
+            description=f"An angry letter signed by {names[herring]} warning {victim_name} that "
+                        f"'this will not go unanswered'",
+            location=f"The {rooms[1]}",
+            significance=f"Shows {names[herring]} had a grudge against the victim",
+        ),
+    ]
+    # Witness statements confirming innocent alibis, as many as the evidence limit of 6 allows
+    corroborated = corroborated[:6 - len(evidence)]
+    for i in corroborated:
+        evidence.append(Evidence(
+            name=f"Witness Statement ({names[i].split()[0]})",
+            description=f"Several people confirm {names[i]} was at {alibi_places[i]} throughout {window}",
+            location=alibi_places[i],
+            significance=f"Corroborates the alibi given by {names[i]}",
+        ))
+    witnessed = [names[i] for i in corroborated]
+
+    key_clues = [
+        f"CCTV footage shows {c} was not at {alibi_places[culprit]} between {window}",
+        f"The {item_name.lower()} belonging to {c} was found in the {crime_room} with {method['trace']} on it",
+        f"Witnesses confirm the alibis of {', '.join(witnessed[:-1])} and {witnessed[-1]}",
+    ]
+
+    scene = (
+        f"Night has settled over {pool['venue']} in {pool['city']}, but the celebrations have stopped. "
+        f"In the {crime_room}, {victim_name}, {victim_role}, lies still, "
+        f"{method['state']} some time around {crime_time}. Household staff whisper in the "
+        f"corridors while the smell of incense and fried snacks still hangs in the air from the evening's "
+        f"festivities. A guest list lies abandoned on a side table; several names on it belong to people "
+        f"who had every reason to resent {victim_name.split()[0]}. "
+        f"In the {rooms[1]}, a letter has been left in plain sight, and in the {rooms[2]} the staff "
+        f"swear they heard raised voices earlier that evening. Every suspect insists they were far away "
+        f"when it happened. One of them is lying, Detective, and the truth is waiting in the details."
+    )
+
+    return MysteryCase(
+        title=rng.choice(TITLES).format(room=string.capwords(crime_room), item=item_name, city=pool["city"]),
+        setting=f"{_upper_first(pool['venue'])}, {pool['city']}, {pool['era']}",
+        victim=f"{victim_name}, {victim_role}",
+        crime=f"The {method['crime']} of {victim_name} in the {crime_room}",
+        initial_scene=scene,
+        suspects=suspect_models,
+        evidence=evidence,
+        solution=(
+            f"{c} {method['act'].format(victim=victim_name)} "
+            f"in the {crime_room} at around {crime_time}. {c} claimed to be at {alibi_places[culprit]}, "
+            f"but CCTV shows they never arrived, and the {item_name.lower()} they dropped turned up at the scene. "
+            f"Motive: {c} {motives[culprit].format(victim=victim_name)}."
+        ),
+        key_clues=key_clues,
+    )
+
+
+def check_solvable(case: MysteryCase) -> List[str]:
+    """Problems that would make a case unfair or unsolvable (empty list = solvable)"""
+    problems = []
+    if not 3 <= len(case.suspects) <= 5:
+        problems.append(f"expected 3-5 suspects, found {len(case.suspects)}")
+    if not 4 <= len(case.evidence) <= 6:
+        problems.append(f"expected 4-6 pieces of evidence, found {len(case.evidence)}")
+
+    names = [normalize(s.name) for s in case.suspects]
+    if len(set(names)) != len(names):
+        problems.append("suspect names are not unique")
+
+    solution = normalize(case.solution)
+    named = [s for s, n in zip(case.suspects, names) if n and n in solution]
+    if len(named) != 1:
+        problems.append(f"the solution should name exactly one suspect, names {len(named)}")
+        return problems
+    culprit = normalize(named[0].name)
+
+    if not case.key_clues:
+        problems.append("there are no key clues")
+    if not any(culprit in normalize(clue) for clue in case.key_clues):
+        problems.append("no key clue points to the culprit")
+
+    # The player must be able to find the incriminating facts in the evidence itself
+    linked = [e for e in case.evidence if culprit in normalize(f"{e.description} {e.significance}")]
+    if not linked:
+        problems.append("no evidence links the culprit to the crime")
+
+    # ...including a broken alibi, and only the culprit's
+    broken = {normalize(c.person) for c in FactGraph(case).conflicts()}
+    if culprit not in broken:
+        problems.append("no evidence contradicts the culprit's alibi")
+    if broken - {culprit}:
+        problems.append(f"innocent alibis are contradicted too: {', '.join(sorted(broken - {culprit}))}")
+    return problems
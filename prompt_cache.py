@@ -0,0 +1,79 @@
+"""
+Prompt cache accounting
+Records cached vs uncached prompt tokens reported by the provider for every LLM call
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+# OpenAI only caches prompts of at least this many tokens, in 128-token steps
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def cached_tokens(usage: Optional[dict]) -> int:
+    """Prompt tokens served from the provider's cache, from LangChain usage_metadata"""
+    details = (usage or {}).get("input_token_details") or {}
+    # Keys are prefixed with the service tier on some accounts, e.g. "priority_cache_read"
+    return sum(v or 0 for k, v in details.items() if k.endswith("cache_read"))
+
+
+class PromptCacheStats:
+    """Per-operation totals of cached and uncached prompt tokens, plus recent calls"""
+
+    def __init__(self, recent: int = 200):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._recent = deque(maxlen=recent)
+
+    def record(self, label: str, input_tokens: int, cached: int, latency_ms: float):
+        with self._lock:
+            totals = self._totals.setdefault(label, {
+                "calls": 0, "hits": 0, "input_tokens": 0, "cached_tokens": 0,
+                "hit_ms": 0.0, "miss_ms": 0.0,
+            })
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["cached_tokens"] += cached
+            if cached:
+                totals["hits"] += 1
+                totals["hit_ms"] += latency_ms
+            else:
+                totals["miss_ms"] += latency_ms
+            self._recent.append({
+                "label": label,
+                "input_tokens": input_tokens,
+                "cached_tokens": cached,
+                "uncached_tokens": input_tokens - cached,
+                "latency_ms": round(latency_ms, 1),
+            })
+
+    def recent(self) -> list:
+        """The most recent calls, oldest first"""
+        with self._lock:
+            return list(self._recent)
+
+    def stats(self) -> Dict[str, dict]:
+        """Cached share of prompt tokens and average latency with and without a cache hit"""
+        with self._lock:
+            report = {}
+            for label, t in self._totals.items():
+                misses = t["calls"] - t["hits"]
+                report[label] = {
+                    "calls": t["calls"],
+                    "input_tokens": t["input_tokens"],
+                    "cached_tokens": t["cached_tokens"],
+                    "uncached_tokens": t["input_tokens"] - t["cached_tokens"],
+                    "cached_ratio": t["cached_tokens"] / t["input_tokens"] if t["input_tokens"] else 0.0,
+                    "avg_hit_ms": t["hit_ms"] / t["hits"] if t["hits"] else None,
+                    "avg_miss_ms": t["miss_ms"] / misses if misses else None,
+                }
+            return report
+
+
+# Global accounting shared by every engine in the process
+_prompt_cache_stats = PromptCacheStats()
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Get the process-wide prompt cache accounting"""
+    return _prompt_cache_stats
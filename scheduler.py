@@ -0,0 +1,231 @@
+"""
+Process-wide scheduler for LLM requests
+Applies per-API-key rate limits and serves interactive calls ahead of background work
+"""
+
+import os
+import time
+import heapq
+import hashlib
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from cancellation import CancelToken, CallCancelled
+
+# Request priorities (lower value is served first)
+INTERACTIVE = 0
+BACKGROUND = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+
+def key_id(api_key: str) -> str:
+    """Short, non-reversible identifier for an API key (safe to show in stats)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+class TokenBucket:
+    """Classic token bucket that refills continuously up to its capacity"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)"""
+        self._refill(now)
+        # Requests larger than the bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+    def adjust(self, delta: float):
+        """Give back (positive) or charge (negative) tokens after the fact"""
+        self.level = min(self.capacity, self.level + delta)
+
+
+class _Ticket:
+    """A single queued request waiting for admission"""
+
+    def __init__(self, priority: int, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued = time.monotonic()
+
+
+class _KeyState:
+    """Limits, queue and counters for one API key"""
+
+    def __init__(self, rpm: int, tpm: int, max_concurrency: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.queue: List[tuple] = []
+        self.cond = threading.Condition()
+        self.admitted = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.total_wait = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.max_wait = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self.rate_limited = 0
+
+
+class RequestScheduler:
+    """Admits LLM calls per API key under requests/min and tokens/min budgets
+
+    Callers wrap each upstream call in `slot()`. Waiting callers are served in
+    priority order (interactive before background), FIFO within a priority.
+    """
+
+    def __init__(self, rpm: int = 500, tpm: int = 200000, max_concurrency: int = 8):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self._keys: Dict[str, _KeyState] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _state(self, api_key: str) -> _KeyState:
+        kid = key_id(api_key)
+        with self._lock:
+            state = self._keys.get(kid)
+            if state is None:
+                state = _KeyState(self.rpm, self.tpm, self.max_concurrency)
+                self._keys[kid] = state
+            return state
+
+    def acquire(self, api_key: str, tokens: int, priority: int = INTERACTIVE,
+                cancel: Optional[CancelToken] = None) -> _Ticket:
+        """Block until the request may be sent; returns a ticket for `release()`
+        
+        If `cancel` is cancelled while the request waits, it leaves the queue and
+        CallCancelled is raised.
+        """
+        state = self._state(api_key)
+        ticket = _Ticket(priority, tokens)
+        entry = (priority, next(self._seq), ticket)
+
+        with state.cond:
+            heapq.heappush(state.queue, entry)
+            while True:
+                now = time.monotonic()
+                wait = 0.05
+                if state.queue[0] is entry and state.in_flight < state.max_concurrency:
+                    wait = max(
+                        state.paused_until - now,
+                        state.requests.wait_time(1, now),
+                        state.tokens.wait_time(tokens, now),
+                    )
+                    if wait <= 0:
+                        break
+                if cancel is not None:
+                    if cancel.cancelled:
+                        state.queue.remove(entry)
+                        heapq.heapify(state.queue)
+                        state.cond.notify_all()
+                        raise CallCancelled(cancel.reason)
+                    wait = min(wait, 0.25)
+                state.cond.wait(timeout=wait)
+
+            heapq.heappop(state.queue)
+            state.requests.take(1)
+            state.tokens.take(tokens)
+            state.in_flight += 1
+
+            waited = now - ticket.enqueued
+            state.admitted[priority] += 1
+            state.total_wait[priority] += waited
+            state.max_wait[priority] = max(state.max_wait[priority], waited)
+            state.cond.notify_all()
+
+        return ticket
+
+    def release(self, api_key: str, ticket: _Ticket, actual_tokens: Optional[int] = None):
+        """Finish a request, correcting the token budget with real usage if known"""
+        state = self._state(api_key)
+        with state.cond:
+            state.in_flight -= 1
+            if actual_tokens is not None:
+                state.tokens.adjust(ticket.tokens - actual_tokens)
+            state.cond.notify_all()
+
+    def pause(self, api_key: str, seconds: float):
+        """Hold all requests for a key, e.g. after the provider returned a rate-limit error"""
+        state = self._state(api_key)
+        with state.cond:
+            state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+            state.rate_limited += 1
+            state.cond.notify_all()
+
+    @contextmanager
+    def slot(self, api_key: str, tokens: int, priority: int = INTERACTIVE):
+        """Context manager form of acquire/release
+
+        The yielded ticket's `actual_tokens` may be set by the caller to
+        reconcile the token budget on exit.
+        """
+        ticket = self.acquire(api_key, tokens, priority)
+        ticket.actual_tokens = None
+        try:
+            yield ticket
+        finally:
+            self.release(api_key, ticket, ticket.actual_tokens)
+
+    def queue_depth(self, api_key: str, priority: Optional[int] = None) -> int:
+        """Requests waiting for a key, optionally only those of one priority"""
+        state = self._state(api_key)
+        with state.cond:
+            return sum(1 for p, _, _ in state.queue if priority is None or p == priority)
+
+    def stats(self) -> Dict[str, dict]:
+        """Queue depth and wait-time figures per API key (keys shown as short hashes)"""
+        report = {}
+        with self._lock:
+            states = dict(self._keys)
+        for kid, state in states.items():
+            with state.cond:
+                depth = {name: 0 for name in PRIORITY_NAMES.values()}
+                for priority, _, _ in state.queue:
+                    depth[PRIORITY_NAMES[priority]] += 1
+                report[kid] = {
+                    "queue_depth": depth,
+                    "in_flight": state.in_flight,
+                    "rate_limited": state.rate_limited,
+                    "admitted": {PRIORITY_NAMES[p]: n for p, n in state.admitted.items()},
+                    "avg_wait_s": {
+                        PRIORITY_NAMES[p]: (state.total_wait[p] / n if n else 0.0)
+                        for p, n in state.admitted.items()
+                    },
+                    "max_wait_s": {PRIORITY_NAMES[p]: w for p, w in state.max_wait.items()},
+                }
+        return report
+
+
+# Global scheduler instance shared by every engine in the process
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> RequestScheduler:
+    """Get or create the process-wide scheduler (limits come from the environment)"""
+    global _scheduler
+
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(
+                rpm=int(os.getenv("MYSTERYAI_RPM", "500")),
+                tpm=int(os.getenv("MYSTERYAI_TPM", "200000")),
+                max_concurrency=int(os.getenv("MYSTERYAI_MAX_CONCURRENCY", "8")),
+            )
+    return _scheduler
@@ -0,0 +1,280 @@
+"""
+External session state store
+Persists investigations outside the Streamlit process so they survive restarts and work across replicas
+"""
+
+import os
+import json
+import zlib
+import time
+import atexit
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional, Tuple
+
+from mystery_engine import MysteryCase
+
+# Bump when the record layout changes; decode_record() ignores records from a newer release
+FORMAT_VERSION = 1
+
+# Where sessions are kept unless MYSTERYAI_SESSION_URL says otherwise; independent of the working directory
+DEFAULT_SESSION_PATH = os.path.join(os.path.expanduser("~"), ".mysteryai", "sessions.db")
+
+
+def encode_record(record: dict) -> bytes:
+    """Compact, versioned encoding of a session record"""
+    payload = dict(record, v=FORMAT_VERSION)
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_record(blob: bytes) -> Optional[dict]:
+    """Decode a record written by encode_record(); None if a newer release wrote it"""
+    record = json.loads(zlib.decompress(blob))
+    if record.get("v", 0) > FORMAT_VERSION:
+        return None  # written by a newer release; don't guess
+    return record
+
+
+class SessionStore(ABC):
+    """Interface for session stores
+
+    Session records are small dicts that reference their case by fingerprint;
+    case bodies are stored once per fingerprint and shared by every session.
+    """
+
+    @abstractmethod
+    def load(self, session_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def save_many(self, records: Iterable[Tuple[str, dict]]):
+        ...
+
+    def save(self, session_id: str, record: dict):
+        self.save_many([(session_id, record)])
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    @abstractmethod
+    def put_case(self, fingerprint: str, case: MysteryCase):
+        ...
+
+    @abstractmethod
+    def get_case(self, fingerprint: str) -> Optional[MysteryCase]:
+        ...
+
+    def flush(self):
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """Reference store backed by a local SQLite file"""
+
+    def __init__(self, path: str = DEFAULT_SESSION_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, updated REAL NOT NULL, body BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS cases (fingerprint TEXT PRIMARY KEY, body BLOB NOT NULL);
+            """
+        )
+        self._db.commit()
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return decode_record(row[0]) if row else None
+
+    def save_many(self, records: Iterable[Tuple[str, dict]]):
+        now = time.time()
+        rows = [(session_id, now, encode_record(record)) for session_id, record in records]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO sessions (id, updated, body) VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+
+    def put_case(self, fingerprint: str, case: MysteryCase):
+        body = zlib.compress(case.model_dump_json().encode("utf-8"))
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO cases (fingerprint, body) VALUES (?, ?)", (fingerprint, body))
+            self._db.commit()
+
+    def get_case(self, fingerprint: str) -> Optional[MysteryCase]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM cases WHERE fingerprint = ?", (fingerprint,)).fetchone()
+        return MysteryCase.model_validate_json(zlib.decompress(row[0])) if row else None
+
+
+class InMemoryKV:
+    """Local stand-in for a networked key-value store (get / mset / delete, optional latency)"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._data: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get(self, key: str) -> Optional[bytes]:
+        self._round_trip()
+        with self._lock:
+            return self._data.get(key)
+
+    def mset(self, items: Dict[str, bytes]):
+        self._round_trip()
+        with self._lock:
+            self._data.update(items)
+
+    def setnx(self, key: str, value: bytes):
+        self._round_trip()
+        with self._lock:
+            self._data.setdefault(key, value)
+
+    def delete(self, key: str):
+        self._round_trip()
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class KVSessionStore(SessionStore):
+    """Session store on top of a key-value client with get/mset/setnx/delete"""
+
+    def __init__(self, kv=None, prefix: str = "mysteryai:"):
+        self.kv = kv or InMemoryKV()
+        self.prefix = prefix
+
+    def load(self, session_id: str) -> Optional[dict]:
+        blob = self.kv.get(f"{self.prefix}session:{session_id}")
+        return decode_record(blob) if blob else None
+
+    def save_many(self, records: Iterable[Tuple[str, dict]]):
+        items = {f"{self.prefix}session:{session_id}": encode_record(record) for session_id, record in records}
+        if items:
+            self.kv.mset(items)
+
+    def delete(self, session_id: str):
+        self.kv.delete(f"{self.prefix}session:{session_id}")
+
+    def put_case(self, fingerprint: str, case: MysteryCase):
+        self.kv.setnx(f"{self.prefix}case:{fingerprint}", zlib.compress(case.model_dump_json().encode("utf-8")))
+
+    def get_case(self, fingerprint: str) -> Optional[MysteryCase]:
+        blob = self.kv.get(f"{self.prefix}case:{fingerprint}")
+        return MysteryCase.model_validate_json(zlib.decompress(blob)) if blob else None
+
+
+class WriteBehindStore(SessionStore):
+    """Buffers session writes and flushes them in batches on a background thread
+
+    Reads see buffered writes immediately, so a session resumed on the same
+    replica never observes stale state.
+    """
+
+    def __init__(self, store: SessionStore, flush_interval: float = 2.0, max_pending: int = 200):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[str, Optional[dict]] = {}  # None marks a delete
+        self._known_cases = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # keep buffering; the next flush retries
+
+    def load(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            if session_id in self._pending:
+                return self._pending[session_id]
+        return self.store.load(session_id)
+
+    def save_many(self, records: Iterable[Tuple[str, dict]]):
+        with self._lock:
+            for session_id, record in records:
+                self._pending[session_id] = record
+            if len(self._pending) >= self.max_pending:
+                self._wake.set()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._pending[session_id] = None
+
+    def put_case(self, fingerprint: str, case: MysteryCase):
+        # Cases are written through immediately (once) so sessions never reference a missing case
+        if fingerprint not in self._known_cases:
+            self.store.put_case(fingerprint, case)
+            self._known_cases.add(fingerprint)
+
+    def get_case(self, fingerprint: str) -> Optional[MysteryCase]:
+        return self.store.get_case(fingerprint)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            self.store.save_many((sid, record) for sid, record in pending.items() if record is not None)
+            for sid, record in pending.items():
+                if record is None:
+                    self.store.delete(sid)
+        except Exception:
+            # Put the batch back unless newer writes replaced it meanwhile
+            with self._lock:
+                for sid, record in pending.items():
+                    self._pending.setdefault(sid, record)
+            raise
+
+
+# Global session store shared by every session in the process
+_session_store = None
+_session_store_lock = threading.Lock()
+
+def get_session_store() -> Optional[SessionStore]:
+    """Get the configured session store, or None if persistence is turned off
+
+    MYSTERYAI_SESSION_URL is "sqlite:///path/to/sessions.db" (default DEFAULT_SESSION_PATH),
+    "memory://" for the in-process key-value stand-in (lost on restart), or "off".
+    """
+    global _session_store
+
+    url = os.getenv("MYSTERYAI_SESSION_URL", f"sqlite:///{DEFAULT_SESSION_PATH}")
+    if url == "off":
+        return None
+
+    with _session_store_lock:
+        if _session_store is None:
+            if url.startswith("sqlite:///"):
+                backend = SQLiteSessionStore(url[len("sqlite:///"):])
+            elif url.startswith("memory://"):
+                backend = KVSessionStore(InMemoryKV())
+            else:
+                raise ValueError(f"Unsupported session store '{url}'")
+            _session_store = WriteBehindStore(
+                backend, flush_interval=float(os.getenv("MYSTERYAI_SESSION_FLUSH_INTERVAL", "2"))
+            )
+    return _session_store
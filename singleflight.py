@@ -0,0 +1,137 @@
+"""
+Single-flight coalescing of identical in-flight calls
+Concurrent callers with the same key wait on one upstream call and share its result
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator
+
+from cancellation import CallCancelled
+
+
+class _Call:
+    """One upstream call and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block and receive the same result (or exception). If the first
+    caller is interrupted rather than the call failing, they get CallCancelled.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, key: Hashable, field: str):
+        # Keys are tuples whose first item names the operation
+        name = key[0] if isinstance(key, tuple) and key else "call"
+        totals = self._totals.setdefault(name, {"calls": 0, "coalesced": 0})
+        totals[field] += 1
+
+    def pending(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+    def _join(self, key: Hashable):
+        """The in-flight call for `key`, or a new one; returns (call, leader)"""
+        with self._lock:
+            self._count(key, "calls")
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._count(key, "coalesced")
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call):
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # The leader was interrupted (Ctrl-C, a Streamlit rerun or stop), not the call;
+            # that is for its own thread only, so the others are told to ask again
+            call.error = CallCancelled("abandoned")
+            raise
+        finally:
+            self._finish(key, call)
+        return call.result
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterator[str]]) -> Iterator[str]:
+        """Like do() for calls that yield text as it is written
+
+        The first caller streams the text; callers arriving while it is still running get
+        the whole text in one piece once it is finished. Shares keys with do(), so a streamed
+        and a blocking caller of the same call are coalesced too.
+        """
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            yield call.result
+            return
+
+        parts = []
+        chunks = fn()
+        try:
+            for text in chunks:
+                parts.append(text)
+                yield text
+            call.result = "".join(parts)
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            # The leader's caller stopped reading; the others have to ask again
+            call.error = CallCancelled("abandoned")
+            raise
+        finally:
+            chunks.close()
+            self._finish(key, call)
+
+    def stats(self) -> Dict[str, dict]:
+        """Calls, coalesced duplicates and coalescing rate per operation"""
+        with self._lock:
+            report = {}
+            for name, totals in self._totals.items():
+                calls = totals["calls"]
+                report[name] = {
+                    "calls": calls,
+                    "coalesced": totals["coalesced"],
+                    "coalescing_rate": totals["coalesced"] / calls if calls else 0.0,
+                }
+            report["in_flight"] = len(self._calls)
+            return report
+
+
+# Global single-flight group shared by every engine in the process
+_single_flight = SingleFlight()
+
+def get_single_flight() -> SingleFlight:
+    """Get the process-wide single-flight group"""
+    return _single_flight
@@ -0,0 +1,50 @@
+"""
+Slim mystery generation prompts
+"compact" sends a hand-tuned schema with JSON mode; "structured" uses the provider's native structured output
+"""
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from mystery_engine import MysteryCase
+from scheduler import INTERACTIVE
+from tracing import get_tracer
+
+# Hand-tuned replacement for PydanticOutputParser.get_format_instructions()
+COMPACT_SCHEMA = """Return one JSON object:
+{"title":str,"setting":str,"victim":str,"crime":str,"initial_scene":str,
+"suspects":[{"name":str,"age":int,"occupation":str,"alibi":str,"motive":str,"personality":str,"secret":str}],
+"evidence":[{"name":str,"description":str,"location":str,"significance":str}],
+"solution":str,"key_clues":[str]}
+3-5 suspects, 4-6 evidence. solution = who did it and how (hidden from player)."""
+
+CASE_INSTRUCTIONS = """You are a master mystery writer. Write a solvable mystery set in India.
+
+Theme: {theme}
+
+- Logically solvable from the clues; fair but surprising; include red herrings
+- Authentic Indian names, places, food, festivals and social dynamics
+- Noir tone; initial_scene 200-300 words; each alibi 50-100 words with specific times and places
+- Rich victim description; evidence with vivid descriptions and clear significance"""
+
+COMPACT_PROMPT = ChatPromptTemplate.from_template(CASE_INSTRUCTIONS + "\n\n{schema}")
+
+STRUCTURED_PROMPT = ChatPromptTemplate.from_template(CASE_INSTRUCTIONS)
+
+
+def generate_case_compact(engine, theme: str, priority: int = INTERACTIVE, progress=None) -> MysteryCase:
+    """One call with a compact schema and JSON mode, so the reply is always a JSON object"""
+    llm = engine.llm.bind(response_format={"type": "json_object"})
+    response = engine._invoke(COMPACT_PROMPT, {"theme": theme, "schema": COMPACT_SCHEMA},
+                              priority=priority, max_output_tokens=3000, llm=llm, progress=progress)
+    with get_tracer().span("parse"):
+        return MysteryCase.model_validate_json(response.content)
+
+
+def generate_case_structured(engine, theme: str, priority: int = INTERACTIVE) -> MysteryCase:
+    """One call using native structured output (strict JSON schema enforced by the provider)"""
+    llm = engine.llm.with_structured_output(MysteryCase, method="json_schema", strict=True, include_raw=True)
+    result = engine._invoke(STRUCTURED_PROMPT, {"theme": theme},
+                            priority=priority, max_output_tokens=3000, llm=llm, stream=False)
+    if result.get("parsing_error"):
+        raise ValueError(f"Structured output did not match the case schema: {result['parsing_error']}")
+    return result["parsed"]
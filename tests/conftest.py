@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stand_in_server import start_stand_in_server
+
+
+@pytest.fixture
+def stand_in():
+    """Stand-in model server that takes a moment to answer, so concurrent calls overlap"""
+    server, base_url = start_stand_in_server(latency=0.3, token_latency=0.01)
+    yield server, base_url
+    server.shutdown()
+
+
+@pytest.fixture
+def engine(stand_in):
+    """Game engine on a procedural case, talking to the stand-in model"""
+    from mystery_engine import MysteryGameEngine
+    from procedural import generate_procedural_case
+
+    engine = MysteryGameEngine(api_key="sk-test", base_url=stand_in[1])
+    engine.case = generate_procedural_case("Goa Beach Resort Mystery", seed=1)
+    return engine
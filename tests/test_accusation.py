@@ -0,0 +1,65 @@
+import threading
+
+from streamlit.testing.v1 import AppTest
+
+from load_shedding import DEFERRED_VERDICTS, get_admission_controller
+
+
+def _accusation_page(engine):
+    app = AppTest.from_file("../app.py", default_timeout=30)
+    app.session_state["openai_api_key"] = "sk-test"
+    app.session_state["game_started"] = True
+    app.session_state["selected_theme"] = "Goa Beach Resort Mystery"
+    app.session_state["current_page"] = "Accusation"
+    app.session_state["mystery_case"] = engine.case
+    app.session_state["game_engine"] = engine
+    return app
+
+
+def test_deferred_verdict_is_shown_once_judged(monkeypatch, engine):
+    monkeypatch.setenv("MYSTERYAI_SESSION_URL", "off")
+    monkeypatch.setattr(get_admission_controller(), "forced", DEFERRED_VERDICTS)
+    # Hold the verdict back until the page has shown that it is pending
+    judged = threading.Event()
+    evaluate = engine._evaluate_solution
+    monkeypatch.setattr(engine, "_evaluate_solution", lambda *args: judged.wait(10) and evaluate(*args))
+    app = _accusation_page(engine).run()
+
+    app.text_area[0].input("The CCTV footage contradicts their alibi.")
+    app.button[0].click().run()
+    assert "pending_verdict" in app.session_state
+    assert any("on file" in info.value for info in app.info)
+
+    judged.set()
+    engine.pending_verdict.result(timeout=10)
+    app.run()
+    assert "pending_verdict" not in app.session_state
+    assert app.session_state["last_result"]["score"] is not None
+    assert "celebrate_result" not in app.session_state
+    assert [e.value for e in app.error] == ["**Not quite right**"]
+
+    # Later reruns show the same verdict without polling for it again
+    app.run()
+    assert "pending_verdict" not in app.session_state
+    assert [e.value for e in app.error] == ["**Not quite right**"]
+
+
+def test_try_another_case_stops_the_background_writer(monkeypatch, stand_in, engine):
+    from concurrent.futures import Future
+    from mystery_engine import MysteryGameEngine
+
+    monkeypatch.setenv("MYSTERYAI_SESSION_URL", "off")
+    writer = MysteryGameEngine(api_key="sk-test", base_url=stand_in[1])
+    writer_calls = writer._cancel_token
+    app = _accusation_page(engine)
+    app.session_state["pending_case"] = Future()
+    app.session_state["pending_case_engine"] = writer
+    app.session_state["last_result"] = {"correct": False, "score": 40, "feedback": "Close.", "missed_clues": []}
+    engine_calls = engine._cancel_token
+    app.run()
+
+    next(b for b in app.button if b.label == "🔄 Try Another Case").click().run()
+    assert writer_calls.cancelled and engine_calls.cancelled
+    for key in ["pending_case", "pending_case_engine", "last_result"]:
+        assert key not in app.session_state
+    assert app.session_state["mystery_case"] is not engine.case
@@ -0,0 +1,57 @@
+import json
+from concurrent.futures import Future
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api_server
+from themes import THEME_MAPPING
+
+
+@pytest.fixture
+def client(stand_in, monkeypatch):
+    monkeypatch.setenv("OPENAI_BASE_URL", stand_in[1])
+    with TestClient(api_server.app, headers={"X-OpenAI-Key": "sk-test"}) as client:
+        yield client
+
+
+def _offline_session(client):
+    response = client.post("/sessions", json={"theme": "Goa Beach Resort Mystery", "offline": True})
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def test_session_response_hides_key_clues(client):
+    session_id = _offline_session(client)
+    engine = api_server.sessions.get(session_id).engine
+    for evidence in engine.case.evidence:
+        engine.clue_tracker.record_evidence(evidence.name, " ".join(engine.case.key_clues))
+    body = client.get(f"/sessions/{session_id}").text
+    assert engine.clue_tracker.progress == 1.0
+    assert f'"clues_found":{len(engine.case.key_clues)}' in body
+    for clue in engine.case.key_clues:
+        assert clue not in body
+
+
+def test_theme_is_described_as_in_the_app(client, stand_in):
+    response = client.post("/sessions", json={"theme": "Goa Beach Resort Mystery"})
+    assert response.status_code == 200
+    assert any(THEME_MAPPING["Goa Beach Resort Mystery"] in json.dumps(body) for body in stand_in[0].received)
+
+
+def test_unknown_theme_is_rejected(client):
+    response = client.post("/sessions", json={"theme": "Goa beach"})
+    assert response.status_code == 422
+
+
+def test_failed_deferred_verdict_is_reported(client):
+    session_id = _offline_session(client)
+    failed = Future()
+    failed.set_exception(RuntimeError("model unavailable"))
+    api_server.sessions.get(session_id).engine.pending_verdict = failed
+
+    response = client.get(f"/sessions/{session_id}/verdict")
+    assert response.status_code == 502
+    assert "model unavailable" in response.json()["detail"]
+    # Dropped, so the accusation can be made again
+    assert client.get(f"/sessions/{session_id}/verdict").status_code == 404
@@ -0,0 +1,39 @@
+import threading
+import time
+
+import pytest
+
+from cancellation import CallCancelled
+
+
+def test_cancelled_question_is_not_recorded(engine):
+    suspect = engine.case.suspects[0].name
+    answer = engine.stream_interrogation(suspect, "Where were you?")
+    next(answer)
+    engine.cancel("reset")
+    with pytest.raises(CallCancelled):
+        list(answer)
+    assert engine.interrogation_history.get(suspect, []) == []
+
+
+def test_abandoned_question_is_not_recorded(engine):
+    suspect = engine.case.suspects[0].name
+    answer = engine.stream_interrogation(suspect, "Where were you?")
+    next(answer)
+    answer.close()
+    assert engine.interrogation_history.get(suspect, []) == []
+
+
+def test_question_is_recorded_once_answered(stand_in, engine):
+    server, _ = stand_in
+    suspect = engine.case.suspects[0].name
+    follower = threading.Thread(target=lambda: engine.interrogate_suspect(suspect, "Where were you?"))
+    answer = engine.stream_interrogation(suspect, "Where were you?")
+    next(answer)
+    follower.start()
+    time.sleep(0.05)
+    assert engine.interrogation_history.get(suspect, []) == []
+    list(answer)
+    follower.join(10)
+    assert engine.interrogation_history[suspect] == ["Where were you?"]
+    assert len(server.received) == 1
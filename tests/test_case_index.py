@@ -0,0 +1,73 @@
+import pytest
+
+from case_index import PUBLIC_KINDS, CaseIndex, normalize_name
+from mystery_engine import Evidence, MysteryCase, Suspect
+
+
+def _suspect(name, alibi="I was at home all evening", motive="Money"):
+    return Suspect(name=name, age=40, occupation="Curator", personality="Calm", alibi=alibi,
+                   motive=motive, secret="None")
+
+
+@pytest.fixture
+def index():
+    case = MysteryCase(
+        title="The Ledger Affair",
+        setting="A palace in Jaipur",
+        victim="Devika Bhati, a hotel manager",
+        crime="The murder of Devika Bhati",
+        initial_scene="The durbar hall is silent.",
+        suspects=[
+            _suspect("Dr. Meera Iyer", alibi="I was at the Amer Fort light show"),
+            _suspect("Arjun Mehta"),
+            _suspect("Arjun Kapoor", motive="Lost the family jewels to the victim"),
+        ],
+        evidence=[
+            Evidence(name="Signet Ring", description="A gold signet ring with a family crest",
+                     location="The armoury", significance="Belongs to a suspect"),
+            Evidence(name="Ledger Key", description="A brass key to the palace ledgers",
+                     location="The durbar hall", significance="Opens the safe"),
+        ],
+        solution="Arjun Kapoor did it with the ceremonial mace",
+        key_clues=["The ceremonial mace was taken from the armoury by Arjun Kapoor"],
+    )
+    return CaseIndex(case)
+
+
+@pytest.mark.parametrize("name", ["Meera Iyer", "dr meera iyer", "Mrs. Meera Iyer", "Prof Dr Meera Iyer"])
+def test_honorifics_are_ignored(index, name):
+    assert index.find_suspect(name).name == "Dr. Meera Iyer"
+
+
+def test_a_lone_honorific_is_kept_as_the_name():
+    assert normalize_name("Dr. Meera Iyer") == "meera iyer"
+    assert normalize_name("Inspector") == "inspector"
+
+
+def test_unique_last_name_and_misspelling_find_the_suspect(index):
+    assert index.find_suspect("Kapoor").name == "Arjun Kapoor"
+    assert index.find_suspect("Meera Iyr").name == "Dr. Meera Iyer"
+
+
+def test_ambiguous_first_name_finds_nobody(index):
+    # Two Arjuns: better to ask again than to question the wrong one
+    assert index.find_suspect("Arjun") is None
+
+
+def test_closest_returns_none_on_a_tie():
+    assert CaseIndex._closest("ring", {"rings": "a", "wring": "b"}) is None
+    assert CaseIndex._closest("ring", {"rings": "a", "key": "b"}) == "a"
+
+
+def test_evidence_falls_back_to_fuzzy_match(index):
+    assert index.find_evidence("signet  ring").name == "Signet Ring"
+    assert index.find_evidence("ledger keys").name == "Ledger Key"
+    assert index.find_evidence("telescope") is None
+
+
+def test_public_search_leaves_out_key_clues(index):
+    assert "clue" not in PUBLIC_KINDS
+    assert any(hit.kind == "clue" for hit in index.search("ceremonial mace armoury"))
+    public = index.search("ceremonial mace armoury", kinds=PUBLIC_KINDS)
+    assert public and all(hit.kind != "clue" for hit in public)
+    assert all("ceremonial" not in hit.text for hit in public)
@@ -0,0 +1,47 @@
+from clue_tracker import ClueTracker
+
+NAMES = ["Lakshmi Pillai", "Arjun Mehta", "Rohan Desai", "Vikram Malhotra"]
+CLUES = [
+    "Witnesses confirm the alibis of everyone except Lakshmi Pillai",
+    "The silk scarf belonging to Lakshmi Pillai was found in the library with traces of arsenic",
+]
+
+
+def test_names_alone_do_not_reveal_a_clue():
+    tracker = ClueTracker(CLUES, NAMES)
+    assert tracker.record_interrogation(
+        "Arjun Mehta", "I have no idea, ask Lakshmi Pillai; everyone knows my alibi.") == []
+    assert tracker.discovered == []
+
+
+def test_clue_is_found_from_its_content():
+    tracker = ClueTracker(CLUES, NAMES)
+    found = tracker.record_evidence(
+        "Silk Scarf", "A silk scarf found under the library desk, with traces of arsenic on the hem.")
+    assert found == [1]
+    assert tracker.progress == 0.5
+    # The clue itself names the culprit; only what the player read is handed back
+    assert CLUES[1] not in tracker.discovered
+    assert tracker.discovered == ["Silk Scarf: A silk scarf found under the library desk, with traces of arsenic on the hem."]
+    assert not any("Lakshmi" in lead for lead in tracker.discovered)
+
+
+def test_witness_clue_is_found_when_witnesses_confirm_alibis():
+    tracker = ClueTracker(CLUES, NAMES)
+    tracker.record_interrogation(
+        "Rohan Desai", "The other witnesses confirm our alibis; every one of us except her was seen.")
+    assert tracker.found == [True, False]
+    assert CLUES[0] not in tracker.discovered
+
+
+def test_clue_made_only_of_names_still_matches():
+    tracker = ClueTracker(["Arjun Mehta"], NAMES)
+    assert tracker.observe("It was Arjun Mehta all along") == [0]
+
+
+def test_leads_survive_a_saved_session():
+    tracker = ClueTracker(CLUES, NAMES)
+    tracker.record_evidence("Silk Scarf", "Torn at the hem. A silk scarf with traces of arsenic was in the library.")
+    restored = ClueTracker(CLUES, NAMES)
+    restored.restore(tracker.state())
+    assert restored.discovered == ["Silk Scarf: A silk scarf with traces of arsenic was in the library."]
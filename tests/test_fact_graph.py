@@ -0,0 +1,63 @@
+from fact_graph import FactGraph
+from mystery_engine import Evidence, MysteryCase, Suspect
+
+
+def _case(alibis, evidence=()):
+    return MysteryCase(
+        title="Test", setting="A haveli in Jaipur", victim="Vikram Rao, a hotelier",
+        crime="The murder of Vikram Rao in the library", initial_scene="He died at around 9:30 pm.",
+        suspects=[Suspect(name=name, age=40, occupation="Cook", alibi=alibi, motive="", personality="", secret="")
+                  for name, alibi in alibis],
+        evidence=list(evidence), solution="", key_clues=[],
+    )
+
+
+def _whereabouts(graph, time, name):
+    return [f.object for f in graph.who_was_where(time) if f.subject == name]
+
+
+def test_untimed_sentence_continues_after_the_previous_one():
+    graph = FactGraph(_case([
+        ("Rhea Gomes", "I was in the kitchen from 8 pm until 10 pm supervising the cooks. Then I went to my room."),
+    ]))
+    assert _whereabouts(graph, "9 pm", "Rhea Gomes") == ["the kitchen"]
+    assert _whereabouts(graph, "10:15 pm", "Rhea Gomes") == ["Rhea Gomes's room"]
+
+
+def test_places_before_any_time_stay_untimed():
+    graph = FactGraph(_case([
+        ("Meera Shah", "After dinner I was in the garden. From 9 pm I was at the temple, "
+                       "and at 11 pm I went to the station."),
+    ]))
+    claims = {f.object: f.when for f in graph.facts_about("Meera Shah")}
+    assert claims == {"the garden": "time not stated", "the temple": "at 9:00 pm", "the station": "at 11:00 pm"}
+
+
+def test_company_is_read_with_the_place():
+    graph = FactGraph(_case([
+        ("Arjun Das", "I was with Rhea in the kitchen between 8 and 9 pm. Later I sat on the verandah."),
+        ("Rhea Gomes", "I was in the kitchen from 8 pm until 10 pm supervising the cooks. Then I went to my room."),
+    ]))
+    assert _whereabouts(graph, "8:30 pm", "Arjun Das") == ["the kitchen"]
+    assert _whereabouts(graph, "9:15 pm", "Arjun Das") == ["the verandah"]
+    assert graph.conflicts() == []
+
+
+def test_clashing_alibis_are_reported():
+    graph = FactGraph(_case([
+        ("Kabir Sen", "I stayed in the lobby until 9 pm, then I was with Meera at the temple between 9 and 10 pm."),
+        ("Meera Shah", "I was at the railway station between 9 and 10 pm."),
+    ]))
+    conflicts = graph.alibi_conflicts()
+    assert [(c.person, c.statement) for c in conflicts] == [
+        ("Kabir Sen", "I was with Meera at the temple between 9 and 10 pm.")]
+
+
+def test_evidence_contradicts_a_later_sentence():
+    graph = FactGraph(_case(
+        [("Rhea Gomes", "I was in the kitchen from 8 pm until 10 pm. Then I went to the terrace.")],
+        [Evidence(name="Gate Log", description="The terrace gate log shows Rhea Gomes never arrived at the terrace "
+                                               "between 10 and 10:30 pm",
+                  location="Security desk", significance="Contradicts the alibi given by Rhea Gomes")],
+    ))
+    assert [c.statement for c in graph.conflicts_with("Gate Log")] == ["Then I went to the terrace."]
@@ -0,0 +1,9 @@
+from procedural import check_solvable
+
+
+def test_fanout_generation_runs_end_to_end(stand_in, engine):
+    server, _ = stand_in
+    case = engine.generate_mystery("Rajasthan royal palace intrigue", mode="fanout")
+    requests = len(server.received)
+    assert requests == 1 + 1 + len(case.suspects) + len(case.evidence)
+    assert check_solvable(case) == []
@@ -0,0 +1,50 @@
+import threading
+
+import pytest
+
+from load_shedding import (DEFERRED_VERDICTS, NORMAL, POOLED_CASES, SHORT_ANSWERS, AdmissionController,
+                           get_admission_controller)
+
+
+def test_latency_raises_the_mode_and_calm_lowers_it_one_step_at_a_time(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("load_shedding.time.monotonic", lambda: clock[0])
+    controller = AdmissionController(latency_levels=(1, 2, 3), window=10, cooldown=5, min_samples=1)
+
+    controller.observe("sk-a", 2.5)
+    assert controller.mode("sk-a") == SHORT_ANSWERS
+    assert controller.mode("sk-b") == NORMAL
+
+    clock[0] += 11  # the slow sample has left the window
+    assert controller.mode("sk-a") == SHORT_ANSWERS
+    clock[0] += 5
+    assert controller.mode("sk-a") == POOLED_CASES
+    clock[0] += 5
+    assert controller.mode("sk-a") == NORMAL
+    assert controller.stats()["transitions"] == {
+        "normal->short_answers": 1, "short_answers->pooled_cases": 1, "pooled_cases->normal": 1}
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_medium_local_hint_does_not_name_the_culprit(monkeypatch, engine, seed):
+    from procedural import generate_procedural_case
+
+    monkeypatch.setattr(get_admission_controller(), "forced", SHORT_ANSWERS)
+    engine.case = generate_procedural_case("Goa Beach Resort Mystery", seed=seed)
+    culprit = engine.case.solution.split(" ")[0]
+    hint = engine._local_hint("medium")
+    assert culprit not in hint
+    assert culprit in engine._local_hint("easy")
+
+
+def test_deferred_verdict_reads_progress_before_leaving_the_session(monkeypatch, engine):
+    monkeypatch.setattr(get_admission_controller(), "forced", DEFERRED_VERDICTS)
+    tracker = engine.clue_tracker
+    readers = []
+    summary = tracker.summary
+    monkeypatch.setattr(tracker, "summary", lambda: readers.append(threading.current_thread()) or summary())
+
+    assert engine.submit_solution(engine.case.suspects[0].name, "The timeline gives them away.")["deferred"]
+    engine.pending_verdict.result(timeout=10)
+    # The verdict pool never touches the tracker the session keeps updating
+    assert readers == [threading.current_thread()]
@@ -0,0 +1,56 @@
+import pytest
+
+from procedural import THEME_POOLS, check_solvable, generate_procedural_case
+
+
+@pytest.mark.parametrize("theme", sorted(THEME_POOLS))
+@pytest.mark.parametrize("suspects", [3, 4, 5])
+def test_every_case_is_solvable(theme, suspects):
+    for seed in range(40):
+        case = generate_procedural_case(theme, seed=seed, suspects=suspects)
+        assert check_solvable(case) == [], (theme, seed)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_witness_clue_names_only_corroborated_suspects(seed):
+    case = generate_procedural_case("Goa Beach Resort Mystery", seed=seed)
+    culprit = case.solution.split(" at around")[0]
+    witnessed = {e.name[len("Witness Statement ("):-1] for e in case.evidence if e.name.startswith("Witness")}
+    clue = case.key_clues[2]
+    for suspect in case.suspects:
+        if suspect.name in clue:
+            assert suspect.name.split()[0] in witnessed
+            assert suspect.name not in culprit
+        else:
+            assert suspect.name.split()[0] not in witnessed
+
+
+def test_broken_innocent_alibi_is_reported():
+    case = generate_procedural_case("Goa Beach Resort Mystery", seed=3)
+    innocent = next(s for s in case.suspects if s.name not in case.solution)
+    cctv = next(e for e in case.evidence if e.name == "CCTV Footage")
+    place = innocent.alibi.split(" I was at ")[1].split(".")[0]
+    case.evidence.append(cctv.model_copy(update={
+        "name": "Gate Register",
+        "description": f"The register at {place} shows no sign of {innocent.name} at any point",
+        "significance": f"Contradicts the alibi given by {innocent.name}",
+    }))
+    assert any("innocent alibis" in problem for problem in check_solvable(case))
+
+
+def test_unsolvable_draws_raise(monkeypatch):
+    monkeypatch.setattr("procedural.check_solvable", lambda case: ["no broken alibi"])
+    with pytest.raises(ValueError, match="no broken alibi"):
+        generate_procedural_case("Goa Beach Resort Mystery", seed=1)
+
+
+@pytest.mark.parametrize("theme", sorted(THEME_POOLS))
+def test_methods_items_and_motives_come_from_the_theme(theme):
+    pool = THEME_POOLS[theme]
+    for seed in range(10):
+        case = generate_procedural_case(theme, seed=seed)
+        victim = case.victim.split(",")[0]
+        assert case.evidence[0].name in {method["weapon"] for method in pool["methods"]}
+        assert case.evidence[1].name in {name for name, _ in pool["culprit_items"]}
+        motives = {motive.format(victim=victim) for motive in pool["motives"]}
+        assert all(suspect.motive[1:] in {m[1:] for m in motives} for suspect in case.suspects)
@@ -0,0 +1,19 @@
+import os
+
+
+def _system_prompt(body: dict) -> str:
+    return next(m["content"] for m in body["messages"] if m["role"] == "system")
+
+
+def test_hint_and_verdict_share_only_case_facts(engine, stand_in):
+    server = stand_in[0]
+    engine.get_hint("medium")
+    hint = _system_prompt(server.received[-1])
+    engine.submit_solution(engine.case.suspects[0].name, "The timeline gives them away.")
+    verdict = _system_prompt(server.received[-1])
+
+    shared = os.path.commonprefix([hint, verdict])
+    assert engine.case.solution in shared
+    # Hint-only rules come after the shared prefix and stay out of the verdict
+    assert "never be told the solution" in hint
+    assert "never be told the solution" not in verdict
@@ -0,0 +1,61 @@
+import pytest
+
+import session_store
+from session_store import (
+    InMemoryKV, KVSessionStore, SessionStore, SQLiteSessionStore, WriteBehindStore, get_session_store,
+)
+
+
+@pytest.fixture
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(session_store, "_session_store", None)
+    monkeypatch.delenv("MYSTERYAI_SESSION_URL", raising=False)
+
+
+def test_session_store_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
+
+
+def test_sessions_survive_a_restart_by_default(fresh_store, tmp_path, monkeypatch):
+    default = tmp_path / "home" / ".mysteryai" / "sessions.db"
+    monkeypatch.setattr(session_store, "DEFAULT_SESSION_PATH", str(default))
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.chdir(workdir)
+
+    store = get_session_store()
+    assert isinstance(store.store, SQLiteSessionStore)
+    store.save("abc", {"page": "Hints"})
+    store.flush()
+
+    monkeypatch.setattr(session_store, "_session_store", None)
+    assert get_session_store().load("abc")["page"] == "Hints"
+    assert default.exists()
+    assert list(workdir.iterdir()) == []
+
+
+def test_session_url_picks_the_data_file(fresh_store, tmp_path, monkeypatch):
+    path = tmp_path / "data" / "sessions.db"
+    path.parent.mkdir()
+    monkeypatch.setenv("MYSTERYAI_SESSION_URL", f"sqlite:///{path}")
+    store = get_session_store()
+    assert isinstance(store.store, SQLiteSessionStore)
+    store.save("abc", {"page": "Hints"})
+    store.flush()
+    assert SQLiteSessionStore(str(path)).load("abc")["page"] == "Hints"
+
+
+def test_session_url_off_disables_persistence(fresh_store, monkeypatch):
+    monkeypatch.setenv("MYSTERYAI_SESSION_URL", "off")
+    assert get_session_store() is None
+
+
+def test_write_behind_reads_its_own_writes():
+    backend = KVSessionStore(InMemoryKV())
+    store = WriteBehindStore(backend, flush_interval=60)
+    store.save("abc", {"page": "Evidence"})
+    assert store.load("abc")["page"] == "Evidence"
+    assert backend.load("abc") is None
+    store.flush()
+    assert backend.load("abc")["page"] == "Evidence"
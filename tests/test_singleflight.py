@@ -0,0 +1,116 @@
+import threading
+import time
+
+from cancellation import CallCancelled
+from singleflight import SingleFlight
+
+
+def _in_threads(*targets):
+    threads = []
+    for target in targets:
+        thread = threading.Thread(target=target)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join(10)
+
+
+def test_streamed_followers_get_the_whole_text():
+    group = SingleFlight()
+    calls = []
+    results = []
+
+    def words():
+        calls.append(1)
+        for word in ("I ", "was ", "home."):
+            time.sleep(0.05)
+            yield word
+
+    def read():
+        results.append(list(group.stream("k", words)))
+
+    _in_threads(read, read)
+    assert len(calls) == 1
+    assert sorted(results) == [["I ", "was ", "home."], ["I was home."]]
+
+
+def test_blocking_caller_joins_a_streamed_call():
+    group = SingleFlight()
+    calls = []
+    results = []
+
+    def words():
+        calls.append(1)
+        time.sleep(0.2)
+        yield "Ask my neighbour."
+
+    _in_threads(lambda: results.append("".join(group.stream("k", words))),
+                lambda: results.append(group.do("k", lambda: calls.append(2) or "asked again")))
+    assert calls == [1]
+    assert results == ["Ask my neighbour.", "Ask my neighbour."]
+
+
+def test_followers_of_an_abandoned_stream_are_cancelled():
+    group = SingleFlight()
+    errors = []
+
+    def words():
+        yield "I "
+        time.sleep(0.2)
+        yield "was "
+
+    def leave_early():
+        chunks = group.stream("k", words)
+        next(chunks)
+        time.sleep(0.2)
+        chunks.close()
+
+    def follow():
+        try:
+            list(group.stream("k", words))
+        except CallCancelled as e:
+            errors.append(e.reason)
+
+    _in_threads(leave_early, follow)
+    assert errors == ["abandoned"]
+    assert not group.pending("k")
+
+
+def test_followers_do_not_inherit_the_leaders_interruption():
+    group = SingleFlight()
+    errors = []
+
+    def interrupted():
+        time.sleep(0.2)
+        raise KeyboardInterrupt
+
+    def lead():
+        try:
+            group.do("k", interrupted)
+        except KeyboardInterrupt:
+            errors.append("leader interrupted")
+
+    def follow():
+        try:
+            group.do("k", interrupted)
+        except CallCancelled as e:
+            errors.append(e.reason)
+
+    _in_threads(lead, follow)
+    assert errors == ["leader interrupted", "abandoned"]
+    assert not group.pending("k")
+
+
+def test_identical_streamed_questions_send_one_request(stand_in, engine):
+    server, _ = stand_in
+    suspect = engine.case.suspects[0].name
+    answers = []
+
+    def ask():
+        answers.append("".join(engine.stream_interrogation(suspect, "Where were you?")))
+
+    _in_threads(ask, ask)
+    assert len(server.received) == 1
+    assert len(answers) == 2 and answers[0] == answers[1]
+    assert engine.interrogation_history[suspect] == ["Where were you?"]
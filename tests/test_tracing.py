@@ -0,0 +1,38 @@
+import pytest
+
+from tracing import RingBufferExporter, _current_span, get_tracer
+
+
+@pytest.fixture
+def spans(monkeypatch):
+    exporter = RingBufferExporter()
+    monkeypatch.setattr(get_tracer(), "exporters", [exporter])
+    monkeypatch.setattr(get_tracer(), "enabled", True)
+    return exporter
+
+
+def test_streamed_interrogation_has_a_span_around_its_call(spans, engine):
+    for _ in engine.stream_interrogation(engine.case.suspects[0].name, "Where were you?"):
+        # The span belongs to the stream, not to the code reading it
+        assert _current_span.get() is None
+
+    by_name = {span["name"]: span for span in spans.spans()}
+    outer = by_name["engine.stream_interrogation"]
+    assert by_name["llm.stream"]["parent"] == outer["span"]
+    assert outer["duration_ms"] >= by_name["llm.stream"]["duration_ms"]
+
+
+def test_abandoned_stream_still_ends_its_span(spans, engine):
+    chunks = engine.stream_interrogation(engine.case.suspects[0].name, "Where were you?")
+    next(chunks)
+    chunks.close()
+    assert [s["error"] for s in spans.spans() if s["name"] == "engine.stream_interrogation"] == ["GeneratorExit"]
+
+
+def test_local_lookups_are_traced(spans, engine):
+    engine.who_was_where("9 pm")
+    engine.check_evidence(engine.case.evidence[0].name)
+    engine.list_suspects()
+    engine.list_evidence()
+    names = {span["name"] for span in spans.spans()}
+    assert {"engine.who_was_where", "engine.check_evidence", "engine.list_suspects", "engine.list_evidence"} <= names
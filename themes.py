@@ -0,0 +1,16 @@
+"""
+Case themes
+Maps the themes offered on the Home page to the descriptions the case writer is given
+"""
+
+THEME_MAPPING = {
+    "Mumbai Underworld Mystery": "Mumbai underworld crime mystery with Bollywood connections",
+    "Delhi Political Scandal": "Delhi political corruption and scandal mystery",
+    "Bangalore Tech Startup Crime": "Bangalore IT startup corporate crime mystery",
+    "Kolkata Literary Society Murder": "Kolkata intellectual literary society murder mystery",
+    "Goa Beach Resort Mystery": "Goa beach resort luxury crime mystery",
+    "Rajasthan Palace Intrigue": "Rajasthan royal palace intrigue and conspiracy mystery",
+    "Kerala Backwater Mystery": "Kerala backwaters tourism crime mystery",
+    "Punjab Farmhouse Crime": "Punjab agricultural farmhouse crime mystery"
+}
+DEFAULT_ENGINE_THEME = THEME_MAPPING["Mumbai Underworld Mystery"]
@@ -0,0 +1,209 @@
+"""
+Lightweight span tracing
+Nested timing spans for Streamlit reruns, pages and engine calls, exported locally
+"""
+
+import os
+import json
+import time
+import random
+import inspect
+import functools
+import threading
+import contextvars
+from collections import deque
+from typing import Callable, List, Optional
+
+_current_span = contextvars.ContextVar("mysteryai_span", default=None)
+
+
+class _NoopSpan:
+    """Returned while tracing is off so instrumented code pays almost nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class Span:
+    """A timed, nestable unit of work"""
+
+    __slots__ = ("tracer", "name", "attrs", "trace_id", "span_id", "parent_id", "start", "_t0", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        """Attach attributes after the span has started"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.span_id = f"{random.getrandbits(32):08x}"
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self._t0
+        _current_span.reset(self._token)
+        record = {
+            "trace": self.trace_id,
+            "span": self.span_id,
+            "parent": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(duration * 1000, 3),
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        self.tracer.export(record)
+        return False
+
+
+class RingBufferExporter:
+    """Keeps the most recent spans in memory"""
+
+    def __init__(self, size: int = 5000):
+        self._spans = deque(maxlen=size)
+
+    def export(self, record: dict):
+        self._spans.append(record)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[dict]:
+        spans = list(self._spans)
+        return [s for s in spans if s["trace"] == trace_id] if trace_id else spans
+
+    def clear(self):
+        self._spans.clear()
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per span to a file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=1, encoding="utf-8")
+
+    def export(self, record: dict):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporters"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.exporters = []
+
+    def enable(self, exporter=None):
+        if exporter is not None and exporter not in self.exporters:
+            self.exporters.append(exporter)
+        if not self.exporters:
+            self.exporters.append(RingBufferExporter())
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name: str, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attrs)
+
+    def export(self, record: dict):
+        for exporter in self.exporters:
+            try:
+                exporter.export(record)
+            except Exception:
+                pass  # tracing must never break the game
+
+    def ring_buffer(self) -> Optional[RingBufferExporter]:
+        return next((e for e in self.exporters if isinstance(e, RingBufferExporter)), None)
+
+
+def _tracer_from_env() -> Tracer:
+    """MYSTERYAI_TRACE: "off" (default), "memory" or "jsonl:/path/to/traces.jsonl" """
+    setting = os.getenv("MYSTERYAI_TRACE", "off")
+    tracer = Tracer()
+    if setting == "memory":
+        tracer.enable(RingBufferExporter())
+    elif setting.startswith("jsonl:"):
+        tracer.enable(JsonLinesExporter(setting[len("jsonl:"):]))
+    return tracer
+
+
+# Global tracer shared by the whole process
+_tracer = _tracer_from_env()
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    return _tracer
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator that wraps each call of a function in a span
+
+    For a generator function the span lasts until the generator is exhausted or closed.
+    """
+
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                if not _tracer.enabled:
+                    yield from fn(*args, **kwargs)
+                    return
+                # Each step runs in a context of its own: the span is current inside the
+                # generator, but not in the caller's code between items
+                context = contextvars.copy_context()
+                span = Span(_tracer, span_name, {})
+                context.run(span.__enter__)
+                gen = context.run(fn, *args, **kwargs)
+                error = (None, None, None)
+                try:
+                    while True:
+                        try:
+                            item = context.run(next, gen)
+                        except StopIteration:
+                            return
+                        yield item
+                except BaseException as e:
+                    error = (type(e), e, e.__traceback__)
+                    raise
+                finally:
+                    context.run(gen.close)
+                    context.run(span.__exit__, *error)
+
+            return generator_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(_tracer, span_name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -1,5 +1,52 @@
 import streamlit as st
+from tracing import traced
+from ui.session import end_investigation
 
+def _show_result(result, celebrate: bool = False):
+    """Verdict on an accusation"""
+    st.markdown("---")
+    st.markdown("## 🎯 Investigation Results")
+    
+    if result["correct"]:
+        st.success("🎉 **CASE SOLVED!** 🎉")
+        if celebrate:
+            st.balloons()
+    else:
+        st.error("❌ **Not quite right**")
+    
+    # Score and feedback
+    st.markdown(f"### Score: {result['score']}/100")
+    st.markdown("### Feedback:")
+    st.info(result["feedback"])
+    
+    # Missed clues
+    if result.get("missed_clues") and len(result["missed_clues"]) > 0:
+        st.markdown("### Important Clues You May Have Missed:")
+        for clue in result["missed_clues"]:
+            st.markdown(f"• {clue}")
+
+def _keep_result(result):
+    """Keep a verdict for display; the balloons go up on the next render only"""
+    st.session_state["last_result"] = result
+    st.session_state["celebrate_result"] = True
+
+@st.fragment(run_every="3s")
+def _show_pending_verdict():
+    pending = st.session_state.get("pending_verdict")
+    if pending is None:
+        return
+    if not pending.done():
+        st.info("⏳ Your accusation is on file. The AI is overloaded, so it will be judged as soon as the rush eases.")
+        return
+    st.session_state.pop("pending_verdict", None)
+    if pending.exception() is not None:
+        st.session_state["verdict_failed"] = True
+    else:
+        _keep_result(pending.result())
+    # The page shows the verdict; this fragment (and its timer) isn't drawn again
+    st.rerun()
+
+@traced("page.show_accusation_page")
 def show_accusation_page():
     # Check if game has started
     if not st.session_state.get("game_started", False):
@@ -51,51 +98,43 @@ def show_accusation_page():
             if explanation.strip():
                 with st.spinner("Evaluating your solution..."):
                     result = game_engine.submit_solution(selected_suspect.name, explanation)
-                    
-                    # Display results
-                    st.markdown("---")
-                    st.markdown("## 🎯 Investigation Results")
-                    
-                    if result["correct"]:
-                        st.success("🎉 **CASE SOLVED!** 🎉")
-                        st.balloons()
-                    else:
-                        st.error("❌ **Not quite right**")
-                    
-                    # Score and feedback
-                    st.markdown(f"### Score: {result['score']}/100")
-                    st.markdown("### Feedback:")
-                    st.info(result["feedback"])
-                    
-                    # Missed clues
-                    if result.get("missed_clues") and len(result["missed_clues"]) > 0:
-                        st.markdown("### Important Clues You May Have Missed:")
-                        for clue in result["missed_clues"]:
-                            st.markdown(f"• {clue}")
-                    
-                    # Options after evaluation
-                    st.markdown("---")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        if st.button("🔄 Try Another Case", use_container_width=True):
-                            # Clear current case data
-                            keys_to_clear = ["mystery_case", "game_engine", "current_page"]
-                            for key in keys_to_clear:
-                                if key in st.session_state:
-                                    del st.session_state[key]
-                            st.session_state["current_page"] = "Briefing"
-                            st.rerun()
-                    
-                    with col2:
-                        if st.button("🏠 Back to Home", use_container_width=True):
-                            # Reset entire game
-                            for key in ["game_started", "selected_theme", "mystery_case", "game_engine", "current_page"]:
-                                if key in st.session_state:
-                                    del st.session_state[key]
-                            st.rerun()
+                
+                # Show the result, or wait for it if judging was deferred
+                st.session_state.pop("last_result", None)
+                if result.get("deferred"):
+                    st.session_state["pending_verdict"] = game_engine.pending_verdict
+                else:
+                    st.session_state.pop("pending_verdict", None)
+                    _keep_result(result)
             else:
                 st.warning("Please provide an explanation for your accusation.")
+        
+        if "pending_verdict" in st.session_state:
+            _show_pending_verdict()
+        elif st.session_state.pop("verdict_failed", False):
+            st.error("Your accusation couldn't be judged. Please submit it again.")
+        elif "last_result" in st.session_state:
+            _show_result(st.session_state["last_result"], st.session_state.pop("celebrate_result", False))
+            
+            # Options after evaluation
+            st.markdown("---")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                if st.button("🔄 Try Another Case", use_container_width=True):
+                    # Clear current case data
+                    end_investigation("new case")
+                    st.session_state["current_page"] = "Briefing"
+                    st.rerun()
+            
+            with col2:
+                if st.button("🏠 Back to Home", use_container_width=True):
+                    # Reset entire game
+                    end_investigation("reset")
+                    for key in ["game_started", "selected_theme", "current_page"]:
+                        if key in st.session_state:
+                            del st.session_state[key]
+                    st.rerun()
     
     # Investigation summary
     st.markdown("---")
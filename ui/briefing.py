@@ -1,6 +1,63 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from mystery_engine import get_game_engine
+from tracing import traced
+from mystery_engine import get_game_engine, MysteryGameEngine
+from procedural import generate_procedural_case
+from scheduler import BACKGROUND
+from themes import THEME_MAPPING, DEFAULT_ENGINE_THEME
 
+# Serve a procedural case at once and let the AI write one in the background
+INSTANT_FIRST_CASE = os.getenv("MYSTERYAI_INSTANT_FIRST_CASE", "0") == "1"
+
+# A background case nobody has looked in on for this long is abandoned (e.g. the tab was closed)
+BACKGROUND_IDLE_TIMEOUT = float(os.getenv("MYSTERYAI_BACKGROUND_IDLE_TIMEOUT", "300"))
+
+# Shared by all sessions; background cases are queued behind interactive calls anyway
+_background_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="case-writer")
+
+def _write_case_in_background(engine: MysteryGameEngine, engine_theme: str):
+    return engine.generate_mystery(engine_theme, priority=BACKGROUND)
+
+def _show_progress(placeholder):
+    """Progress callback for case generation; redrawing gives Streamlit a point to stop the script"""
+    drawn = [0]
+    def progress(text: str):
+        if len(text) - drawn[0] >= 200:
+            drawn[0] = len(text)
+            placeholder.caption(f"✍️ {len(text):,} characters of case file written...")
+    return progress
+
+def _use_case(game_engine, case):
+    """Make `case` the active case, starting the investigation from scratch"""
+    game_engine.restore_state(case, {})
+    st.session_state["mystery_case"] = case
+    st.session_state["game_engine"] = game_engine
+    for key in ["evidence_analyses", "pending_verdict", "last_result"]:
+        st.session_state.pop(key, None)
+
+@st.fragment(run_every="3s")
+def _show_pending_case():
+    pending = st.session_state.get("pending_case")
+    if pending is None:
+        return
+    if not pending.done():
+        st.session_state["pending_case_engine"].touch()
+        st.info("✍️ A detective writer is preparing a fresh AI-written case. You can start on this one meanwhile.")
+        return
+    if pending.exception() is not None:
+        # Keep playing the procedural case; nothing else to offer
+        st.session_state.pop("pending_case", None)
+        st.session_state.pop("pending_case_engine", None)
+        return
+    st.success("✨ Your AI-written case is ready.")
+    if st.button("Switch to the AI-written case", use_container_width=True):
+        st.session_state.pop("pending_case", None)
+        st.session_state.pop("pending_case_engine", None)
+        _use_case(st.session_state["game_engine"], pending.result())
+        st.rerun()
+
+@traced("page.show_briefing_page")
 def show_briefing_page():
     # Check if game has started
     if not st.session_state.get("game_started", False):
@@ -28,28 +85,39 @@ def show_briefing_page():
     
     # Initialize game engine and generate case if not exists
     if "mystery_case" not in st.session_state:
+        # Map theme names to engine format
+        engine_theme = THEME_MAPPING.get(theme, DEFAULT_ENGINE_THEME)
         try:
-            with st.spinner("🔍 Generating your mystery case..."):
-                game_engine = get_game_engine()
-                # Map theme names to engine format
-                theme_mapping = {
-                    "Mumbai Underworld Mystery": "Mumbai underworld crime mystery with Bollywood connections",
-                    "Delhi Political Scandal": "Delhi political corruption and scandal mystery", 
-                    "Bangalore Tech Startup Crime": "Bangalore IT startup corporate crime mystery",
-                    "Kolkata Literary Society Murder": "Kolkata intellectual literary society murder mystery",
-                    "Goa Beach Resort Mystery": "Goa beach resort luxury crime mystery",
-                    "Rajasthan Palace Intrigue": "Rajasthan royal palace intrigue and conspiracy mystery",
-                    "Kerala Backwater Mystery": "Kerala backwaters tourism crime mystery",
-                    "Punjab Farmhouse Crime": "Punjab agricultural farmhouse crime mystery"
-                }
-                engine_theme = theme_mapping.get(theme, "Mumbai underworld crime mystery with Bollywood connections")
-                mystery_case = game_engine.generate_mystery(engine_theme)
-                st.session_state["mystery_case"] = mystery_case
-                st.session_state["game_engine"] = game_engine
+            game_engine = get_game_engine()
         except Exception as e:
             st.error(f"Failed to generate mystery case: {str(e)}")
             st.info("Please check your OpenAI API key in the sidebar.")
             return
+        if INSTANT_FIRST_CASE:
+            _use_case(game_engine, generate_procedural_case(theme))
+            # A separate engine so the player's engine is untouched until they switch
+            writer = MysteryGameEngine(api_key=game_engine._api_key)
+            writer.cancel_when_idle(BACKGROUND_IDLE_TIMEOUT)
+            st.session_state["pending_case_engine"] = writer
+            st.session_state["pending_case"] = _background_pool.submit(
+                _write_case_in_background, writer, engine_theme)
+        else:
+            try:
+                with st.spinner("🔍 Generating your mystery case..."):
+                    # Navigating away or resetting stops the script at the next redraw,
+                    # which also stops the generation call
+                    progress = _show_progress(st.empty())
+                    mystery_case = game_engine.generate_mystery(engine_theme, progress=progress)
+                    st.session_state["mystery_case"] = mystery_case
+                    st.session_state["game_engine"] = game_engine
+                if game_engine.case_source != "ai":
+                    st.info("📚 The AI case writer is busy right now, so you get a ready-made case instead of a freshly written one.")
+            except Exception as e:
+                # Degraded mode: a procedural case keeps the player going
+                st.warning(f"The AI case writer is unavailable right now ({str(e)}), so an offline case was prepared instead.")
+                _use_case(game_engine, generate_procedural_case(theme))
+    
+    _show_pending_case()
     
     # Get the mystery case
     mystery_case = st.session_state["mystery_case"]
@@ -0,0 +1,127 @@
+import time
+import streamlit as st
+from tracing import traced
+
+# How each kind of whereabouts fact reads on the page
+RELATION_LABELS = {
+    "claims_at": "says they were at",
+    "seen_at": "was seen at",
+    "not_at": "was not at",
+    "placed_at": "is placed at",
+    "victim_at": "(the victim) was at",
+}
+
+@traced("page.show_case_file_page")
+def show_case_file_page():
+    # Check if game has started
+    if not st.session_state.get("game_started", False):
+        st.warning("Please start an investigation from the Home page first.")
+        return
+
+    # Check if mystery case exists
+    if "mystery_case" not in st.session_state:
+        st.warning("Please go to the briefing page first to generate your case.")
+        return
+
+    st.title("🗂️ Case File")
+    st.markdown("---")
+
+    # Get the game engine
+    game_engine = st.session_state["game_engine"]
+
+    # Get the selected theme
+    theme = st.session_state.get("selected_theme", "Unknown Theme")
+
+    st.markdown(f"### Case: {theme}")
+    st.markdown("Cross-reference alibis, motives and evidence instantly. Searching the case file is free and doesn't consult the AI.")
+
+    # Search input
+    query = st.text_input(
+        "Search the case file:",
+        key="case_file_query",
+        placeholder="e.g., temple, 9 pm, study, debt"
+    )
+
+    if query.strip():
+        start = time.perf_counter()
+        hits = game_engine.search_case_file(query)
+        elapsed_us = (time.perf_counter() - start) * 1_000_000
+
+        st.caption(f"{len(hits)} result(s) in {elapsed_us:.0f} µs")
+        if hits:
+            for hit in hits:
+                st.markdown(f"**{hit.subject}** · _{hit.kind}_")
+                st.markdown(f"> {hit.text}")
+        else:
+            st.info("Nothing in the case file matches that search.")
+
+    st.markdown("---")
+
+    # Timeline: whereabouts at a time of day, from alibis and evidence
+    st.markdown("### ⏱️ Who Was Where?")
+    when = st.text_input(
+        "At what time?",
+        key="case_file_time",
+        placeholder="e.g., 9 pm, 10:30 pm, midnight"
+    )
+
+    if when.strip():
+        start = time.perf_counter()
+        try:
+            facts = game_engine.who_was_where(when)
+        except ValueError:
+            facts = None
+            st.warning("Enter a time of day, such as 9 pm or 21:30.")
+        elapsed_us = (time.perf_counter() - start) * 1_000_000
+
+        if facts is not None:
+            st.caption(f"{len(facts)} fact(s) in {elapsed_us:.0f} µs")
+            if facts:
+                for fact in facts:
+                    st.markdown(f"**{fact.subject}** {RELATION_LABELS[fact.relation]} **{fact.object}** "
+                                f"· {fact.when} · _{fact.source}_")
+            else:
+                st.info("Nobody's whereabouts are on record for that time.")
+
+    st.markdown("---")
+
+    # Contradictions: evidence against alibis, and alibis against each other
+    st.markdown("### ⚖️ Check Evidence Against Alibis")
+    evidence_names = [evidence.name for evidence in st.session_state["mystery_case"].evidence]
+    chosen = st.selectbox("Evidence:", evidence_names, key="case_file_evidence")
+
+    if chosen:
+        conflicts = game_engine.check_evidence(chosen)
+        if conflicts:
+            for conflict in conflicts:
+                st.markdown(f"❗ {conflict.reason}")
+                st.markdown(f"> {conflict.person}: \"{conflict.statement}\"")
+        else:
+            st.info(f"{chosen} doesn't contradict anyone's alibi on its own.")
+
+    alibi_conflicts = game_engine.fact_graph.alibi_conflicts()
+    if alibi_conflicts:
+        st.markdown("#### Alibis That Don't Agree")
+        for conflict in alibi_conflicts:
+            st.markdown(f"❗ {conflict.reason}")
+
+    # Quick navigation
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("📋 Back to Briefing", use_container_width=True):
+            st.session_state["current_page"] = "Briefing"
+            st.rerun()
+
+    with col2:
+        if st.button("🔍 Start Interrogation", use_container_width=True):
+            st.session_state["current_page"] = "Interrogation"
+            st.rerun()
+
+    with col3:
+        if st.button("📋 Examine Evidence", use_container_width=True):
+            st.session_state["current_page"] = "Evidence"
+            st.rerun()
+
+if __name__ == "__main__":
+    show_case_file_page()
@@ -1,5 +1,7 @@
 import streamlit as st
+from tracing import traced
 
+@traced("page.show_evidence_page")
 def show_evidence_page():
     # Check if game has started
     if not st.session_state.get("game_started", False):
@@ -36,11 +38,15 @@ def show_evidence_page():
                 st.markdown(f"**Significance:** {evidence.significance}")
                 
                 # Button to get detailed analysis
+                analyses = st.session_state.setdefault("evidence_analyses", {})
                 if st.button(f"🔬 Get Detailed Analysis", key=f"analyze_{i}"):
                     with st.spinner("Analyzing evidence..."):
-                        analysis = game_engine.examine_evidence(evidence.name)
-                        st.markdown("### Forensic Analysis")
-                        st.text(analysis)
+                        analyses[evidence.name] = game_engine.examine_evidence(evidence.name)
+                
+                # Display the saved analysis
+                if evidence.name in analyses:
+                    st.markdown("### Forensic Analysis")
+                    st.text(analyses[evidence.name])
     else:
         st.info("No evidence available yet.")
     
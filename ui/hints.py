@@ -1,5 +1,7 @@
 import streamlit as st
+from tracing import traced
 
+@traced("page.show_hints_page")
 def show_hints_page():
     # Check if game has started
     if not st.session_state.get("game_started", False):
@@ -58,6 +60,18 @@ def show_hints_page():
     
     # Investigation progress
     st.markdown("---")
+    st.markdown("### Investigation Progress")
+    tracker = game_engine.clue_tracker
+    if tracker and tracker.key_clues:
+        found = sum(tracker.found)
+        st.progress(tracker.progress, text=f"{found} of {len(tracker.key_clues)} key clues uncovered")
+        leads = [lead for lead in tracker.discovered if lead]
+        if leads:
+            # What the player read, not the clue itself: that could name the culprit
+            with st.expander("Where you found them"):
+                for lead in leads:
+                    st.markdown(f"• {lead}")
+    
     st.markdown("### Investigation Tips")
     st.markdown("""
     **General Investigation Strategy:**
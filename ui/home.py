@@ -1,7 +1,9 @@
 # ui/home.py
 
 import streamlit as st
+from tracing import traced
 
+@traced("page.show_home_page")
 def show_home_page():
     # Page configuration
     st.set_page_config(
@@ -1,5 +1,7 @@
 import streamlit as st
+from tracing import traced
 
+@traced("page.show_interrogation_page")
 def show_interrogation_page():
     # Check if game has started
     if not st.session_state.get("game_started", False):
@@ -60,14 +62,20 @@ def show_interrogation_page():
                 col1, col2 = st.columns([1, 4])
                 
                 with col1:
-                    if st.button("Ask Question", key=f"ask_{i}", use_container_width=True):
-                        if question.strip():
-                            with st.spinner("Getting response..."):
-                                response = game_engine.interrogate_suspect(suspect.name, question)
-                                st.session_state[f"last_response_{i}"] = response
+                    ask = st.button("Ask Question", key=f"ask_{i}", use_container_width=True)
                 
+                if ask and question.strip():
+                    st.markdown("### Response")
+                    # Streamed: each chunk drawn is a point where Streamlit can stop the script,
+                    # so leaving the page or resetting mid-answer hangs up on the model
+                    stream = game_engine.stream_interrogation(suspect.name, question)
+                    try:
+                        content = st.write_stream(stream)
+                    finally:
+                        stream.close()
+                    st.session_state[f"last_response_{i}"] = f"\n{suspect.name}: \"{content}\"\n"
                 # Display last response
-                if f"last_response_{i}" in st.session_state:
+                elif f"last_response_{i}" in st.session_state:
                     st.markdown("### Response")
                     st.markdown(st.session_state[f"last_response_{i}"])
     
@@ -0,0 +1,103 @@
+import uuid
+import hashlib
+import streamlit as st
+from mystery_engine import get_game_engine
+from session_store import get_session_store, encode_record
+
+# Session state of one investigation, dropped when it ends
+INVESTIGATION_KEYS = ["mystery_case", "game_engine", "evidence_analyses", "current_hint", "pending_case",
+                      "pending_case_engine", "pending_verdict", "last_result"]
+
+# Plain session_state keys saved with the investigation
+PERSISTED_KEYS = ["selected_theme", "game_started", "current_page", "current_hint", "hint_difficulty", "evidence_analyses"]
+
+
+def session_id():
+    """Stable id for this browser session, kept in the URL so any replica can resume it"""
+    if "session_id" not in st.session_state:
+        sid = st.query_params.get("sid")
+        if not sid:
+            sid = uuid.uuid4().hex
+            st.query_params["sid"] = sid
+        st.session_state["session_id"] = sid
+    return st.session_state["session_id"]
+
+
+def restore_session():
+    """Resume a saved investigation once per browser session (needs the API key to rebuild the engine)"""
+    if st.session_state.get("session_restored"):
+        return
+    store = get_session_store()
+    if store is None:
+        st.session_state["session_restored"] = True
+        return
+
+    record = store.load(session_id())
+    if not record or not record.get("case"):
+        st.session_state["session_restored"] = True
+        return
+
+    try:
+        game_engine = get_game_engine()
+    except ValueError:
+        # Wait for the player to enter their API key
+        st.info("Enter your API key to resume your saved investigation.")
+        return
+
+    case = store.get_case(record["case"])
+    if case is not None:
+        game_engine.restore_state(case, record.get("engine", {}))
+        st.session_state["mystery_case"] = case
+        st.session_state["game_engine"] = game_engine
+        for key in PERSISTED_KEYS:
+            if key in record.get("state", {}):
+                st.session_state[key] = record["state"][key]
+        for i, response in record.get("responses", {}).items():
+            st.session_state[f"last_response_{i}"] = response
+    st.session_state["session_restored"] = True
+
+
+def persist_session():
+    """Queue the current investigation for saving if anything changed since the last save"""
+    store = get_session_store()
+    if store is None or not st.session_state.get("session_restored"):
+        return
+
+    record = {"case": None, "engine": {}, "responses": {}}
+    record["state"] = {key: st.session_state[key] for key in PERSISTED_KEYS if key in st.session_state}
+    if "mystery_case" in st.session_state and "game_engine" in st.session_state:
+        game_engine = st.session_state["game_engine"]
+        record["case"] = game_engine.case_index.fingerprint
+        record["engine"] = game_engine.export_state()
+        record["responses"] = {
+            key[len("last_response_"):]: value
+            for key, value in st.session_state.items() if key.startswith("last_response_")
+        }
+
+    # Skip the store entirely on reruns that didn't change anything
+    digest = hashlib.sha1(encode_record(record)).hexdigest()
+    if digest == st.session_state.get("session_digest"):
+        return
+    if record["case"]:
+        store.put_case(record["case"], st.session_state["mystery_case"])
+    store.save(session_id(), record)
+    st.session_state["session_digest"] = digest
+
+
+def forget_session():
+    """Drop the saved investigation (e.g. on reset)"""
+    store = get_session_store()
+    if store is not None:
+        store.delete(session_id())
+    st.session_state.pop("session_digest", None)
+
+
+def end_investigation(reason: str = "reset"):
+    """Stop the investigation's LLM calls (including a case written in the background),
+    forget its saved session and clear its state"""
+    forget_session()
+    for key in ["game_engine", "pending_case_engine"]:
+        if st.session_state.get(key) is not None:
+            st.session_state[key].cancel(reason)
+    for key in INVESTIGATION_KEYS + [key for key in st.session_state if key.startswith("last_response_")]:
+        st.session_state.pop(key, None)
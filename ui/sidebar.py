@@ -1,6 +1,10 @@
 import streamlit as st
+from tracing import traced
+from ui.session import restore_session, end_investigation
+from load_shedding import get_admission_controller, STATUS_MESSAGES
 
 
+@traced("navigate")
 def navigate():
     # Initialize session state if not exists
     if "current_page" not in st.session_state:
@@ -26,17 +30,28 @@ def navigate():
         # Show API key status
         if st.session_state.get("openai_api_key"):
             st.success("✅ API Key Set")
+            # Be upfront when the AI is overloaded and some features are running lighter
+            mode = get_admission_controller().mode(st.session_state["openai_api_key"])
+            if mode in STATUS_MESSAGES:
+                st.warning(f"🚦 {STATUS_MESSAGES[mode]}")
         else:
             st.warning("⚠️ API Key Required")
         
+        # Resume a saved investigation (after a restart or on another server)
+        restore_session()
+        
+        # Any rerun means the player is still around for the case being written in the background
+        if st.session_state.get("pending_case_engine") is not None:
+            st.session_state["pending_case_engine"].touch()
+        
         st.markdown("---")
         
         # Show different navigation options based on game state
         if st.session_state["game_started"]:
             page = st.radio(
                 "Navigate the game:",
-                ("Briefing", "Interrogation", "Evidence", "Accusation", "Hints"),
-                index=["Briefing", "Interrogation", "Evidence", "Accusation", "Hints"].index(st.session_state["current_page"]) if st.session_state["current_page"] != "Home" else 0
+                ("Briefing", "Interrogation", "Evidence", "Case File", "Accusation", "Hints"),
+                index=["Briefing", "Interrogation", "Evidence", "Case File", "Accusation", "Hints"].index(st.session_state["current_page"]) if st.session_state["current_page"] != "Home" else 0
             )
             st.session_state["current_page"] = page
         else:
@@ -56,8 +71,9 @@ def navigate():
         if st.session_state["game_started"]:
             st.markdown("---")
             if st.button("🔄 Reset Game", use_container_width=True):
+                end_investigation("reset")
                 # Clear game state
-                for key in ["game_started", "selected_theme", "current_page", "mystery_case", "game_engine"]:
+                for key in ["game_started", "selected_theme", "current_page"]:
                     if key in st.session_state:
                         del st.session_state[key]
                 st.rerun()